@@ -87,6 +87,7 @@ a = Analysis(
         # 외부 라이브러리
         "openai", "faster_whisper", "ctranslate2", "playwright", "requests",
         "dotenv", "google.genai", "certifi", "huggingface_hub", "tokenizers",
+        "av", "numpy",
         # 표준 라이브러리
         "json", "threading", "pathlib",
     ],
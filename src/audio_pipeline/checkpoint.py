@@ -0,0 +1,142 @@
+"""faster-whisper 변환 체크포인트 (세그먼트 저널)
+
+변환 중에는 세그먼트가 나올 때마다 <txt_path>.ckpt.jsonl에 한 줄씩 추가한다.
+첫 줄은 오디오/설정 식별 정보이고, 이후 줄은 세그먼트다 (segments.jsonl과 같은 형식).
+마지막 세그먼트의 end가 "여기까지 처리했다"는 오디오 위치가 된다.
+
+중지/오류/타임아웃/프로그램 종료로 변환이 끊긴 뒤 같은 파일을 다시 변환하면 저널의 세그먼트를
+복구하고 그 위치부터 나머지 오디오만 변환한다. 변환이 끝나면 저널을 지운다.
+
+오디오가 바뀌었거나(다시 다운로드/변환) 모델/언어/디코딩 모드(배치 크기) 설정이 다르면 저널을
+버리고 처음부터 변환한다. STT 서버로 변환할 때도 클라이언트의 txt_path 옆에 저널을 남긴다.
+청크 병렬 변환(stt_mode="chunked")은 청크가 완료 순서대로 끝나 이어갈 위치가 없으므로 쓰지 않는다.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import List, Optional
+
+from src.audio_pipeline.segments import Segment
+
+CHECKPOINT_SUFFIX = ".ckpt.jsonl"
+_VERSION = 1
+# 세그먼트마다 flush(프로세스가 죽어도 남음) + 이 간격으로 fsync(전원이 꺼져도 남음)
+_FSYNC_INTERVAL_SEC = 30
+# 오디오 식별: 크기 + 앞/뒤 일부의 해시 (다시 변환한 WAV는 수정 시각이 바뀌므로 시각은 쓰지 않음)
+_FINGERPRINT_BYTES = 1024 * 1024
+
+# 저널 경로 → 현재 쓰고 있는 체크포인트
+# (중지/타임아웃 후에도 이전 변환 스레드가 계속 돌 수 있으므로, 새 변환이 시작되면 이전 쪽은 멈춘다)
+_owners = {}
+_owners_lock = threading.Lock()
+
+
+def audio_fingerprint(audio_path: str, audio=None) -> str:
+    """오디오 파일(또는 메모리 배열)을 다시 만들어도 내용이 같으면 같은 값"""
+    sha = hashlib.sha256()
+    if audio is not None:
+        data = memoryview(audio).cast("B")
+        size = len(data)
+        sha.update(data[:_FINGERPRINT_BYTES])
+        sha.update(data[max(0, size - _FINGERPRINT_BYTES):])
+        return f"pcm:{size}:{sha.hexdigest()[:16]}"
+
+    size = os.path.getsize(audio_path)
+    with open(audio_path, "rb") as f:
+        sha.update(f.read(_FINGERPRINT_BYTES))
+        f.seek(max(0, size - _FINGERPRINT_BYTES))
+        sha.update(f.read())
+    return f"file:{size}:{sha.hexdigest()[:16]}"
+
+
+class TranscriptCheckpoint:
+    """txt_path 옆의 세그먼트 저널 읽기/쓰기
+
+    사용 순서: load()로 이전 세그먼트 복구 → start()로 저널 열기 → append() 반복 → finish()
+    """
+
+    def __init__(self, txt_path: str, fingerprint: dict):
+        self.path = txt_path + CHECKPOINT_SUFFIX
+        self._header = {"version": _VERSION, **fingerprint}
+        self._file = None
+        self._last_fsync = 0.0
+
+    def load(self) -> List[Segment]:
+        """이전 변환에서 저장한 세그먼트 (저널이 없거나 다른 오디오/설정이면 빈 리스트)"""
+        if not os.path.exists(self.path):
+            return []
+        segments = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                if header != self._header:
+                    print(f"[INFO] 오디오 또는 STT 설정이 바뀌어 체크포인트를 버립니다: {self.path}")
+                    return []
+                for line in f:
+                    try:
+                        segments.append(Segment.from_dict(json.loads(line)))
+                    except (json.JSONDecodeError, KeyError):
+                        break  # 쓰는 도중 끊긴 마지막 줄
+        except (OSError, ValueError) as e:
+            print(f"[WARN] 체크포인트를 읽지 못해 처음부터 변환합니다: {e}")
+            return []
+        return segments
+
+    @staticmethod
+    def offset(segments: List[Segment]) -> float:
+        """이미 처리한 오디오 위치 (초)"""
+        return segments[-1].end if segments else 0.0
+
+    def start(self, segments: List[Segment]):
+        """저널을 새로 쓰고(복구한 세그먼트 포함) 이 체크포인트가 저널을 맡는다"""
+        with _owners_lock:
+            _owners[self.path] = self
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(self._header, ensure_ascii=False) + "\n")
+            for seg in segments:
+                f.write(json.dumps(seg.to_dict(), ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._last_fsync = time.time()
+
+    @property
+    def owned(self) -> bool:
+        """False면 같은 파일의 새 변환이 시작된 것 — 이 변환은 멈춰야 한다"""
+        with _owners_lock:
+            return _owners.get(self.path) is self
+
+    def append(self, segment: Segment):
+        self._file.write(json.dumps(segment.to_dict(), ensure_ascii=False) + "\n")
+        self._file.flush()
+        now = time.time()
+        if now - self._last_fsync >= _FSYNC_INTERVAL_SEC:
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+
+    def close(self):
+        """저널은 남겨 두고 닫는다 (다음 실행에서 이어서 변환)"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        with _owners_lock:
+            if _owners.get(self.path) is self:
+                del _owners[self.path]
+
+    def finish(self):
+        """변환 완료 — 저널 삭제"""
+        owned = self.owned
+        self.close()
+        if owned and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def resume_source(source, offset_sec: float, sample_rate: int = 16000) -> Optional[object]:
+    """offset_sec 이후의 오디오 배열 (경로면 디코딩). 남은 오디오가 거의 없으면 None."""
+    if isinstance(source, str):
+        from faster_whisper.audio import decode_audio
+        source = decode_audio(source, sampling_rate=sample_rate)
+    rest = source[int(offset_sec * sample_rate):]
+    return rest if len(rest) >= sample_rate // 2 else None
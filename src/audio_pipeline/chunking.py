@@ -0,0 +1,129 @@
+"""긴 오디오를 병렬 STT용 청크로 나누고 결과를 다시 이어 붙이는 도구
+
+청크 경계는 가능한 한 VAD가 찾은 무음 구간 한가운데에 둔다. 무음 구간에서 자르면
+단어가 잘리지 않으므로 겹침(overlap)이 필요 없다. 말이 길게 이어져 무음 구간을 찾지 못한
+경우에만 강제로 자르고, 경계 앞뒤 overlap만큼을 양쪽 청크에 모두 포함시킨 뒤
+이어 붙일 때 중복된 단어를 제거한다.
+"""
+from dataclasses import dataclass, replace
+from typing import List
+
+from src.audio_pipeline.segments import Segment
+
+
+@dataclass
+class AudioChunk:
+    start: int        # 시작 샘플 위치
+    end: int          # 끝 샘플 위치 (미포함)
+    overlapped: bool  # 앞 청크와 overlap 구간을 공유하는지 (강제 분할된 경우)
+
+
+def plan_chunks(
+    speech_timestamps: List[dict],
+    total_samples: int,
+    target_samples: int,
+    max_samples: int,
+    overlap_samples: int,
+) -> List[AudioChunk]:
+    """VAD 음성 구간({"start", "end"} 샘플 단위) 목록으로 청크 경계를 정한다.
+
+    각 청크는 target_samples 근처의 무음 구간에서 끝나며, target/2 ~ max_samples 범위에
+    무음 구간이 없으면 max_samples 위치에서 overlap을 두고 강제로 자른다.
+    """
+    if total_samples <= max_samples:
+        return [AudioChunk(0, total_samples, False)]
+
+    # 음성 구간 사이 무음의 한가운데가 자를 수 있는 후보 위치
+    cut_points = [
+        (prev["end"] + nxt["start"]) // 2
+        for prev, nxt in zip(speech_timestamps, speech_timestamps[1:])
+        if nxt["start"] > prev["end"]
+    ]
+
+    chunks = []
+    start = 0
+    overlapped = False
+    while total_samples - start > max_samples:
+        lower = start + target_samples // 2
+        upper = start + max_samples
+        target = start + target_samples
+        candidates = [c for c in cut_points if lower <= c <= upper]
+        if candidates:
+            cut = min(candidates, key=lambda c: abs(c - target))
+            chunks.append(AudioChunk(start, cut, overlapped))
+            start, overlapped = cut, False
+        else:
+            chunks.append(AudioChunk(start, upper, overlapped))
+            start, overlapped = upper - overlap_samples, True
+    chunks.append(AudioChunk(start, total_samples, overlapped))
+    return chunks
+
+
+def stitch_texts(chunk_texts: List[str], chunks: List[AudioChunk], max_overlap_words: int = 30) -> str:
+    """청크별 텍스트를 순서대로 이어 붙인다.
+
+    overlap을 공유하는 경계에서는 앞 청크의 끝 단어들과 뒤 청크의 첫 단어들이
+    가장 길게 일치하는 부분을 한 번만 남긴다.
+    """
+    words: List[str] = []
+    for text, chunk in zip(chunk_texts, chunks):
+        new_words = text.split()
+        if chunk.overlapped:
+            new_words = _drop_overlap_words(words, new_words, max_overlap_words)
+        words.extend(new_words)
+    return " ".join(words)
+
+
+def _drop_overlap_words(words: List[str], new_words: List[str], max_overlap_words: int) -> List[str]:
+    """words의 끝과 new_words의 앞이 가장 길게 일치하는 부분을 new_words에서 뺀다"""
+    limit = min(max_overlap_words, len(words), len(new_words))
+    for n in range(limit, 0, -1):
+        if words[-n:] == new_words[:n]:
+            return new_words[n:]
+    return new_words
+
+
+def merge_chunk_segments(
+    chunk_segments: List[List[Segment]],
+    chunks: List[AudioChunk],
+    timed: List[bool] = None,
+    max_overlap_words: int = 30,
+) -> List[Segment]:
+    """청크별 세그먼트(원본 오디오 시각 기준)를 시간 순서대로, 서로 겹치지 않게 잇는다.
+
+    overlap을 공유하는 경계에서는 뒤 청크 세그먼트 중 앞 청크에서 남긴 마지막 끝 시각보다 먼저
+    시작하는 것을 버린다 (겹친 구간은 앞 청크 결과를 씀). 무음에서 자른 경계는 버리지 않고,
+    타임스탬프가 앞 세그먼트와 겹치면 시작 시각만 뒤로 민다.
+
+    timed[i]가 False인 청크는 엔진이 텍스트만 돌려줘 청크 전체가 세그먼트 하나다. 시각으로는
+    겹친 부분을 가릴 수 없으므로 stitch_texts처럼 앞 텍스트와 겹치는 단어를 지운다.
+    """
+    merged: List[Segment] = []
+    for i, (segs, chunk) in enumerate(zip(chunk_segments, chunks)):
+        if timed is not None and not timed[i]:
+            if chunk.overlapped and merged:
+                segs = [_trim_overlap(seg, merged, max_overlap_words) for seg in segs[:1]] + segs[1:]
+            overlapped = False  # 겹친 단어는 이미 지웠으므로 시각은 당기기만 한다
+        else:
+            overlapped = chunk.overlapped
+        for seg in segs:
+            if not seg.text:
+                continue
+            last_end = merged[-1].end if merged else 0.0
+            if seg.start < last_end:
+                if overlapped:
+                    continue
+                seg = replace(seg, start=last_end, end=max(seg.end, last_end))
+            merged.append(seg)
+    return merged
+
+
+def _trim_overlap(seg: Segment, merged: List[Segment], max_overlap_words: int) -> Segment:
+    """앞에서 남긴 세그먼트 끝부분과 겹치는 단어를 seg 앞에서 지운다"""
+    tail: List[str] = []
+    for prev in reversed(merged):
+        tail[:0] = prev.text.split()
+        if len(tail) >= max_overlap_words:
+            break
+    words = _drop_overlap_words(tail, seg.text.split(), max_overlap_words)
+    return replace(seg, text=" ".join(words))
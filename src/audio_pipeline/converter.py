@@ -1,5 +1,11 @@
 import os
+import wave
+from typing import Callable, Iterator, List, Optional, Tuple
+
 import av
+import numpy as np
+
+from src.audio_pipeline.chunking import AudioChunk, plan_chunks
 
 
 def convert_audio_to_wav(input_path: str, wav_path: str, sample_rate: int = 16000):
@@ -13,30 +19,265 @@ def convert_audio_to_wav(input_path: str, wav_path: str, sample_rate: int = 1600
     os.makedirs(os.path.dirname(wav_path), exist_ok=True)
 
     try:
-        input_container = av.open(input_path)
-        output_container = av.open(wav_path, mode='w')
+        with av.open(input_path) as input_container:
+            transcode_to_wav(input_container, wav_path, sample_rate)
+    except av.FFmpegError as e:
+        raise RuntimeError(f"오디오 변환 오류: {e}")
 
-        if not input_container.streams.audio:
-            raise RuntimeError(f"오디오 스트림이 없음: {input_path}")
 
-        output_stream = output_container.add_stream('pcm_s16le', rate=sample_rate)
-        output_stream.layout = 'mono'
+def decode_audio_to_array(input_path: str, sample_rate: int = 16000) -> np.ndarray:
+    """오디오/비디오 파일을 mono float32 배열([-1, 1])로 디코딩.
 
-        resampler = av.AudioResampler(format='s16', layout='mono', rate=sample_rate)
+    faster-whisper의 decode_audio와 같은 스케일이라 WhisperModel.transcribe에 바로 넘길 수 있다.
+    컨테이너 길이만큼 float32 배열 하나를 미리 잡고 int16 블록을 바로 변환해 채우므로
+    최대 메모리가 결과 배열(샘플당 4바이트)과 블록 하나 정도로 유지된다.
+    """
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"입력 파일이 존재하지 않음: {input_path}")
 
-        for frame in input_container.decode(audio=0):
-            for resampled in resampler.resample(frame):
-                for packet in output_stream.encode(resampled):
-                    output_container.mux(packet)
+    try:
+        with av.open(input_path) as input_container:
+            total_sec = input_container.duration / av.time_base if input_container.duration else 0.0
+            # 길이를 모르면 10분 분량부터 시작해 모자랄 때마다 두 배로 늘린다
+            samples = np.empty(int((total_sec + 1) * sample_rate) or sample_rate * 600, dtype=np.float32)
+            filled = 0
+            for pcm in _iter_pcm_blocks(input_container, sample_rate):
+                end = filled + len(pcm)
+                if end > len(samples):
+                    samples.resize(max(end, len(samples) * 2), refcheck=False)
+                np.multiply(pcm, 1 / 32768.0, out=samples[filled:end])
+                filled = end
+    except av.FFmpegError as e:
+        raise RuntimeError(f"오디오 변환 오류: {e}")
+
+    samples.resize(filled, refcheck=False)
+    return samples
+
+
+def transcode_to_wav(
+    input_container,
+    wav_path: str,
+    sample_rate: int = 16000,
+    progress_callback: Optional[Callable[[float, float], None]] = None,
+):
+    """열려 있는 PyAV 입력 컨테이너의 첫 오디오 트랙만 디코딩하여 mono WAV로 저장.
+
+    입력은 로컬 파일이든 HTTP 스트림이든 상관없다. 비디오 패킷은 디코딩하지 않고 버린다.
+
+    Args:
+        progress_callback: (처리한 초, 전체 초) — 컨테이너 길이를 알 수 있을 때만 호출
+    """
+    blocks = _iter_pcm_blocks(input_container, sample_rate, progress_callback)
+    for _ in _tee_to_wav(blocks, wav_path, sample_rate):
+        pass
+
+
+_BLOCK_SEC = 10  # 리샘플러에 한 번에 넘길 디코딩 오디오 길이 (초)
+
+
+def _iter_pcm_blocks(
+    input_container,
+    sample_rate: int,
+    progress_callback: Optional[Callable[[float, float], None]] = None,
+) -> Iterator[np.ndarray]:
+    """첫 오디오 트랙을 sample_rate mono int16 PCM 블록으로 변환하여 순서대로 반환.
+
+    디코딩된 프레임(보통 1024샘플, 약 20ms)을 _BLOCK_SEC 분량씩 NumPy로 이어 붙여
+    리샘플러를 블록당 한 번만 호출한다. 리샘플러 상태는 블록 사이에도 이어지므로
+    프레임 단위로 리샘플링한 결과와 샘플 단위까지 동일하다.
+    """
+    if not input_container.streams.audio:
+        raise RuntimeError(f"오디오 스트림이 없음: {input_container.name}")
+
+    audio_stream = input_container.streams.audio[0]
+    total_sec = input_container.duration / av.time_base if input_container.duration else 0.0
+    resampler = av.AudioResampler(format='s16', layout='mono', rate=sample_rate)
+
+    pending = []
+    pending_samples = 0
+    block_format = None  # (format, layout, rate) — 도중에 바뀌면 그 전까지를 먼저 처리
+
+    def resample_pending() -> Optional[np.ndarray]:
+        data = pending[0] if len(pending) == 1 else np.concatenate(pending, axis=1)
+        block = av.AudioFrame.from_ndarray(data, format=block_format[0], layout=block_format[1])
+        block.sample_rate = block_format[2]
+        pending.clear()
+        return _frames_to_pcm(resampler.resample(block))
+
+    for frame in input_container.decode(audio_stream):
+        frame_format = (frame.format.name, frame.layout.name, frame.sample_rate)
+        if pending and frame_format != block_format:
+            pcm = resample_pending()
+            pending_samples = 0
+            if pcm is not None:
+                yield pcm
+        block_format = frame_format
+        pending.append(frame.to_ndarray())
+        pending_samples += frame.samples
 
-        # 인코더 버퍼 플러시
-        for packet in output_stream.encode(None):
-            output_container.mux(packet)
+        if pending_samples >= frame.sample_rate * _BLOCK_SEC:
+            pcm = resample_pending()
+            pending_samples = 0
+            if pcm is not None:
+                yield pcm
+            if progress_callback and total_sec > 0 and frame.time is not None:
+                progress_callback(min(frame.time, total_sec), total_sec)
 
-        output_container.close()
-        input_container.close()
-    except av.AVError as e:
+    if pending:
+        pcm = resample_pending()
+        if pcm is not None:
+            yield pcm
+
+    # 리샘플러 버퍼 플러시
+    pcm = _frames_to_pcm(resampler.resample(None))
+    if pcm is not None:
+        yield pcm
+
+
+def _frames_to_pcm(frames: list) -> Optional[np.ndarray]:
+    """리샘플링된 s16 mono 프레임들을 1차원 int16 배열 하나로 합친다"""
+    if not frames:
+        return None
+    arrays = [frame.to_ndarray().reshape(-1) for frame in frames]
+    return arrays[0] if len(arrays) == 1 else np.concatenate(arrays)
+
+
+def _tee_to_wav(blocks: Iterator[np.ndarray], wav_path: str, sample_rate: int) -> Iterator[np.ndarray]:
+    """PCM 블록을 WAV(16bit mono)로 통째로 기록하면서 그대로 다시 내보낸다"""
+    with wave.open(wav_path, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        for pcm in blocks:
+            wav_file.writeframesraw(pcm.astype('<i2', copy=False).tobytes())
+            yield pcm
+
+
+# ── 클라우드 STT 업로드용 압축 ───────────────────────────────
+
+# 형식 이름 → (인코더, 컨테이너, 확장자, 비트레이트). 16kHz mono 음성 기준으로 인식률 손실이 거의 없는 값.
+# 16bit PCM WAV(약 115MB/시간) 대비 opus는 약 11MB, mp3는 약 14MB.
+UPLOAD_FORMATS = {
+    "opus": ("libopus", "ogg", ".ogg", 24_000),
+    "mp3": ("libmp3lame", "mp3", ".mp3", 32_000),
+}
+# 인코더가 없는 FFmpeg 빌드에서 차례로 시도할 형식
+_UPLOAD_FALLBACKS = ("opus", "mp3")
+# 가변 비트레이트라 파일 크기가 예상보다 커질 수 있음 — 예산의 80%만 계획
+_UPLOAD_SIZE_MARGIN = 0.8
+_UPLOAD_OVERLAP_SEC = 3
+_SILENCE_FRAME_SEC = 0.1
+_MIN_SILENCE_SEC = 0.5
+
+
+def available_upload_format(fmt: str) -> Optional[str]:
+    """fmt 인코더를 쓸 수 있으면 fmt, 없으면 쓸 수 있는 다른 압축 형식 (모두 없으면 None)"""
+    for name in (fmt, *_UPLOAD_FALLBACKS):
+        if name not in UPLOAD_FORMATS:
+            continue
+        try:
+            av.codec.Codec(UPLOAD_FORMATS[name][0], "w")
+            return name
+        except Exception:
+            continue
+    return None
+
+
+def encode_for_upload(
+    input_path: str,
+    output_dir: str,
+    fmt: str = "opus",
+    max_bytes: int = 24 * 1024 * 1024,
+    sample_rate: int = 16000,
+) -> List[Tuple[str, AudioChunk]]:
+    """오디오를 압축 파일로 인코딩. max_bytes를 넘을 만큼 길면 무음 위치에서 여러 파일로 나눈다.
+
+    Returns:
+        [(압축 파일 경로, 원본에서의 샘플 위치)] — 순서대로 (오디오가 비어 있으면 빈 리스트). 무음을 찾지 못해 강제로 자른 경계는
+        AudioChunk.overlapped=True이고 앞 파일과 몇 초 겹친다.
+    """
+    codec, container, ext, bit_rate = UPLOAD_FORMATS[fmt]
+    try:
+        with av.open(input_path) as input_container:
+            blocks = list(_iter_pcm_blocks(input_container, sample_rate))
+    except av.FFmpegError as e:
         raise RuntimeError(f"오디오 변환 오류: {e}")
+    pcm = np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.int16)
+    if len(pcm) == 0:
+        return []
+
+    budget = int(max_bytes * 8 / bit_rate * _UPLOAD_SIZE_MARGIN) * sample_rate
+    chunks = plan_chunks(
+        _energy_speech_timestamps(pcm, sample_rate), len(pcm),
+        budget * 9 // 10, budget, _UPLOAD_OVERLAP_SEC * sample_rate,
+    )
+
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    pieces = []
+    pending = list(chunks)
+    while pending:
+        chunk = pending.pop(0)
+        path = os.path.join(output_dir, f"{stem}.part{len(pieces):03d}{ext}")
+        _encode_pcm(pcm[chunk.start:chunk.end], path, codec, container, bit_rate, sample_rate)
+        if os.path.getsize(path) > max_bytes and chunk.end - chunk.start > 2 * _UPLOAD_OVERLAP_SEC * sample_rate:
+            # 예상보다 커졌으면 반으로 나눠 다시 인코딩
+            os.remove(path)
+            mid = (chunk.start + chunk.end) // 2
+            pending[:0] = [
+                AudioChunk(chunk.start, mid, chunk.overlapped),
+                AudioChunk(mid - _UPLOAD_OVERLAP_SEC * sample_rate, chunk.end, True),
+            ]
+            continue
+        pieces.append((path, chunk))
+    return pieces
+
+
+def _energy_speech_timestamps(pcm: np.ndarray, sample_rate: int) -> List[dict]:
+    """음량으로 찾은 소리 구간 ({"start", "end"} 샘플 단위) — 그 사이의 무음이 나눌 수 있는 위치
+
+    _MIN_SILENCE_SEC보다 짧은 무음은 말 사이의 쉼으로 보고 앞뒤 구간을 잇는다.
+    """
+    frame = int(sample_rate * _SILENCE_FRAME_SEC)
+    n_frames = len(pcm) // frame
+    if n_frames == 0:
+        return []
+    frames = pcm[:n_frames * frame].astype(np.float32).reshape(n_frames, frame)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    # 강의는 대부분 말소리이므로 상위 25% 음량보다 20dB 이상 작으면 무음으로 본다
+    threshold = max(np.percentile(rms, 75) * 0.1, 100.0)
+    loud = rms > threshold
+
+    speech = []
+    min_gap = int(_MIN_SILENCE_SEC / _SILENCE_FRAME_SEC)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], loud.view(np.int8), [0]))))
+    for start, end in zip(edges[::2], edges[1::2]):
+        if speech and start - speech[-1][1] < min_gap:
+            speech[-1][1] = end
+        else:
+            speech.append([start, end])
+    return [{"start": int(s * frame), "end": int(e * frame)} for s, e in speech]
+
+
+def _encode_pcm(pcm: np.ndarray, path: str, codec: str, container: str, bit_rate: int, sample_rate: int):
+    """int16 mono PCM을 압축 오디오 파일로 인코딩"""
+    with av.open(path, "w", format=container) as output:
+        stream = output.add_stream(codec, rate=sample_rate)
+        stream.layout = "mono"
+        stream.bit_rate = bit_rate
+        resampler = av.AudioResampler(
+            format=stream.codec_context.format.name, layout="mono", rate=sample_rate,
+            frame_size=stream.codec_context.frame_size or 1024,
+        )
+        block = sample_rate * _BLOCK_SEC
+        for i in range(0, len(pcm), block):
+            frame = av.AudioFrame.from_ndarray(pcm[None, i:i + block], format="s16", layout="mono")
+            frame.sample_rate = sample_rate
+            for resampled in resampler.resample(frame):
+                output.mux(stream.encode(resampled))
+        for resampled in resampler.resample(None):
+            output.mux(stream.encode(resampled))
+        output.mux(stream.encode(None))
 
 
 # 하위 호환성 유지
@@ -1,12 +1,43 @@
 import os
 import time
 from pathlib import Path
+from typing import NamedTuple
 
-from src.audio_pipeline.transcriber import transcribe_audio_to_text
+from src.audio_pipeline.transcriber import max_concurrent_jobs, transcribe_audio_to_text
+
+
+class DecodedAudio(NamedTuple):
+    """WAV 파일 대신 STT 단계로 넘기는 디코딩된 오디오"""
+    source_path: str   # 원본 파일 경로 (텍스트 파일 이름에 사용)
+    samples: "object"  # 16kHz mono float32 numpy 배열
+
+
+def convert_to_wav_file(input_path: str, output_dir: str, sample_rate: int = 16000) -> str:
+    """오디오/비디오 파일을 output_dir/<이름>.wav로 변환하고 WAV 경로를 반환.
+
+    모듈 수준 함수라 프로세스 풀에 그대로 넘길 수 있다 (인스턴스를 피클하지 않음).
+    """
+    from src.audio_pipeline.converter import convert_audio_to_wav
+
+    filename = Path(input_path).stem
+    wav_path = os.path.join(output_dir, f"{filename}.wav")
+    os.makedirs(output_dir, exist_ok=True)
+
+    print(f"[INFO] WAV 변환 시작: {input_path}")
+    start_time = time.time()
+    convert_audio_to_wav(input_path, wav_path, sample_rate)
+    elapsed = time.time() - start_time
+    print(f"[DONE] WAV 변환 완료: {wav_path} ({elapsed:.1f}초)")
+
+    if not os.path.exists(wav_path):
+        raise RuntimeError(f"WAV 파일 생성 실패: {wav_path}")
+
+    return wav_path
 
 
 class AudioToTextPipeline:
-    def __init__(self, sample_rate=16000, engine="faster-whisper", model_name="large-v3-turbo", stt_params=None, on_log=None):
+    def __init__(self, sample_rate=16000, engine="faster-whisper", model_name="large-v3-turbo", stt_params=None, on_log=None,
+                 use_cache=False):
         self.sample_rate = sample_rate
         self.engine = engine
         self.model_name = model_name
@@ -14,39 +45,88 @@ class AudioToTextPipeline:
         self.on_log = on_log
         self.downloads_dir = None  # 다운로드 경로는 나중에 설정됨
         self._cached_transcriber = None  # 모델 로드 캐싱 (다중 파일 처리 시 재사용)
+        self.use_cache = use_cache  # 같은 오디오 + 같은 STT 설정이면 이전 변환 결과 재사용
 
     def convert_to_wav(self, input_path: str) -> str:
         """오디오/비디오 파일을 WAV로 변환하고 WAV 경로를 반환"""
-        from src.audio_pipeline.converter import convert_audio_to_wav
+        return convert_to_wav_file(input_path, self.downloads_dir, self.sample_rate)
 
-        filename = Path(input_path).stem
-        wav_path = os.path.join(self.downloads_dir, f"{filename}.wav")
-        os.makedirs(self.downloads_dir, exist_ok=True)
+    def decode_audio(self, input_path: str) -> DecodedAudio:
+        """오디오/비디오 파일을 WAV 파일 없이 메모리로 디코딩 (faster-whisper/STT 서버 전용)"""
+        from src.audio_pipeline.converter import decode_audio_to_array
 
-        print(f"[INFO] WAV 변환 시작: {input_path}")
+        print(f"[INFO] 오디오 디코딩 시작: {input_path}")
         start_time = time.time()
-        convert_audio_to_wav(input_path, wav_path, self.sample_rate)
+        samples = decode_audio_to_array(input_path, self.sample_rate)
         elapsed = time.time() - start_time
-        print(f"[DONE] WAV 변환 완료: {wav_path} ({elapsed:.1f}초)")
+        print(f"[DONE] 오디오 디코딩 완료: {len(samples) / self.sample_rate:.0f}초 분량 ({elapsed:.1f}초)")
 
-        if not os.path.exists(wav_path):
-            raise RuntimeError(f"WAV 파일 생성 실패: {wav_path}")
+        return DecodedAudio(input_path, samples)
 
-        return wav_path
+    def transcribe(self, wav_path: str, remove_wav: bool = True, audio=None) -> str:
+        """WAV 파일을 텍스트로 변환하고 텍스트 파일 경로를 반환.
+
+        audio(decode_audio로 얻은 배열)를 주면 wav_path는 이름으로만 쓰이고 파일을 읽지 않는다.
+        """
+        txt_path, self._cached_transcriber = self._transcribe(wav_path, remove_wav, audio, self._cached_transcriber)
+        return txt_path
 
-    def transcribe(self, wav_path: str, remove_wav: bool = True) -> str:
-        """WAV 파일을 텍스트로 변환하고 텍스트 파일 경로를 반환"""
+    @property
+    def max_concurrent_jobs(self) -> int:
+        """transcribe_many가 동시에 변환할 파일 수 (1이면 동시 변환을 지원하지 않는 엔진)"""
+        return max_concurrent_jobs(self.engine)
+
+    def transcribe_many(self, wav_paths, remove_wav: bool = True, check_cancelled=None):
+        """여러 WAV 파일을 동시에 변환하고 끝나는 순서대로 (wav_path, txt_path 또는 예외)를 내보낸다.
+
+        클라우드 작업형 엔진(ReturnZero)용 — 파일을 한꺼번에 올려 두고 모든 작업의 상태를 동시에 조회한다.
+        텍스트 파일은 각 WAV와 같은 디렉토리에 만든다 (인스턴스 상태인 downloads_dir를 쓰지 않음).
+        작업마다 Transcriber를 따로 만든다 (인증 토큰은 클래스 단위로 공유).
+        check_cancelled: 결과를 기다리는 동안 주기적으로 호출 (예외를 던지면 남은 작업을 버리고 중단)
+        """
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrent_jobs, len(wav_paths))))
+        try:
+            pending = {executor.submit(self.transcribe_beside, path, remove_wav): path for path in wav_paths}
+            while pending:
+                if check_cancelled is not None:
+                    check_cancelled()
+                done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    wav_path = pending.pop(future)
+                    try:
+                        yield wav_path, future.result()
+                    except Exception as e:
+                        yield wav_path, e
+        finally:
+            # 중단 시 아직 시작하지 않은 작업은 취소 (진행 중인 요청은 백그라운드에서 끝남)
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def transcribe_beside(self, wav_path: str, remove_wav: bool = True) -> str:
+        """WAV와 같은 디렉토리에 텍스트 파일을 만들고 경로를 반환.
+
+        호출마다 Transcriber를 새로 만들고 인스턴스 상태(downloads_dir, 캐시된 Transcriber)를 쓰지 않으므로
+        여러 스레드에서 동시에 불러도 된다 (클라우드 작업형 엔진의 동시 변환용).
+        """
+        return self._transcribe(wav_path, remove_wav, output_dir=str(Path(wav_path).parent))[0]
+
+    def _transcribe(self, wav_path: str, remove_wav: bool, audio=None, reuse_transcriber=None, output_dir=None):
+        """파일 하나 변환 → (텍스트 파일 경로, 사용한 Transcriber)"""
+        output_dir = output_dir or self.downloads_dir
         filename = Path(wav_path).stem
-        txt_path = os.path.join(self.downloads_dir, f"{filename}.txt")
-        os.makedirs(self.downloads_dir, exist_ok=True)
+        txt_path = os.path.join(output_dir, f"{filename}.txt")
+        os.makedirs(output_dir, exist_ok=True)
 
         print(f"[INFO] STT 변환 시작: {wav_path}")
         start_time = time.time()
-        self._cached_transcriber = transcribe_audio_to_text(
+        transcriber = transcribe_audio_to_text(
             wav_path, txt_path,
             engine=self.engine, model_name=self.model_name,
             params=self.stt_params, on_log=self.on_log,
-            _reuse_transcriber=self._cached_transcriber,
+            _reuse_transcriber=reuse_transcriber,
+            audio=audio,
+            cache=self._transcript_cache(),
         )
         elapsed = time.time() - start_time
         print(f"[DONE] 텍스트 저장 완료: {txt_path} ({elapsed:.1f}초)")
@@ -54,19 +134,32 @@ class AudioToTextPipeline:
         if not os.path.exists(txt_path):
             raise RuntimeError(f"텍스트 파일 생성 실패: {txt_path}")
 
-        if remove_wav:
+        if remove_wav and audio is None:
             os.remove(wav_path)
             print(f"[INFO] 임시 파일 삭제됨: {wav_path}")
 
-        return txt_path
+        return txt_path, transcriber
+
+    def _transcript_cache(self):
+        if not self.use_cache:
+            return None
+        from src.result_cache import get_cache
+        return get_cache("transcripts")
+
+    def process(self, input_path: str, remove_wav: bool = True, in_memory: bool = False) -> str:
+        """오디오/비디오 → WAV → 텍스트 전체 파이프라인 (하위 호환성 유지)
 
-    def process(self, input_path: str, remove_wav: bool = True) -> str:
-        """오디오/비디오 → WAV → 텍스트 전체 파이프라인 (하위 호환성 유지)"""
+        in_memory=True이고 faster-whisper 엔진이면 WAV 파일을 만들지 않고 메모리로 넘긴다.
+        """
         print(f"[INFO] 변환 시작: {input_path}")
         start_time = time.time()
 
-        wav_path = self.convert_to_wav(input_path)
-        txt_path = self.transcribe(wav_path, remove_wav=remove_wav)
+        if in_memory and self.engine in ("faster-whisper", "faster-whisper-server"):
+            decoded = self.decode_audio(input_path)
+            txt_path = self.transcribe(decoded.source_path, audio=decoded.samples)
+        else:
+            wav_path = self.convert_to_wav(input_path)
+            txt_path = self.transcribe(wav_path, remove_wav=remove_wav)
 
         end_time = time.time()
         print(f"[INFO] 총 소요 시간: {end_time - start_time:.1f}초")
@@ -0,0 +1,143 @@
+"""반복 구문 축약 (whisper 무한 루프 hallucination 후처리) — 스트리밍 방식
+
+예전 구현은 전체 텍스트에 re.sub(r'(.+?)\\1{k,}', r'\\1', text)를 적용했다. 결과 텍스트는
+줄바꿈 없이 한 줄이라 게으른 그룹이 텍스트 끝까지 늘어날 수 있고, 비슷한 구문이 반복되다
+어긋나는 hallucination 출력에서는 위치마다 긴 비교를 반복해 처리 시간이 제곱 이상으로 늘어난다.
+
+RepetitionCollapser는 같은 결과를 세그먼트가 들어오는 대로 만든다.
+- 위치 i에서 가장 짧은 반복 단위 L을 찾는다 (정규식의 게으른 .+? 와 같은 순서).
+  i부터 L칸 떨어진 글자끼리 K*L글자 연속으로 같으면 단위가 K번 이상 더 반복된다는 뜻이다.
+- L마다 "다음 불일치 위치"를 numpy로 한 번에 구하므로 블록 하나를 O(블록 길이 × 최대 단위 길이)에 처리한다.
+- 반복이 확정되면 단위 하나만 내보내고 이어지는 반복은 버린다 (블록 경계를 넘어가도 이어서 버림).
+- 판단에 필요한 뒷부분((K+1) × 최대 단위 길이)만 남기고 나머지는 바로 내보내므로 메모리가 일정하다.
+
+결과는 re.sub(r'(.{1,max_unit_chars}?)\1{k,}', r'\1', text)와 같다. 즉 최대 단위 길이보다 긴
+구문의 반복은 축약하지 않는다 (예전 정규식은 길이 제한이 없었음). 비교 측정: test/repetition_benchmark.py
+"""
+from typing import List, Optional
+
+import numpy as np
+
+DEFAULT_MAX_UNIT_CHARS = 200
+# 이만큼 모이면 한 번에 처리 (세그먼트마다 처리하면 판단용 뒷부분을 매번 다시 계산하게 됨)
+_BLOCK_CHARS = 16 * 1024
+
+
+class RepetitionCollapser:
+    """같은 구문이 repeat_threshold번 이상 연속으로 더 반복되면 1개로 축약하는 스트리밍 필터
+
+    feed()로 텍스트를 넣으면 확정된 부분을 돌려주고, 마지막에 flush()로 남은 부분을 받는다.
+    """
+
+    def __init__(self, repeat_threshold: int = 4, max_unit_chars: int = DEFAULT_MAX_UNIT_CHARS):
+        self.repeat_threshold = repeat_threshold
+        self.max_unit_chars = max_unit_chars
+        self.collapsed = 0          # 축약한 반복 구간 수
+        self._pending = ""          # 아직 판단하지 못한 텍스트
+        self._run_unit: Optional[str] = None  # 블록 끝까지 이어진 반복의 단위 (다음 입력에서 계속 버림)
+
+    @property
+    def _lookahead(self) -> int:
+        return (self.repeat_threshold + 1) * self.max_unit_chars
+
+    def feed(self, text: str) -> str:
+        if self.repeat_threshold <= 0:
+            return text
+        self._pending += text
+        if len(self._pending) < self._lookahead + _BLOCK_CHARS:
+            return ""
+        return self._process(final=False)
+
+    def flush(self) -> str:
+        if self.repeat_threshold <= 0:
+            return ""
+        out = self._process(final=True)
+        self._pending = ""
+        self._run_unit = None
+        return out
+
+    def _process(self, final: bool) -> str:
+        buf = self._pending
+        start = self._skip_run(buf, final)
+        if start is None:
+            return ""  # 반복이 아직 이어질 수 있음 — 다음 입력까지 보류
+
+        n = len(buf)
+        limit = n if final else n - self._lookahead
+        out: List[str] = []
+        if start < limit:
+            best = self._shortest_units(buf, start)
+            candidates = np.flatnonzero(best[:limit - start]) + start
+            i = start
+            k = 0
+            while i < limit:
+                k += int(np.searchsorted(candidates[k:], i))
+                if k >= len(candidates) or candidates[k] >= limit:
+                    out.append(buf[i:limit])
+                    i = limit
+                    break
+                c = int(candidates[k])
+                out.append(buf[i:c])
+                unit_len = int(best[c - start])
+                unit = buf[c:c + unit_len]
+                j = c + unit_len
+                while buf.startswith(unit, j):
+                    j += unit_len
+                out.append(unit)
+                self.collapsed += 1
+                i = j
+                if not final and n - j < unit_len and unit.startswith(buf[j:]):
+                    # 입력 끝까지 반복 중 — 다음 입력의 앞부분이 같은 단위면 이어서 버린다
+                    self._run_unit = unit
+                    break
+            start = i
+        self._pending = buf[start:]
+        return "".join(out)
+
+    def _skip_run(self, buf: str, final: bool) -> Optional[int]:
+        """이전 블록 끝에서 이어진 반복을 버리고 다음 위치를 반환 (아직 알 수 없으면 None)"""
+        unit = self._run_unit
+        if unit is None:
+            return 0
+        i = 0
+        while buf.startswith(unit, i):
+            i += len(unit)
+        if not final and len(buf) - i < len(unit) and unit.startswith(buf[i:]):
+            self._pending = buf[i:]
+            return None
+        self._run_unit = None
+        return i
+
+    def _shortest_units(self, buf: str, start: int) -> np.ndarray:
+        """buf[start:]의 각 위치에서 repeat_threshold번 이상 더 반복되는 가장 짧은 단위 길이 (없으면 0)"""
+        text = buf[start:]
+        n = len(text)
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        idx = np.arange(n)
+
+        # 위치마다 다음 줄바꿈 위치 (정규식의 . 은 줄바꿈을 포함하지 않음)
+        newline_at = np.where(codes == ord("\n"), idx, n)
+        next_newline = np.minimum.accumulate(newline_at[::-1])[::-1]
+
+        best = np.zeros(n, dtype=np.int32)
+        k = self.repeat_threshold
+        for unit_len in range(1, min(self.max_unit_chars, n // (k + 1)) + 1):
+            m = n - unit_len
+            same = codes[:m] == codes[unit_len:]
+            # 위치마다 다음 불일치 위치 → 그 위치까지 unit_len 주기로 같은 글자가 이어짐
+            mismatch_at = np.where(same, m, idx[:m])
+            next_mismatch = np.minimum.accumulate(mismatch_at[::-1])[::-1]
+            found = (
+                (next_mismatch - idx[:m] >= k * unit_len)
+                & (next_newline[:m] - idx[:m] >= unit_len)
+                & (best[:m] == 0)
+            )
+            best[:m][found] = unit_len
+        return best
+
+
+def collapse_repetitions(text: str, repeat_threshold: int = 4,
+                         max_unit_chars: int = DEFAULT_MAX_UNIT_CHARS) -> str:
+    """텍스트 전체에 RepetitionCollapser를 적용한다"""
+    collapser = RepetitionCollapser(repeat_threshold, max_unit_chars)
+    return collapser.feed(text) + collapser.flush()
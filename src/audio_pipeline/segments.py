@@ -0,0 +1,65 @@
+"""STT 결과 세그먼트 (타임스탬프가 붙은 발화 단위) 와 <stem>.segments.jsonl 형식
+
+모든 Transcriber는 변환 결과를 Segment 리스트(last_segments)로 남기고, .txt는 그 텍스트를
+순서대로 이어 붙여(+ 반복 구문 축약) 만든다. 세그먼트는 시작 시각 순서이고 서로 겹치지 않는다
+(start >= 앞 세그먼트의 end) — 청크/분할 업로드의 겹친 구간은 chunking.merge_chunk_segments가
+한 번만 남긴다. 텍스트만 돌려주는 엔진(verbose_json 미지원 서버)은 업로드 파일 하나가 세그먼트
+하나이므로 시각이 대략적이다. 세그먼트 파일은 한 줄에 세그먼트 하나:
+
+    {"start": 12.3, "end": 17.8, "text": "자 오늘은 ...", "avg_logprob": -0.21}
+
+avg_logprob은 엔진이 제공할 때만 들어간다 (faster-whisper, OpenAI verbose_json).
+줄 단위라 변환 중 체크포인트 저널, 변환 결과 캐시, STT 서버 응답에 같은 형태로 쓴다.
+"""
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Iterable, List, Optional
+
+SEGMENTS_SUFFIX = ".segments.jsonl"
+
+
+@dataclass
+class Segment:
+    start: float                         # 시작 시각 (초)
+    end: float                           # 끝 시각 (초)
+    text: str
+    avg_logprob: Optional[float] = None  # 디코딩 평균 로그 확률 (낮을수록 불확실, 엔진이 주지 않으면 None)
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        if self.avg_logprob is None:
+            del data["avg_logprob"]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Segment":
+        return cls(
+            start=float(data["start"]),
+            end=float(data["end"]),
+            text=data["text"],
+            avg_logprob=data.get("avg_logprob"),
+        )
+
+
+def segments_path(txt_path: str) -> str:
+    """텍스트 파일과 같은 위치의 세그먼트 파일 경로 (강의.txt → 강의.segments.jsonl)"""
+    return os.path.splitext(txt_path)[0] + SEGMENTS_SUFFIX
+
+
+def segments_text(segments: Iterable[Segment]) -> str:
+    """세그먼트 텍스트를 공백으로 이어 붙인 전문 (.txt 내용, 반복 구문 축약 전)"""
+    return " ".join(seg.text for seg in segments if seg.text)
+
+
+def write_segments(path: str, segments: Iterable[Segment]):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for seg in segments:
+            f.write(json.dumps(seg.to_dict(), ensure_ascii=False) + "\n")
+    os.replace(tmp_path, path)
+
+
+def read_segments(path: str) -> List[Segment]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [Segment.from_dict(json.loads(line)) for line in f if line.strip()]
@@ -0,0 +1,305 @@
+"""로컬 STT 서버 (faster-whisper 모델 상주 프로세스)
+
+ProcessingWorker 실행마다 WhisperModel을 새로 로드하면 실행할 때마다 모델 로드 시간
+(model_load_sec)이 반복된다. 이 서버는 별도 프로세스로 떠서 모델을 메모리에 유지하고,
+같은 PC의 클라이언트(FasterWhisperServerTranscriber)로부터 변환 작업을 받아
+진행 로그와 결과 텍스트(세그먼트 타임스탬프 포함)를 돌려준다.
+
+- 통신: multiprocessing.connection (127.0.0.1 TCP + authkey 인증)
+- 인증 키: 앱 데이터 디렉토리의 stt_server.key (최초 실행 시 무작위 생성)
+- 유휴 시간(idle_timeout) 동안 작업이 없으면 스스로 종료해 메모리를 돌려준다.
+
+실행:
+    python -m src.audio_pipeline.stt_server [--port 50761] [--idle-timeout 1800]
+"""
+import argparse
+import os
+import secrets
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_PORT = 50761
+DEFAULT_IDLE_TIMEOUT_SEC = 30 * 60
+_HOST = "127.0.0.1"
+_STARTUP_TIMEOUT_SEC = 30
+_WATCHDOG_INTERVAL_SEC = 10
+
+# 값이 바뀌면 모델을 다시 로드해야 하는 파라미터 (나머지는 작업마다 적용)
+_MODEL_PARAM_KEYS = ("stt_mode", "stt_workers", "vad_filter")
+
+
+def _authkey_path() -> str:
+    from src.gui.core.file_manager import get_app_data_dir
+    return os.path.join(get_app_data_dir(), "stt_server.key")
+
+
+def load_authkey() -> bytes:
+    """서버/클라이언트 공용 인증 키 반환 (없으면 생성)"""
+    path = _authkey_path()
+    try:
+        with open(path, "rb") as f:
+            key = f.read()
+        if key:
+            return key
+    except FileNotFoundError:
+        pass
+    key = secrets.token_hex(32).encode("ascii")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+class STTServer:
+    """작업을 연결 단위 스레드로 받고, 모델 사용은 한 번에 한 작업씩 직렬화한다"""
+
+    def __init__(self, port: int = DEFAULT_PORT, idle_timeout: float = DEFAULT_IDLE_TIMEOUT_SEC,
+                 authkey: Optional[bytes] = None):
+        self.address = (_HOST, port)
+        self.idle_timeout = idle_timeout
+        self._authkey = authkey or load_authkey()
+        self._listener: Optional[Listener] = None
+        self._model_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._active_jobs = 0
+        self._last_activity = time.time()
+        self._stopping = threading.Event()
+
+        self._transcriber = None
+        self._transcriber_key = None
+        self._jobs_done = 0
+
+    # ── 서버 루프 ──────────────────────────────────────────
+
+    def serve_forever(self):
+        self._listener = Listener(self.address, authkey=self._authkey)
+        print(f"[INFO] STT 서버 시작: {self.address[0]}:{self.address[1]} "
+              f"(유휴 {self.idle_timeout / 60:.0f}분 후 종료)", flush=True)
+        threading.Thread(target=self._watchdog, daemon=True).start()
+        try:
+            while not self._stopping.is_set():
+                try:
+                    conn = self._listener.accept()
+                except (OSError, EOFError, AuthenticationError):
+                    # 인증 실패/접속 직후 끊김 — 다른 클라이언트는 계속 받는다
+                    continue
+                if self._stopping.is_set():
+                    conn.close()
+                    break
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            self._listener.close()
+            print("[INFO] STT 서버 종료", flush=True)
+
+    def _watchdog(self):
+        while not self._stopping.wait(_WATCHDOG_INTERVAL_SEC):
+            with self._state_lock:
+                idle = self._active_jobs == 0 and time.time() - self._last_activity >= self.idle_timeout
+            if idle:
+                print("[INFO] 유휴 시간 초과 — STT 서버를 종료합니다", flush=True)
+                self.stop()
+
+    def stop(self):
+        """accept()에서 대기 중인 루프를 깨워 종료시킨다"""
+        if self._stopping.is_set():
+            return
+        self._stopping.set()
+        try:
+            Client(self.address, authkey=self._authkey).close()
+        except OSError:
+            pass
+
+    def _touch(self, delta: int = 0):
+        with self._state_lock:
+            self._active_jobs += delta
+            self._last_activity = time.time()
+
+    # ── 요청 처리 ──────────────────────────────────────────
+
+    def _handle(self, conn):
+        self._touch(+1)
+        try:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    break
+                command = request.get("command")
+                if command == "ping":
+                    conn.send(("pong", self._status()))
+                elif command == "shutdown":
+                    conn.send(("ok", None))
+                    self.stop()
+                    break
+                elif command == "transcribe":
+                    self._run_job(conn, request)
+                else:
+                    conn.send(("error", f"알 수 없는 명령: {command}"))
+        finally:
+            conn.close()
+            self._touch(-1)
+
+    def _status(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "model": self._transcriber_key[0] if self._transcriber_key else None,
+            "jobs_done": self._jobs_done,
+        }
+
+    def _run_job(self, conn, request: dict):
+        def send_log(msg):
+            try:
+                conn.send(("log", msg))
+            except OSError:
+                pass  # 클라이언트가 끊겨도 작업은 마저 끝낸다
+
+        try:
+            with self._model_lock:
+                transcriber, model_load_sec = self._get_transcriber(request, send_log)
+                transcriber.apply_params(request.get("params") or {}, on_log=send_log)
+                txt_path = request.get("txt_path")
+                if txt_path:
+                    # 클라이언트의 실제 결과 경로에 쓴다 — 체크포인트 저널이 그 옆에 남아 다음 요청에서 이어진다
+                    text = self._transcribe_to(transcriber, request, txt_path)
+                else:
+                    with tempfile.TemporaryDirectory(prefix="stt_server_") as tmp_dir:
+                        text = self._transcribe_to(transcriber, request, os.path.join(tmp_dir, "result.txt"))
+                self._jobs_done += 1
+            conn.send(("done", {
+                "text": text, "segments": [seg.to_dict() for seg in transcriber.last_segments],
+                "model_load_sec": model_load_sec,
+            }))
+        except Exception as e:
+            print(f"[ERROR] STT 작업 실패: {e}", flush=True)
+            try:
+                conn.send(("error", str(e)))
+            except OSError:
+                pass
+        finally:
+            self._touch()
+
+    @staticmethod
+    def _transcribe_to(transcriber, request: dict, txt_path: str) -> str:
+        transcriber.transcribe(request["audio_path"], txt_path, audio=request.get("audio"))
+        with open(txt_path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def _get_transcriber(self, request: dict, on_log) -> tuple:
+        """설정이 같으면 상주 모델 재사용, 다르면 교체. (transcriber, 이번에 걸린 로드 시간) 반환"""
+        from src.audio_pipeline.transcriber import FasterWhisperTranscriber
+
+        params = request.get("params") or {}
+        key = (
+            request.get("model_name"), request.get("device", "auto"), request.get("compute_type", "auto"),
+            tuple(params.get(k) for k in _MODEL_PARAM_KEYS),
+        )
+        if self._transcriber is not None and self._transcriber_key == key:
+            on_log(f"[stt-server] 상주 모델 재사용: {key[0]} (작업 {self._jobs_done + 1}번째)")
+            return self._transcriber, 0.0
+
+        # 이전 모델을 먼저 놓아야 두 모델이 동시에 메모리를 차지하지 않는다
+        self._transcriber = None
+        self._transcriber_key = None
+        transcriber = FasterWhisperTranscriber(
+            model_name=key[0], device=key[1], compute_type=key[2], params=params, on_log=on_log,
+        )
+        self._transcriber, self._transcriber_key = transcriber, key
+        return transcriber, transcriber.model_load_sec
+
+
+# ── 클라이언트 측 헬퍼 ─────────────────────────────────────
+
+def _server_command(port: int, idle_timeout: float) -> list:
+    args = ["--port", str(port), "--idle-timeout", str(int(idle_timeout))]
+    if getattr(sys, "frozen", False):
+        # PyInstaller 번들: GUI 실행 파일이 --stt-server 인자를 받으면 서버로 동작 (src/gui/main.py)
+        return [sys.executable, "--stt-server", *args]
+    return [sys.executable, "-m", "src.audio_pipeline.stt_server", *args]
+
+
+def start_server_process(port: int = DEFAULT_PORT, idle_timeout: float = DEFAULT_IDLE_TIMEOUT_SEC):
+    """STT 서버를 현재 앱과 독립된 백그라운드 프로세스로 띄운다 (앱이 종료돼도 유지)"""
+    from src.gui.core.file_manager import get_app_data_dir
+
+    project_root = Path(__file__).resolve().parents[2]
+    log_path = os.path.join(get_app_data_dir(), "stt_server.log")
+    kwargs = {}
+    if sys.platform == "win32":
+        kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.CREATE_NO_WINDOW
+    else:
+        kwargs["start_new_session"] = True
+
+    with open(log_path, "ab") as log_file:
+        subprocess.Popen(
+            _server_command(port, idle_timeout),
+            cwd=str(project_root),
+            stdin=subprocess.DEVNULL, stdout=log_file, stderr=subprocess.STDOUT,
+            env={**os.environ, "PYTHONUNBUFFERED": "1"},
+            **kwargs,
+        )
+
+
+def connect(port: int = DEFAULT_PORT, autostart: bool = True,
+            idle_timeout: float = DEFAULT_IDLE_TIMEOUT_SEC, on_log=None):
+    """STT 서버에 연결한다. 서버가 없고 autostart면 띄운 뒤 준비될 때까지 기다린다."""
+    _log = on_log or (lambda msg: None)
+    address = (_HOST, port)
+    authkey = load_authkey()
+    try:
+        return Client(address, authkey=authkey)
+    except ConnectionRefusedError:
+        if not autostart:
+            raise
+
+    _log(f"[stt-server] 실행 중인 STT 서버가 없어 새로 시작합니다 (포트 {port})")
+    start_server_process(port, idle_timeout)
+    deadline = time.time() + _STARTUP_TIMEOUT_SEC
+    while True:
+        try:
+            return Client(address, authkey=authkey)
+        except ConnectionRefusedError:
+            if time.time() >= deadline:
+                raise RuntimeError(
+                    f"STT 서버가 {_STARTUP_TIMEOUT_SEC}초 안에 시작되지 않았습니다 (stt_server.log 확인)"
+                )
+            time.sleep(0.5)
+
+
+def shutdown(port: int = DEFAULT_PORT) -> bool:
+    """실행 중인 STT 서버를 종료한다. 서버가 없으면 False."""
+    try:
+        conn = Client((_HOST, port), authkey=load_authkey())
+    except ConnectionRefusedError:
+        return False
+    with conn:
+        conn.send({"command": "shutdown"})
+        conn.recv()
+    return True
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="faster-whisper 모델 상주 STT 서버")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT_SEC,
+                        help="작업이 없을 때 종료까지 대기할 시간 (초)")
+    args = parser.parse_args(argv)
+
+    try:
+        server = STTServer(port=args.port, idle_timeout=args.idle_timeout)
+        server.serve_forever()
+    except OSError as e:
+        # 다른 인스턴스가 이미 포트를 쓰고 있으면 그대로 종료 (동시 autostart 경쟁)
+        print(f"[WARN] STT 서버를 시작할 수 없습니다: {e}", flush=True)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,33 @@
-import json
-import re
 import subprocess
 import sys
+import threading
 import time
 from abc import ABC, abstractmethod
 import os
 import requests
+from src.audio_pipeline.checkpoint import TranscriptCheckpoint, audio_fingerprint, resume_source
+from src.audio_pipeline.repetition import RepetitionCollapser, collapse_repetitions
+from src.audio_pipeline.segments import Segment, segments_path, segments_text, write_segments
+from src.http_session import get_session
 from src.user_setting import UserSetting
 
 # https://developers.rtzr.ai/docs/stt-file/
 
+# chunked 모드 청크 길이/겹침 (초)
+_CHUNK_MIN_SEC = 60
+_CHUNK_MAX_SEC = 600
+_CHUNK_OVERLAP_SEC = 3
+
 
 def clean_transcript(text: str, repeat_threshold: int = 4) -> str:
     """반복 구문 제거 (whisper 무한 루프 hallucination 후처리)
 
     같은 구문이 repeat_threshold번 이상 연속 반복되면 1개로 축약.
-    repeat_threshold <= 0 이면 비활성화.
+    repeat_threshold <= 0 이면 비활성화. (src/audio_pipeline/repetition.py 참고)
     """
     if repeat_threshold <= 0:
         return text
-    pattern = r'(.+?)\1{' + str(repeat_threshold) + r',}'
-    return re.sub(pattern, r'\1', text)
+    return collapse_repetitions(text, repeat_threshold)
 
 
 def transcribe_audio_to_text(
@@ -31,12 +38,18 @@ def transcribe_audio_to_text(
     params=None,
     on_log=None,
     _reuse_transcriber=None,
+    audio=None,
+    cache=None,
 ):
     """오디오/비디오 파일을 텍스트로 변환.
 
     Args:
+        audio: 이미 디코딩된 16kHz mono float32 배열. 주면 faster-whisper가 audio_path를 다시
+            읽지 않고 이 배열을 바로 사용한다 (audio_path는 로그용 이름으로만 쓰임).
         _reuse_transcriber: 이전 호출에서 반환된 Transcriber 인스턴스.
             전달하면 모델 재로드를 생략하여 성능이 크게 향상됩니다.
+        cache: src.result_cache.ResultCache. 주면 오디오 내용 해시 + STT 설정으로 이전 결과를 찾아
+            모델을 로드하기 전에 재사용하고, 새로 변환한 결과는 저장한다.
 
     Returns:
         사용된 Transcriber 인스턴스 (다음 호출 시 _reuse_transcriber로 전달)
@@ -45,6 +58,75 @@ def transcribe_audio_to_text(
     params = dict(params or {})
     repeat_threshold = int(params.pop("repeat_threshold", 4))
 
+    cache_key = None
+    cached = None
+    if cache is not None:
+        cache_key = _transcript_cache_key(audio_path, audio, engine, model_name, params)
+        cached = cache.get(cache_key)
+
+    collapsed_inline = False
+    if cached is not None:
+        transcriber = _reuse_transcriber
+        with open(txt_path, "w", encoding="utf-8") as f:
+            f.write(cached["text"])
+        if cached.get("segments") is not None:
+            write_segments(segments_path(txt_path), [Segment.from_dict(seg) for seg in cached["segments"]])
+        _log(f"[캐시] 이전 변환 결과 재사용: {os.path.basename(audio_path)} "
+             f"(원본: {cached.get('source', '?')})")
+    else:
+        transcriber = _create_transcriber(engine, model_name, params, on_log, _reuse_transcriber)
+        # faster-whisper(로컬)는 세그먼트가 나오는 대로 반복 구문을 축약한다
+        transcriber.repeat_threshold = repeat_threshold
+        if audio is not None:
+            if not isinstance(transcriber, (FasterWhisperTranscriber, FasterWhisperServerTranscriber)):
+                raise ValueError(f"{engine} 엔진은 메모리 오디오 입력을 지원하지 않습니다")
+            transcriber.transcribe(audio_path, txt_path, audio=audio)
+        else:
+            transcriber.transcribe(audio_path, txt_path)
+        collapsed_inline = transcriber.last_raw_text is not None
+        if transcriber.last_segments is not None:
+            write_segments(segments_path(txt_path), transcriber.last_segments)
+        if collapsed_inline and transcriber.last_collapsed:
+            _log(f"[후처리] 반복 구문 {transcriber.last_collapsed}곳 축약 (임계값: {repeat_threshold}회)")
+
+        # 후처리 전 원문을 저장 (반복 임계값을 바꿔도 캐시를 그대로 쓸 수 있도록)
+        if cache is not None and os.path.exists(txt_path):
+            if collapsed_inline:
+                raw_text = transcriber.last_raw_text
+            else:
+                with open(txt_path, "r", encoding="utf-8") as f:
+                    raw_text = f.read()
+            cache.put(cache_key, {
+                "text": raw_text,
+                "segments": ([seg.to_dict() for seg in transcriber.last_segments]
+                             if transcriber.last_segments is not None else None),
+                "source": os.path.basename(audio_path),
+                "engine": engine,
+                "model_name": model_name,
+            })
+
+    # 반복 구문 후처리 (변환 중에 축약하지 않은 엔진/캐시 재사용)
+    if repeat_threshold > 0 and not collapsed_inline and os.path.exists(txt_path):
+        with open(txt_path, "r", encoding="utf-8") as f:
+            raw = f.read()
+        cleaned = clean_transcript(raw, repeat_threshold)
+        if cleaned != raw:
+            with open(txt_path, "w", encoding="utf-8") as f:
+                f.write(cleaned)
+            _log(f"[후처리] 반복 구문 제거 완료 (임계값: {repeat_threshold}회)")
+
+    return transcriber
+
+
+def max_concurrent_jobs(engine: str) -> int:
+    """엔진이 여러 파일을 동시에 변환할 수 있는 작업 수 (1이면 한 파일씩 순서대로)"""
+    if engine == "returnzero":
+        return ReturnZeroTranscriber.max_concurrent_jobs
+    return 1
+
+
+def _create_transcriber(engine, model_name, params, on_log, _reuse_transcriber):
+    """엔진 이름으로 Transcriber 생성 (_reuse_transcriber가 있으면 그대로 사용)"""
     if engine == "faster-whisper":
         if _reuse_transcriber is not None:
             transcriber = _reuse_transcriber
@@ -55,21 +137,28 @@ def transcribe_audio_to_text(
                 model_name=model_name, device=device, compute_type=compute_type,
                 params=params, on_log=on_log,
             )
+    elif engine == "faster-whisper-server":
+        if _reuse_transcriber is not None:
+            transcriber = _reuse_transcriber
+        else:
+            transcriber = FasterWhisperServerTranscriber(model_name=model_name, params=params, on_log=on_log)
     elif engine == "openai-whisper":
         if _reuse_transcriber is not None:
             transcriber = _reuse_transcriber
         else:
             api_key = params.pop("api_key", None)
-            transcriber = OpenAIWhisperTranscriber(api_key=api_key, on_log=on_log)
+            upload_format = params.pop("upload_format", "opus")
+            transcriber = OpenAIWhisperTranscriber(api_key=api_key, upload_format=upload_format, on_log=on_log)
     elif engine == "openai-compatible":
         if _reuse_transcriber is not None:
             transcriber = _reuse_transcriber
         else:
             base_url = params.pop("base_url", None)
             api_key = params.pop("api_key", None)
+            upload_format = params.pop("upload_format", "opus")
             transcriber = OpenAICompatibleSTTTranscriber(
                 base_url=base_url, api_key=api_key,
-                model_name=model_name, on_log=on_log,
+                model_name=model_name, upload_format=upload_format, on_log=on_log,
             )
     elif engine == "returnzero":
         if _reuse_transcriber is not None:
@@ -78,20 +167,30 @@ def transcribe_audio_to_text(
             transcriber = ReturnZeroTranscriber()
     else:
         raise ValueError("지원하지 않는 엔진입니다")
+    return transcriber
 
-    transcriber.transcribe(audio_path, txt_path)
 
-    # 반복 구문 후처리 (양쪽 엔진 공통)
-    if repeat_threshold > 0 and os.path.exists(txt_path):
-        with open(txt_path, "r", encoding="utf-8") as f:
-            raw = f.read()
-        cleaned = clean_transcript(raw, repeat_threshold)
-        if cleaned != raw:
-            with open(txt_path, "w", encoding="utf-8") as f:
-                f.write(cleaned)
-            _log(f"[후처리] 반복 구문 제거 완료 (임계값: {repeat_threshold}회)")
+def _transcript_cache_key(audio_path, audio, engine, model_name, params) -> str:
+    """오디오 내용 해시 + 결과에 영향을 주는 STT 설정으로 캐시 키 생성
 
-    return transcriber
+    메모리 오디오(pcm:)와 WAV 파일(file:)은 서로 다른 항목이다. 메모리 배열은 디코더가 바로 낸
+    float32이고 WAV는 int16으로 저장한 것이라 같은 강의라도 바이트가 달라, 한쪽 해시로 다른 쪽을
+    찾을 수 없다. 그래서 in_memory_audio 설정을 바꾼 직후 첫 변환은 캐시에 없고 새로 변환된다.
+    """
+    import hashlib
+    from src.result_cache import hash_file, make_key
+
+    if audio is not None:
+        audio_hash = "pcm:" + hashlib.sha256(memoryview(audio)).hexdigest()
+    else:
+        audio_hash = "file:" + hash_file(audio_path)
+    # STT 서버는 같은 faster-whisper 모델로 변환하므로 같은 결과로 취급
+    engine_key = "faster-whisper" if engine == "faster-whisper-server" else engine
+    return make_key(
+        audio_hash, engine_key, model_name, params.get("base_url"),
+        params.get("language", "ko"), params.get("initial_prompt", "한국어 강의입니다."),
+        bool(params.get("vad_filter", True)),
+    )
 
 
 # 하위 호환성 유지
@@ -99,19 +198,37 @@ transcribe_wav_to_text = transcribe_audio_to_text
 
 
 class Transcriber(ABC):
+    # 마지막 변환의 세그먼트 (List[Segment], <stem>.segments.jsonl로 저장됨)
+    last_segments = None
+    # 반복 구문 축약 임계값 — 변환 중에 바로 축약하는 엔진만 사용 (0 = 끔)
+    repeat_threshold = 0
+    # 변환 중에 축약했다면 축약 전 원문과 축약한 구간 수 (축약하지 않는 엔진은 None)
+    last_raw_text = None
+    last_collapsed = 0
+
     @abstractmethod
     def transcribe(self, audio_path: str, txt_path: str):
         pass
 
+    def _save_segments(self, txt_path: str, segments):
+        """세그먼트를 결과로 남기고 그 텍스트로 .txt를 쓴다"""
+        self.last_segments = list(segments)
+        with open(txt_path, "w", encoding="utf-8") as f:
+            f.write(segments_text(self.last_segments))
+
 
 
 class FasterWhisperTranscriber(Transcriber):
     def __init__(self, model_name="large-v3-turbo", device="auto", compute_type="auto", params=None, on_log=None):
         from faster_whisper import WhisperModel
         self._on_log = on_log or (lambda msg: None)
+        self._model_name = model_name
         self._language = (params or {}).get("language", "ko")
         self._initial_prompt = (params or {}).get("initial_prompt", "한국어 강의입니다.")
         self._vad_filter = bool((params or {}).get("vad_filter", True))
+        self._stt_mode = (params or {}).get("stt_mode", "sequential")
+        self._batch_size = int((params or {}).get("batch_size", 0) or 0)
+        self._stt_workers = int((params or {}).get("stt_workers", 0) or 0)
 
         # VAD(silero) ONNX 파일 가용성 확인 — PyInstaller 빌드 환경에서 누락 가능
         if self._vad_filter:
@@ -135,20 +252,89 @@ class FasterWhisperTranscriber(Transcriber):
         load_start = time.time()
 
         try:
-            self.model = WhisperModel(model_name, device=resolved_device, compute_type=resolved_compute)
+            self.model = WhisperModel(model_name, device=resolved_device, compute_type=resolved_compute,
+                                      **self._worker_kwargs(resolved_device))
         except Exception as e:
             if resolved_device != "cpu":
                 self._on_log(f"⚠️ GPU 초기화 실패: {e}")
                 self._on_log("[faster-whisper] CPU 모드로 전환합니다...")
                 resolved_device = "cpu"
                 resolved_compute = "int8"
-                self.model = WhisperModel(model_name, device="cpu", compute_type="int8")
+                self.model = WhisperModel(model_name, device="cpu", compute_type="int8",
+                                          **self._worker_kwargs("cpu"))
             else:
                 raise
 
         self.model_load_sec = time.time() - load_start
         self._on_log(f"[faster-whisper] 모델 로드 완료: {self.model_load_sec:.1f}초 (device={resolved_device})")
 
+        self._batched_pipeline = None
+        if self._stt_mode == "batched":
+            self._setup_batched_pipeline(resolved_device)
+
+    def apply_params(self, params: dict, on_log=None):
+        """모델을 다시 로드하지 않고 바꿀 수 있는 디코딩 설정을 갱신 (STT 서버의 상주 모델용)"""
+        if on_log is not None:
+            self._on_log = on_log
+        self._language = params.get("language", "ko")
+        self._initial_prompt = params.get("initial_prompt", "한국어 강의입니다.")
+        if int(params.get("batch_size", 0) or 0) > 0:
+            self._batch_size = int(params["batch_size"])
+
+    def _worker_kwargs(self, device: str) -> dict:
+        """chunked 모드: 청크를 동시에 디코딩할 CTranslate2 워커 수와 워커당 CPU 스레드 수"""
+        if self._stt_mode != "chunked":
+            return {}
+        if self._stt_workers <= 0:
+            self._stt_workers = self._default_stt_workers(device)
+        if self._stt_workers <= 1:
+            self._on_log("[faster-whisper] CPU 코어가 적어 청크 병렬 변환 대신 순차 디코딩을 사용합니다.")
+            return {}
+        kwargs = {"num_workers": self._stt_workers}
+        if device == "cpu":
+            kwargs["cpu_threads"] = max(1, (os.cpu_count() or 1) // self._stt_workers)
+        self._on_log(f"[faster-whisper] 청크 병렬 변환 사용 (워커 {self._stt_workers}개)")
+        return kwargs
+
+    @staticmethod
+    def _default_stt_workers(device: str) -> int:
+        """chunked 모드 워커 수 기본값.
+
+        CTranslate2는 한 디코딩에 4스레드 정도까지만 잘 확장되므로, CPU에서는 코어 4개당
+        워커 하나를 두어 남는 코어를 다른 청크 디코딩에 쓴다 (최대 4개).
+        """
+        if device == "cuda":
+            return 2
+        return max(1, min(4, (os.cpu_count() or 1) // 4))
+
+    def _setup_batched_pipeline(self, device: str):
+        """여러 VAD 구간을 한 번의 forward로 디코딩하는 BatchedInferencePipeline 준비"""
+        if not self._vad_filter:
+            # 배치 디코딩은 VAD로 나눈 음성 구간 단위로 묶으므로 VAD 없이는 이점이 없음
+            self._on_log("⚠️ [faster-whisper] VAD 필터가 꺼져 있어 배치 디코딩 대신 순차 디코딩을 사용합니다.")
+            return
+        try:
+            from faster_whisper import BatchedInferencePipeline
+        except ImportError:
+            self._on_log("⚠️ [faster-whisper] 설치된 버전이 배치 디코딩을 지원하지 않아 순차 디코딩을 사용합니다.")
+            return
+
+        if self._batch_size <= 0:
+            self._batch_size = self._default_batch_size(device)
+        self._batched_pipeline = BatchedInferencePipeline(model=self.model)
+        self._on_log(f"[faster-whisper] 배치 디코딩 사용 (batch_size={self._batch_size})")
+
+    @staticmethod
+    def _default_batch_size(device: str) -> int:
+        """배치 크기 기본값.
+
+        GPU는 16. CPU(int8)는 배치를 키워도 코어 수 이상으로는 처리량이 늘지 않고
+        메모리만 늘어나므로 물리 코어 수의 절반 정도(2~8)로 제한한다.
+        """
+        if device == "cuda":
+            return 16
+        return max(2, min(8, (os.cpu_count() or 4) // 2))
+
     @staticmethod
     def _check_vad_available() -> bool:
         """silero VAD ONNX 모델 파일이 존재하는지 확인.
@@ -249,85 +435,380 @@ class FasterWhisperTranscriber(Transcriber):
         except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
             pass
 
-    def transcribe(self, audio_path: str, txt_path: str):
+    def transcribe(self, audio_path: str, txt_path: str, audio=None):
+        """audio(16kHz mono float32 배열)를 주면 파일을 읽지 않고 배열을 바로 디코딩"""
         transcribe_start = time.time()
 
-        # 오디오 파일 크기로 예상 소요 시간 가이드 표시
-        try:
-            audio_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
-            self._on_log(f"[faster-whisper] 오디오 파일: {audio_size_mb:.1f} MB")
-        except OSError:
-            pass
+        if audio is not None:
+            self._on_log(f"[faster-whisper] 메모리 오디오: {len(audio) / 16000 / 60:.1f}분")
+        else:
+            # 오디오 파일 크기로 예상 소요 시간 가이드 표시
+            try:
+                audio_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
+                self._on_log(f"[faster-whisper] 오디오 파일: {audio_size_mb:.1f} MB")
+            except OSError:
+                pass
 
         self._on_log(f"[faster-whisper] 변환 시작: {os.path.basename(audio_path)}")
-        segments, info = self.model.transcribe(
-            audio_path,
-            language=self._language,
-            initial_prompt=self._initial_prompt,
-            vad_filter=self._vad_filter,
-            beam_size=1,                  # 빔 서치 1로 고정 (속도 우선)
-        )
+        if self._stt_mode == "chunked" and self._stt_workers > 1:
+            # 청크가 완료 순서대로 끝나므로 "여기까지 처리했다"는 위치가 없다 — 체크포인트 미지원
+            self._on_log("[faster-whisper] 청크 병렬 변환은 체크포인트를 쓰지 않습니다 (중단되면 처음부터 다시 변환)")
+            self._transcribe_chunked(audio if audio is not None else audio_path, txt_path, transcribe_start)
+            return
+
+        # 이전 변환이 중간에 끊겼다면 저장된 세그먼트를 복구하고 그 위치부터 이어서 변환
+        checkpoint = TranscriptCheckpoint(txt_path, self._checkpoint_fingerprint(audio_path, audio))
+        resumed = checkpoint.load()
+        offset = checkpoint.offset(resumed)
+        source = audio if audio is not None else audio_path
+        if offset > 0:
+            self._on_log(f"[faster-whisper] 체크포인트에서 이어서 변환: {offset / 60:.1f}분 지점부터 "
+                         f"(세그먼트 {len(resumed)}개 복구)")
+            source = resume_source(source, offset)
+
+        segments, info = iter(()), None
+        if source is not None:
+            segments, info = self._decode_segments(source)
 
         text_parts = []
+        collapser = RepetitionCollapser(self.repeat_threshold)
+        self.last_segments = []
         last_log_time = time.time()
         LOG_INTERVAL = 10  # 최소 10초 간격으로 진행 상황 로그
         first_segment = True
 
-        for i, seg in enumerate(segments):
-            if first_segment:
-                first_elapsed = time.time() - transcribe_start
-                self._on_log(f"[faster-whisper] 첫 세그먼트 디코딩 완료 ({first_elapsed:.1f}초)")
-                first_segment = False
+        checkpoint.start(resumed)
+        try:
+            with open(txt_path, "w", encoding="utf-8") as f:
+                def write_segment(segment):
+                    text_parts.append(segment.text)
+                    self.last_segments.append(segment)
+                    # 세그먼트 사이 공백까지 넣어야 " ".join 결과와 같은 텍스트를 축약하게 됨
+                    f.write(collapser.feed(segment.text if len(text_parts) == 1 else " " + segment.text))
+                    f.flush()
+
+                for segment in resumed:
+                    write_segment(segment)
+
+                for i, seg in enumerate(segments):
+                    if first_segment:
+                        first_elapsed = time.time() - transcribe_start
+                        self._on_log(f"[faster-whisper] 첫 세그먼트 디코딩 완료 ({first_elapsed:.1f}초)")
+                        first_segment = False
+
+                    if not checkpoint.owned:
+                        # 중지/타임아웃 후 남아 있던 변환 스레드 — 새 변환에 저널과 텍스트 파일을 넘긴다
+                        raise RuntimeError(f"같은 파일의 새 변환이 시작되어 이전 변환을 중단했습니다: "
+                                           f"{os.path.basename(txt_path)}")
+
+                    if seg.text.strip():
+                        segment = self._to_segment(seg, offset)
+                        checkpoint.append(segment)
+                        write_segment(segment)
+
+                    now = time.time()
+                    # 정기 진척도 로그 (10초 간격 + 최소 1세그먼트 경과)
+                    if i > 0 and (now - last_log_time) >= LOG_INTERVAL:
+                        elapsed_so_far = now - transcribe_start
+                        self._on_log(
+                            f"  처리 중... {i+1} 세그먼트 ({elapsed_so_far:.0f}초 경과)"
+                        )
+                        last_log_time = now
+
+                f.write(collapser.flush())
+        except BaseException:
+            checkpoint.close()
+            raise
+        checkpoint.finish()
+
+        self.last_raw_text = " ".join(text_parts)
+        self.last_collapsed = collapser.collapsed
+
+        elapsed = time.time() - transcribe_start
+        self._on_log(f"[faster-whisper] 변환 완료: {os.path.basename(txt_path)}")
+        self._on_log(f"[faster-whisper] 소요 시간: {elapsed:.1f}초 / 세그먼트: {len(text_parts)}개")
+        if info is not None:
+            self._on_log(f"[faster-whisper] 감지 언어: {info.language} ({info.language_probability:.0%})")
+
+    def _decode_segments(self, source):
+        """순차/배치 모드로 디코딩 시작 (세그먼트 제너레이터, info)"""
+        if self._batched_pipeline is not None:
+            return self._batched_pipeline.transcribe(
+                source,
+                language=self._language,
+                initial_prompt=self._initial_prompt,
+                vad_filter=True,
+                beam_size=1,
+                batch_size=self._batch_size,
+            )
+        return self.model.transcribe(
+            source,
+            language=self._language,
+            initial_prompt=self._initial_prompt,
+            vad_filter=self._vad_filter,
+            beam_size=1,                  # 빔 서치 1로 고정 (속도 우선)
+        )
 
-            if seg.text.strip():
-                text_parts.append(seg.text.strip())
+    @staticmethod
+    def _to_segment(seg, offset: float = 0.0) -> Segment:
+        """faster-whisper 세그먼트 → Segment (offset: 잘라서 넘긴 오디오의 시작 위치)"""
+        return Segment(
+            start=round(offset + seg.start, 2),
+            end=round(offset + seg.end, 2),
+            text=seg.text.strip(),
+            avg_logprob=round(seg.avg_logprob, 4),
+        )
 
-            now = time.time()
-            # 정기 진척도 로그 (10초 간격 + 최소 1세그먼트 경과)
-            if i > 0 and (now - last_log_time) >= LOG_INTERVAL:
-                elapsed_so_far = now - transcribe_start
+    def _checkpoint_fingerprint(self, audio_path: str, audio) -> dict:
+        """체크포인트를 이어 써도 되는지 판단할 오디오/설정 정보"""
+        return {
+            "audio": audio_fingerprint(audio_path, audio),
+            "model": self._model_name,
+            "language": self._language,
+            "initial_prompt": self._initial_prompt,
+            "vad_filter": self._vad_filter,
+            # 배치 디코딩은 세그먼트 경계가 달라 순차 디코딩 결과와 섞으면 안 된다
+            "stt_mode": self._stt_mode,
+            "batch_size": self._batch_size if self._batched_pipeline is not None else None,
+        }
+
+    def _transcribe_chunked(self, source, txt_path: str, transcribe_start: float):
+        """오디오를 VAD 무음 구간 기준 청크로 나눠 여러 워커에서 동시에 변환한 뒤 순서대로 합친다"""
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from src.audio_pipeline.chunking import merge_chunk_segments, plan_chunks
+
+        sample_rate = 16000
+        if isinstance(source, str):
+            from faster_whisper.audio import decode_audio
+            source = decode_audio(source, sampling_rate=sample_rate)
+
+        speech = []
+        if self._vad_filter:
+            from faster_whisper.vad import VadOptions, get_speech_timestamps
+            speech = get_speech_timestamps(source, VadOptions(min_silence_duration_ms=500))
+
+        # 워커당 청크 2개 정도가 되도록 (1~10분)
+        target = len(source) // (self._stt_workers * 2)
+        target = max(_CHUNK_MIN_SEC * sample_rate, min(_CHUNK_MAX_SEC * sample_rate, target))
+        chunks = plan_chunks(speech, len(source), target, target * 3 // 2, _CHUNK_OVERLAP_SEC * sample_rate) \
+            if len(source) else []
+        self._on_log(f"[faster-whisper] {len(chunks)}개 청크로 나눠 {self._stt_workers}개 워커에서 변환")
+
+        def transcribe_chunk(chunk):
+            segments, info = self.model.transcribe(
+                source[chunk.start:chunk.end],
+                language=self._language,
+                initial_prompt=self._initial_prompt,
+                vad_filter=self._vad_filter,
+                beam_size=1,
+            )
+            offset = chunk.start / sample_rate
+            return [self._to_segment(seg, offset) for seg in segments if seg.text.strip()], info
+
+        results = [None] * len(chunks)
+        with ThreadPoolExecutor(max_workers=self._stt_workers) as executor:
+            futures = {executor.submit(transcribe_chunk, chunk): i for i, chunk in enumerate(chunks)}
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
                 self._on_log(
-                    f"  처리 중... {i+1} 세그먼트 ({elapsed_so_far:.0f}초 경과)"
+                    f"  처리 중... 청크 {done}/{len(chunks)} 완료 ({time.time() - transcribe_start:.0f}초 경과)"
                 )
-                last_log_time = now
 
-        text = " ".join(text_parts)
+        # overlap 구간은 앞 청크 세그먼트만 남기고, 텍스트는 남긴 세그먼트로 만든다
+        self.last_segments = merge_chunk_segments([segs for segs, _ in results], chunks)
+        text = segments_text(self.last_segments)
+        collapser = RepetitionCollapser(self.repeat_threshold)
+        self.last_raw_text = text
+        text = collapser.feed(text) + collapser.flush()
+        self.last_collapsed = collapser.collapsed
         with open(txt_path, "w", encoding="utf-8") as f:
             f.write(text)
 
+        segment_count = len(self.last_segments)
         elapsed = time.time() - transcribe_start
         self._on_log(f"[faster-whisper] 변환 완료: {os.path.basename(txt_path)}")
-        self._on_log(f"[faster-whisper] 소요 시간: {elapsed:.1f}초 / 세그먼트: {len(text_parts)}개")
-        self._on_log(f"[faster-whisper] 감지 언어: {info.language} ({info.language_probability:.0%})")
+        self._on_log(f"[faster-whisper] 소요 시간: {elapsed:.1f}초 / 세그먼트: {segment_count}개")
+        if results:
+            info = results[0][1]
+            self._on_log(f"[faster-whisper] 감지 언어: {info.language} ({info.language_probability:.0%})")
+
+
+class FasterWhisperServerTranscriber(Transcriber):
+    """로컬 STT 서버(src/audio_pipeline/stt_server.py)에 변환을 맡기는 클라이언트
+
+    서버가 모델을 메모리에 유지하므로 실행이 바뀌어도 모델 로드 시간이 다시 들지 않는다.
+    서버가 떠 있지 않으면 자동으로 시작한다. 작업마다 연결하고 끝나면 끊는다.
+    """
+
+    def __init__(self, model_name="large-v3-turbo", params=None, on_log=None):
+        from src.audio_pipeline.stt_server import DEFAULT_PORT, DEFAULT_IDLE_TIMEOUT_SEC
+        params = dict(params or {})
+        self._on_log = on_log or (lambda msg: None)
+        self._model_name = model_name
+        self._device = params.pop("device", "auto")
+        self._compute_type = params.pop("compute_type", "auto")
+        self._port = int(params.pop("server_port", DEFAULT_PORT))
+        self._idle_timeout = float(params.pop("server_idle_timeout", DEFAULT_IDLE_TIMEOUT_SEC))
+        self._params = params
+        self.model_load_sec = 0.0
+
+    def transcribe(self, audio_path: str, txt_path: str, audio=None):
+        from src.audio_pipeline import stt_server
+
+        transcribe_start = time.time()
+        conn = stt_server.connect(self._port, idle_timeout=self._idle_timeout, on_log=self._on_log)
+        with conn:
+            conn.send({
+                "command": "transcribe",
+                "audio_path": audio_path,
+                "txt_path": txt_path,  # 서버가 이 옆에 체크포인트 저널을 남긴다 (중단 후 이어서 변환)
+                "audio": audio,
+                "model_name": self._model_name,
+                "device": self._device,
+                "compute_type": self._compute_type,
+                "params": self._params,
+            })
+            while True:
+                try:
+                    kind, payload = conn.recv()
+                except EOFError:
+                    raise RuntimeError("STT 서버와의 연결이 끊어졌습니다 (stt_server.log 확인)")
+                if kind == "log":
+                    self._on_log(payload)
+                elif kind == "done":
+                    break
+                else:
+                    raise RuntimeError(f"STT 서버 오류: {payload}")
+
+        with open(txt_path, "w", encoding="utf-8") as f:
+            f.write(payload["text"])
+        self.model_load_sec = payload["model_load_sec"]
+        self.last_segments = [Segment.from_dict(seg) for seg in payload["segments"]]
+        self._on_log(f"[stt-server] 변환 완료: {os.path.basename(txt_path)} "
+                     f"(총 {time.time() - transcribe_start:.1f}초, 모델 로드 {self.model_load_sec:.1f}초)")
+
+
+# 압축 업로드: 파일 하나의 최대 크기 (OpenAI whisper-1 제한 25MB보다 약간 작게), 동시에 올릴 파일 수
+_MAX_UPLOAD_BYTES = 24 * 1024 * 1024
+_MAX_CONCURRENT_UPLOADS = 4
+
+
+def _transcribe_uploads(audio_path: str, upload_format: str, send, on_log, tag: str) -> list:
+    """오디오를 압축(크기 제한을 넘으면 분할)해서 올리고 결과를 원본 시각 기준 Segment 리스트로 잇는다.
+
+    send(path): 파일 하나를 /audio/transcriptions로 보내고 응답을 반환 (분할된 파일은 동시에 호출됨).
+    upload_format이 "wav"이거나 압축 인코더가 없으면 원본을 그대로 보낸다.
+    """
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+    from src.audio_pipeline.chunking import merge_chunk_segments
+    from src.audio_pipeline.converter import available_upload_format, encode_for_upload
+
+    fmt = available_upload_format(upload_format) if upload_format != "wav" else None
+    if fmt is None:
+        if upload_format != "wav":
+            on_log(f"[{tag}] ⚠️ 압축 인코더 없음 — 원본 파일을 업로드합니다")
+        return _response_segments(send(audio_path), _wav_duration(audio_path))[0]
+
+    sample_rate = 16000
+    with tempfile.TemporaryDirectory(prefix="stt_upload_") as tmp_dir:
+        encode_start = time.time()
+        pieces = encode_for_upload(audio_path, tmp_dir, fmt, _MAX_UPLOAD_BYTES, sample_rate)
+        if not pieces:
+            on_log(f"[{tag}] 오디오가 비어 있어 업로드하지 않습니다")
+            return []
+        original_mb = os.path.getsize(audio_path) / (1024 * 1024)
+        upload_mb = sum(os.path.getsize(path) for path, _ in pieces) / (1024 * 1024)
+        split = f", {len(pieces)}개 파일로 분할" if len(pieces) > 1 else ""
+        on_log(f"[{tag}] {fmt} 압축: {original_mb:.1f} MB → {upload_mb:.1f} MB "
+               f"({time.time() - encode_start:.1f}초{split})")
+
+        with ThreadPoolExecutor(max_workers=min(_MAX_CONCURRENT_UPLOADS, len(pieces))) as executor:
+            responses = list(executor.map(lambda piece: send(piece[0]), pieces))
+
+    chunk_segments, timed = [], []
+    for response, (_, chunk) in zip(responses, pieces):
+        offset = chunk.start / sample_rate
+        segs, has_timestamps = _response_segments(response, (chunk.end - chunk.start) / sample_rate)
+        for seg in segs:
+            seg.start = round(seg.start + offset, 2)
+            seg.end = round(seg.end + offset, 2)
+        chunk_segments.append(segs)
+        timed.append(has_timestamps)
+    # 무음을 찾지 못해 겹치게 자른 경계는 겹친 구간을 앞 파일 결과로 쓴다
+    # (텍스트만 온 응답은 시각 대신 겹친 단어로 중복을 지움)
+    return merge_chunk_segments(chunk_segments, [chunk for _, chunk in pieces], timed)
+
+
+def _response_segments(response, duration: float) -> tuple:
+    """OpenAI /audio/transcriptions 응답 → (Segment 리스트, 세그먼트별 타임스탬프가 있었는지)
+
+    verbose_json이면 응답의 segments를 쓰고, 텍스트만 온 경우(호환 서버)는 전체(duration초)를 세그먼트 하나로 둔다.
+    """
+    segments = response.get("segments") if isinstance(response, dict) else getattr(response, "segments", None)
+    if segments:
+        def field(seg, name):
+            return seg.get(name) if isinstance(seg, dict) else getattr(seg, name, None)
+
+        return [
+            Segment(
+                start=round(float(field(seg, "start")), 2),
+                end=round(float(field(seg, "end")), 2),
+                text=field(seg, "text").strip(),
+                avg_logprob=field(seg, "avg_logprob"),
+            )
+            for seg in segments if (field(seg, "text") or "").strip()
+        ], True
+
+    if isinstance(response, str):
+        text = response
+    elif isinstance(response, dict):
+        text = response.get("text", "")
+    else:
+        text = getattr(response, "text", str(response))
+    return ([Segment(start=0.0, end=round(duration, 2), text=text.strip())] if text.strip() else []), False
+
+
+def _wav_duration(path: str) -> float:
+    """WAV 길이 (초). WAV가 아니거나 읽지 못하면 0."""
+    import wave
+    try:
+        with wave.open(path, "rb") as w:
+            return round(w.getnframes() / w.getframerate(), 2)
+    except (wave.Error, OSError, EOFError):
+        return 0.0
 
 
 class OpenAIWhisperTranscriber(Transcriber):
-    """OpenAI Whisper API 기반 클라우드 STT (로컬 모델 다운로드 불필요)"""
+    """OpenAI Whisper API 기반 클라우드 STT (로컬 모델 다운로드 불필요)
+
+    WAV 대신 압축 오디오(upload_format: opus/mp3)를 올리고, 25MB 제한을 넘는 긴 강의는 나눠서 동시에 올린다.
+    """
 
-    def __init__(self, api_key: str = None, on_log=None):
+    def __init__(self, api_key: str = None, upload_format: str = "opus", on_log=None):
         from openai import OpenAI
         self._on_log = on_log or (lambda msg: None)
         if not api_key:
             raise ValueError("OpenAI Whisper API 키가 필요합니다.")
         self.client = OpenAI(api_key=api_key)
+        self._upload_format = upload_format
         self._on_log("[openai-whisper] 클라우드 STT 엔진 초기화 완료")
 
     def transcribe(self, audio_path: str, txt_path: str):
         self._on_log(f"[openai-whisper] 클라우드 STT 시작: {audio_path}")
         transcribe_start = time.time()
 
-        with open(audio_path, "rb") as audio_file:
-            response = self.client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                language="ko",
-                response_format="text",
-            )
-
-        text = response if isinstance(response, str) else response.text
+        def send(path):
+            with open(path, "rb") as audio_file:
+                return self.client.audio.transcriptions.create(
+                    model="whisper-1",
+                    file=audio_file,
+                    language="ko",
+                    response_format="verbose_json",  # 세그먼트 타임스탬프 포함
+                )
 
-        with open(txt_path, "w", encoding="utf-8") as f:
-            f.write(text)
+        self._save_segments(
+            txt_path, _transcribe_uploads(audio_path, self._upload_format, send, self._on_log, "openai-whisper"))
 
         elapsed = time.time() - transcribe_start
         self._on_log(f"[openai-whisper] 변환 완료: {txt_path}")
@@ -348,9 +829,11 @@ class OpenAICompatibleSTTTranscriber(Transcriber):
     """
 
     def __init__(self, base_url: str = None, api_key: str = None,
-                 model_name: str = None, on_log=None):
+                 model_name: str = None, upload_format: str = "opus", on_log=None):
         from openai import OpenAI
         self._on_log = on_log or (lambda msg: None)
+        self._upload_format = upload_format
+        self._verbose_json = True  # 서버가 verbose_json을 거절하면 이후 요청은 텍스트만 받음
 
         if not base_url:
             raise ValueError("STT 엔드포인트 URL이 필요합니다.")
@@ -386,7 +869,7 @@ class OpenAICompatibleSTTTranscriber(Transcriber):
 
         try:
             # STT 서비스 상태 확인
-            status_resp = requests.get(
+            status_resp = get_session().get(
                 f"{orchestrator_root}/stt/status",
                 timeout=5,
             )
@@ -405,7 +888,7 @@ class OpenAICompatibleSTTTranscriber(Transcriber):
         # STT 서비스 시작 요청
         self._on_log("[openai-compatible-stt] STT 서비스 시작 요청 중...")
         try:
-            start_resp = requests.post(
+            start_resp = get_session().post(
                 f"{orchestrator_root}/start/stt",
                 timeout=30,
             )
@@ -420,6 +903,27 @@ class OpenAICompatibleSTTTranscriber(Transcriber):
         except requests.Timeout:
             self._on_log("[openai-compatible-stt] ⚠️ 서비스 시작 타임아웃 (30초)")
 
+    def _request_transcription(self, audio_path: str, **kwargs):
+        with open(audio_path, "rb") as audio_file:
+            return self.client.audio.transcriptions.create(
+                model=self.model_name,
+                file=audio_file,
+                language="ko",
+                **kwargs,
+            )
+
+    def _send(self, path: str):
+        if self._verbose_json:
+            try:
+                return self._request_transcription(path, response_format="verbose_json")
+            except Exception as e:
+                if getattr(e, "status_code", None) != 400:
+                    raise
+                # verbose_json(세그먼트 타임스탬프)을 지원하지 않는 서버 — 텍스트만 받는다
+                self._verbose_json = False
+                self._on_log("[openai-compatible-stt] verbose_json 미지원 — 텍스트만 받습니다")
+        return self._request_transcription(path)
+
     def transcribe(self, audio_path: str, txt_path: str):
         self._on_log(f"[openai-compatible-stt] STT 시작: {os.path.basename(audio_path)}")
         transcribe_start = time.time()
@@ -428,12 +932,8 @@ class OpenAICompatibleSTTTranscriber(Transcriber):
         self._ensure_service_running()
 
         try:
-            with open(audio_path, "rb") as audio_file:
-                response = self.client.audio.transcriptions.create(
-                    model=self.model_name,
-                    file=audio_file,
-                    language="ko",
-                )
+            segments = _transcribe_uploads(
+                audio_path, self._upload_format, self._send, self._on_log, "openai-compatible-stt")
         except Exception as e:
             # 연결 실패 시 더 상세한 에러 메시지
             err_msg = str(e)
@@ -444,11 +944,7 @@ class OpenAICompatibleSTTTranscriber(Transcriber):
                 )
             raise
 
-        # 응답 처리: text 문자열 또는 객체의 .text 속성 모두 지원
-        text = response if isinstance(response, str) else getattr(response, "text", str(response))
-
-        with open(txt_path, "w", encoding="utf-8") as f:
-            f.write(text)
+        self._save_segments(txt_path, segments)
 
         elapsed = time.time() - transcribe_start
         self._on_log(f"[openai-compatible-stt] 변환 완료: {os.path.basename(txt_path)}")
@@ -456,85 +952,126 @@ class OpenAICompatibleSTTTranscriber(Transcriber):
 
 
 class ReturnZeroTranscriber(Transcriber):
+    """ReturnZero(VITO) 파일 STT — 작업을 올리고 완료될 때까지 상태를 조회한다
+
+    인증 토큰은 클래스 단위로 캐시해 인스턴스를 여러 개 만들어도(동시 변환) 다시 발급받지 않는다.
+    만료 시각이 지났거나 요청이 401로 거절되면 새로 발급받는다.
+    """
+    # 동시에 올려 둘 변환 작업 수 (AudioToTextPipeline.transcribe_many)
+    max_concurrent_jobs = 8
+
+    _API_URL = "https://openapi.vito.ai/v1"
+    # client_id → (토큰, 만료 시각)
+    _token_cache = {}
+    _token_lock = threading.Lock()
+    # 만료 직전 토큰은 쓰지 않음 (요청 도중 만료 방지)
+    _TOKEN_EXPIRY_MARGIN_SEC = 60
+
+    # 상태 조회 간격: 1초에서 시작해 2배씩, 최대 15초 (짧은 파일은 빨리, 긴 파일은 덜 자주)
+    _POLL_INITIAL_SEC = 1.0
+    _POLL_MAX_SEC = 15.0
+    # 완료 대기 한도: 최소 3분, 오디오 1초당 0.5초씩 늘림 (90분 강의 → 45분)
+    _POLL_TIMEOUT_MIN_SEC = 180
+    _POLL_TIMEOUT_PER_AUDIO_SEC = 0.5
+
     def __init__(self):
         user_setting = UserSetting()
         self.client_id = user_setting.RETURNZERO_CLIENT_ID
         self.client_secret = user_setting.RETURNZERO_CLIENT_SECRET
-        self.token = self._authenticate()
-
-    def _authenticate(self) -> str:
-        # 인증 토큰 발급
-        resp = requests.post(
-            "https://openapi.vito.ai/v1/authenticate",
+        self._get_token()
+
+    def _get_token(self, stale: str = None) -> str:
+        """캐시된 토큰 (stale: 401로 거절된 토큰 — 캐시가 아직 그 토큰이면 새로 발급)"""
+        with self._token_lock:
+            token, expire_at = self._token_cache.get(self.client_id, (None, 0))
+            if token is None or token == stale or time.time() >= expire_at - self._TOKEN_EXPIRY_MARGIN_SEC:
+                token, expire_at = self._authenticate()
+                self._token_cache[self.client_id] = (token, expire_at)
+            return token
+
+    def _authenticate(self) -> tuple:
+        # 인증 토큰 발급 (토큰, 만료 시각)
+        resp = get_session().post(
+            f"{self._API_URL}/authenticate",
             data={"client_id": self.client_id, "client_secret": self.client_secret},
         )
         resp.raise_for_status()
-        token = resp.json()["access_token"]
+        data = resp.json()
         print("[ReturnZero] 인증 토큰 발급 성공")
-        return token
+        # 만료 시각을 주지 않으면 6시간 (API 기본 유효 기간)
+        return data["access_token"], float(data.get("expire_at") or time.time() + 6 * 3600)
+
+    def _authorized(self, send):
+        """send(token)으로 요청 — 토큰이 만료돼 401이면 새로 발급받아 한 번 더 보낸다"""
+        token = self._get_token()
+        resp = send(token)
+        if resp.status_code == 401:
+            resp = send(self._get_token(stale=token))
+        return resp
 
     def _submit_job(self, wav_path: str) -> str:
         # 변환 요청
-        with open(wav_path, "rb") as f:
-            files = {
-                "file": (os.path.basename(wav_path), f),
-                "config": (
-                    None,
-                    '{"model_name":"whisper","language":"ko"}',
-                    "application/json",
-                ),
-            }
-            headers = {
-                "Authorization": f"Bearer {self.token}",
-                "accept": "application/json",
-            }
-            response = requests.post(
-                "https://openapi.vito.ai/v1/transcribe",
-                headers=headers,
-                files=files,
-            )
+        def send(token):
+            with open(wav_path, "rb") as f:
+                files = {
+                    "file": (os.path.basename(wav_path), f),
+                    "config": (
+                        None,
+                        '{"model_name":"whisper","language":"ko"}',
+                        "application/json",
+                    ),
+                }
+                headers = {
+                    "Authorization": f"Bearer {token}",
+                    "accept": "application/json",
+                }
+                return get_session().post(f"{self._API_URL}/transcribe", headers=headers, files=files)
+
+        response = self._authorized(send)
         response.raise_for_status()
         return response.json()["id"]  # 이게 transcribe_id
 
-    def _poll_until_complete(self, transcribe_id: str, timeout=180, interval=5) -> dict:
-        # 변환 완료 대기
-        url = f"https://openapi.vito.ai/v1/transcribe/{transcribe_id}"
-        headers = {"Authorization": f"Bearer {self.token}"}
+    def _poll_until_complete(self, transcribe_id: str, timeout=180) -> dict:
+        # 변환 완료 대기 (조회 간격을 지수적으로 늘림, 429는 다음 조회까지 대기)
+        url = f"{self._API_URL}/transcribe/{transcribe_id}"
         start = time.time()
+        interval = self._POLL_INITIAL_SEC
 
         while time.time() - start < timeout:
-            resp = requests.get(url, headers=headers)
-            resp.raise_for_status()
-            data = resp.json()
-            status = data.get("status")
-
-            print(f"[Polling] 현재 상태: {status}")
-            if status == "completed":
-                return data
-            elif status == "failed":
-                raise RuntimeError(f"[ERROR] 변환 실패: {data.get('error')}")
-            time.sleep(interval)
-
-        raise TimeoutError("음성 변환 시간 초과")
-
-    def _parse_text(self, data: dict) -> str:
-        # 분리된 결과값을 합치기
+            resp = self._authorized(lambda token: get_session().get(url, headers={"Authorization": f"Bearer {token}"}))
+            if resp.status_code != 429:
+                resp.raise_for_status()
+                data = resp.json()
+                status = data.get("status")
+
+                print(f"[Polling] {transcribe_id} 현재 상태: {status}")
+                if status == "completed":
+                    return data
+                elif status == "failed":
+                    raise RuntimeError(f"[ERROR] 변환 실패: {data.get('error')}")
+            time.sleep(min(interval, max(0.0, timeout - (time.time() - start))))
+            interval = min(interval * 2, self._POLL_MAX_SEC)
+
+        raise TimeoutError(f"음성 변환 시간 초과 ({timeout:.0f}초)")
+
+    def _parse_segments(self, data: dict) -> list:
+        # 발화(utterance) 단위 결과 → Segment (start_at/duration은 ms)
         utterances = data.get("results", {}).get("utterances", [])
-        messages = [utterance.get("msg", "") for utterance in utterances]
-        return " ".join(messages)
+        return [
+            Segment(
+                start=round(u.get("start_at", 0) / 1000, 2),
+                end=round((u.get("start_at", 0) + u.get("duration", 0)) / 1000, 2),
+                text=u.get("msg", "").strip(),
+            )
+            for u in utterances if u.get("msg", "").strip()
+        ]
 
     def transcribe(self, wav_path: str, txt_path: str):
         try:
+            timeout = max(self._POLL_TIMEOUT_MIN_SEC, _wav_duration(wav_path) * self._POLL_TIMEOUT_PER_AUDIO_SEC)
             transcribe_id = self._submit_job(wav_path)
-            data = self._poll_until_complete(transcribe_id)
-            text = self._parse_text(data)
-
-            with open(txt_path, "w", encoding="utf-8") as f:
-                f.write(text)
-
-            txt_raw_path = txt_path.replace(".txt", "_raw_rtzr.txt")
-            with open(txt_raw_path, "w", encoding="utf-8") as f:
-                f.write(json.dumps(data, indent=4))
+            data = self._poll_until_complete(transcribe_id, timeout=timeout)
+            self._save_segments(txt_path, self._parse_segments(data))
 
             print(f"[ReturnZero] 텍스트 변환 완료: {txt_path}")
 
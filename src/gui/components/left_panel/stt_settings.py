@@ -12,6 +12,12 @@ from src.gui.core.file_manager import (
     get_stt_api_key, set_stt_api_key,
 )
 
+_FW_STT_MODE_OPTIONS = [
+    ("sequential", "순차 디코딩 (기본)"),
+    ("batched", "배치 디코딩 (긴 강의에서 빠름)"),
+    ("chunked", "청크 병렬 디코딩 (멀티코어 CPU)"),
+]
+
 _STT_ENGINE_OPTIONS = [
     ("faster-whisper", "faster-whisper (로컬, GPU 지원)"),
     ("openai-compatible", "OpenAI 호환 엔드포인트 (로컬 서버)"),
@@ -106,8 +112,43 @@ class STTSettingsSection:
             dense=True,
             tooltip="추론에 사용할 장치 선택",
         )
+        self._stt_mode_dd = ft.Dropdown(
+            options=[ft.dropdown.Option(key=k, text=t) for k, t in _FW_STT_MODE_OPTIONS],
+            value=current_params.get("stt_mode", "sequential"),
+            label="추론 방식",
+            border_radius=Radius.SM,
+            border_color=Colors.BORDER,
+            focused_border_color=Colors.PRIMARY,
+            text_size=Typography.BODY,
+            label_style=ft.TextStyle(size=Typography.CAPTION, color=Colors.TEXT_SECONDARY),
+            dense=True,
+            tooltip="배치 디코딩은 여러 음성 구간을 한 번에 처리하고, 청크 병렬 디코딩은 긴 강의를 나눠 여러 코어에서 동시에 처리합니다",
+        )
+        self._batch_size_field = ft.TextField(
+            value=str(current_params.get("batch_size", 0)),
+            label="배치 크기 (0 = 자동)",
+            hint_text="배치 디코딩 시 한 번에 처리할 구간 수",
+            border_radius=Radius.SM, border_color=Colors.BORDER,
+            focused_border_color=Colors.PRIMARY, text_size=Typography.SMALL,
+            label_style=ft.TextStyle(size=Typography.CAPTION, color=Colors.TEXT_SECONDARY),
+            dense=True,
+            tooltip="0이면 GPU 16, CPU는 코어 수에 맞춰 자동 결정합니다 (클수록 메모리 사용 증가)",
+        )
+        self._stt_workers_field = ft.TextField(
+            value=str(current_params.get("stt_workers", 0)),
+            label="병렬 워커 수 (0 = 자동)",
+            hint_text="청크 병렬 디코딩 시 동시에 변환할 청크 수",
+            border_radius=Radius.SM, border_color=Colors.BORDER,
+            focused_border_color=Colors.PRIMARY, text_size=Typography.SMALL,
+            label_style=ft.TextStyle(size=Typography.CAPTION, color=Colors.TEXT_SECONDARY),
+            dense=True,
+            tooltip="0이면 CPU 코어 4개당 워커 1개(최대 4개)로 자동 결정합니다",
+        )
         self._expert_content = ft.Column(
-            controls=[self._initial_prompt_field, self._repeat_threshold_field, self._device_dd],
+            controls=[
+                self._initial_prompt_field, self._repeat_threshold_field, self._device_dd,
+                self._stt_mode_dd, self._batch_size_field, self._stt_workers_field,
+            ],
             spacing=Spacing.SM,
             visible=False,
         )
@@ -428,11 +469,16 @@ class STTSettingsSection:
         elif engine == "faster-whisper":
             set_stt_model(self._fw_selected_mode[0])
             try:
+                # 화면에 없는 파라미터(다른 엔진용 키 등)는 유지
                 params = {
+                    **get_stt_params(),
                     "device": self._device_dd.value or "auto",
                     "vad_filter": True,
                     "initial_prompt": (self._initial_prompt_field.value or "").strip() or None,
                     "repeat_threshold": int(float(self._repeat_threshold_field.value or 4)),
+                    "stt_mode": self._stt_mode_dd.value or "sequential",
+                    "batch_size": max(0, int(float(self._batch_size_field.value or 0))),
+                    "stt_workers": max(0, int(float(self._stt_workers_field.value or 0))),
                 }
                 if params["initial_prompt"] is None:
                     del params["initial_prompt"]
@@ -333,10 +333,21 @@ def set_stt_model(model: str) -> None:
 
 
 def get_stt_params() -> dict:
-    """STT 고급 파라미터 반환. 기본값: 한국어 최적화 설정."""
+    """STT 고급 파라미터 반환. 기본값: 한국어 최적화 설정.
+
+    - stt_mode: faster-whisper 추론 방식 ("sequential": 구간 순차 디코딩, "batched": 여러 VAD 구간 배치 디코딩,
+      "chunked": 긴 오디오를 청크로 나눠 여러 워커에서 동시에 디코딩)
+    - batch_size: batched 모드의 배치 크기 (0이면 장치/코어 수에 맞춰 자동)
+    - stt_workers: chunked 모드의 동시 디코딩 워커 수 (0이면 코어 수에 맞춰 자동)
+    - upload_format: 클라우드 STT(OpenAI Whisper/호환 서버) 업로드 형식 ("opus", "mp3", "wav": 압축 안 함)
+    """
     defaults = {
         "initial_prompt": "한국어 강의입니다.",
         "repeat_threshold": 4,
+        "stt_mode": "sequential",
+        "batch_size": 0,
+        "stt_workers": 0,
+        "upload_format": "opus",
     }
     stored = load_settings().get("stt_params", {})
     return {**defaults, **stored}
@@ -427,6 +438,152 @@ def set_debug_mode(enabled: bool) -> None:
     save_settings(settings)
 
 
+# ── 파이프라인 실행 모드 ───────────────────────────────────
+
+def get_pipeline_mode() -> str:
+    """파이프라인 실행 모드 반환. 기본값: streaming.
+
+    - streaming: 강의별로 다운로드가 끝나는 즉시 변환 → STT → 요약으로 넘김 (단계 중첩)
+    - sequential: 모든 강의의 한 단계가 끝나야 다음 단계 시작 (단계별 일괄 처리)
+    """
+    return load_settings().get("pipeline_mode", "streaming")
+
+
+def get_extraction_workers() -> int:
+    """영상 URL 추출에 동시에 사용할 브라우저 탭 수 반환. 기본값: 3."""
+    try:
+        return max(1, int(load_settings().get("extraction_workers", 3)))
+    except (TypeError, ValueError):
+        return 3
+
+
+def get_download_segments() -> int:
+    """영상 하나를 동시에 받을 바이트 구간 수 반환. 기본값: 4 (1이면 단일 스트림)."""
+    try:
+        return max(1, int(load_settings().get("download_segments", 4)))
+    except (TypeError, ValueError):
+        return 4
+
+
+def get_direct_audio_extraction() -> bool:
+    """영상을 보관하지 않을 때 MP4 대신 오디오만 바로 받을지 여부. 기본값: False.
+
+    켜면 다운로드 단계에서 16kHz mono WAV가 바로 만들어지고 WAV 변환 단계는 건너뛴다.
+    영상 저장 경로가 지정된 경우에는 무시된다.
+    """
+    return bool(load_settings().get("direct_audio_extraction", False))
+
+
+def get_in_memory_audio() -> bool:
+    """스트리밍 모드에서 WAV 파일 대신 디코딩된 오디오를 메모리로 STT에 넘길지 여부. 기본값: True.
+
+    faster-whisper 엔진에서만 적용된다 (클라우드 STT는 업로드할 파일이 필요).
+    STT 결과 캐시는 메모리 오디오와 WAV 파일을 따로 저장하므로, 이 설정을 바꾸면 이전 결과를 재사용하지 못한다.
+    """
+    return bool(load_settings().get("in_memory_audio", True))
+
+
+def get_convert_workers() -> int:
+    """WAV 변환에 사용할 프로세스 수 반환. 기본값: 0 (자동: CPU 코어 수 - STT용 예약 코어)."""
+    try:
+        return max(0, int(load_settings().get("convert_workers", 0)))
+    except (TypeError, ValueError):
+        return 0
+
+
+# ── STT 서버 (모델 상주 프로세스) ─────────────────────────
+
+def get_stt_server_enabled() -> bool:
+    """faster-whisper 변환을 모델이 상주하는 로컬 STT 서버에 맡길지 여부. 기본값: False."""
+    return bool(load_settings().get("stt_server_enabled", False))
+
+
+def get_stt_server_port() -> int:
+    """STT 서버 포트 반환 (127.0.0.1에서만 대기). 기본값: 50761."""
+    try:
+        return int(load_settings().get("stt_server_port", 50761))
+    except (TypeError, ValueError):
+        return 50761
+
+
+def get_stt_server_idle_minutes() -> int:
+    """작업이 없을 때 STT 서버가 스스로 종료하기까지의 시간(분) 반환. 기본값: 30."""
+    try:
+        return max(1, int(load_settings().get("stt_server_idle_minutes", 30)))
+    except (TypeError, ValueError):
+        return 30
+
+
+# ── 요약 API 속도 제한 ────────────────────────────────────
+
+def get_summary_rate_limits(engine: str) -> dict:
+    """엔진별 요약 속도 제한 덮어쓰기 값 반환 ({"concurrency", "rpm", "tpm"} 중 일부).
+
+    비어 있으면 src/summarize_pipeline/rate_limit.py의 기본값(무료/최저 등급 기준)을 쓴다.
+    """
+    limits = load_settings().get("summary_rate_limits", {}).get(engine, {})
+    return limits if isinstance(limits, dict) else {}
+
+
+def get_summary_streaming() -> bool:
+    """요약을 생성되는 대로 파일/진행 화면에 표시할지 여부 (스트리밍 API 사용). 기본값: True."""
+    return bool(load_settings().get("summary_streaming", True))
+
+
+def get_summary_map_reduce() -> bool:
+    """모델 컨텍스트를 넘는 긴 텍스트를 구간별로 나눠 정리한 뒤 최종 요약할지 여부. 기본값: True."""
+    return bool(load_settings().get("summary_map_reduce", True))
+
+
+def get_summary_context_tokens(engine: str) -> int:
+    """엔진별 컨텍스트 길이(토큰) 덮어쓰기 값 반환. 0이면 엔진/모델 기본값 사용.
+
+    Ollama에서 num_ctx를 늘려 둔 경우 여기 맞춰 주면 구간을 더 크게 나눈다.
+    """
+    try:
+        return max(0, int(load_settings().get("summary_context_tokens", {}).get(engine, 0)))
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+# ── 결과 캐시 ─────────────────────────────────────────────
+
+def get_transcript_cache_enabled() -> bool:
+    """같은 오디오를 같은 STT 설정으로 다시 변환할 때 이전 결과를 재사용할지 여부. 기본값: True."""
+    return bool(load_settings().get("transcript_cache_enabled", True))
+
+
+def get_summary_cache_enabled() -> bool:
+    """같은 텍스트를 같은 프롬프트/엔진/모델로 다시 요약할 때 이전 요약을 재사용할지 여부. 기본값: True."""
+    return bool(load_settings().get("summary_cache_enabled", True))
+
+
+def get_result_cache_max_mb() -> int:
+    """결과 캐시 종류별 최대 크기(MB) 반환. 넘으면 오래 쓰지 않은 항목부터 삭제. 기본값: 200."""
+    try:
+        return max(1, int(load_settings().get("result_cache_max_mb", 200)))
+    except (TypeError, ValueError):
+        return 200
+
+
+# ── HTTP 연결 ─────────────────────────────────────────────
+
+def get_http_pool_size() -> int:
+    """공용 HTTP 세션의 호스트당 keep-alive 연결 수 반환. 기본값: 10."""
+    try:
+        return max(1, int(load_settings().get("http_pool_size", 10)))
+    except (TypeError, ValueError):
+        return 10
+
+
+def get_http_max_retries() -> int:
+    """공용 HTTP 세션의 연결 실패 재시도 횟수 반환. 기본값: 3."""
+    try:
+        return max(0, int(load_settings().get("http_max_retries", 3)))
+    except (TypeError, ValueError):
+        return 3
+
+
 # ── 과목 캐시 ─────────────────────────────────────────────
 
 def save_course_cache(courses_data: list) -> None:
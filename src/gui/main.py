@@ -67,4 +67,11 @@ def main():
 
 
 if __name__ == "__main__":
+    # PyInstaller 번들에서 WAV 변환 프로세스 풀(spawn)이 GUI를 다시 띄우지 않도록
+    import multiprocessing
+    multiprocessing.freeze_support()
+    # PyInstaller 번들에서는 같은 실행 파일이 상주 STT 서버로도 동작 (stt_server.start_server_process)
+    if len(sys.argv) > 1 and sys.argv[1] == "--stt-server":
+        from src.audio_pipeline.stt_server import main as stt_server_main
+        sys.exit(stt_server_main(sys.argv[2:]))
     main()
@@ -243,6 +243,10 @@ class MainView:
             if self.modal:
                 self.modal.update_progress(current, total)
 
+        def on_summary_chunk(name, chunk):
+            if self.modal:
+                self.modal.append_summary_chunk(name, chunk)
+
         self.worker = ProcessingWorker(
             inputs, self.modules,
             save_video_dir=save_video_dir,
@@ -253,6 +257,7 @@ class MainView:
             on_finished=on_finished,
             on_step_changed=invoke_on_ui(self.page, on_step),
             on_progress=invoke_on_ui(self.page, on_progress),
+            on_summary_chunk=invoke_on_ui(self.page, on_summary_chunk),
             start_stage=start_stage,
             input_files=input_files,
         )
@@ -2,6 +2,7 @@
 처리 진행 모달 (Flet AlertDialog)
 - 세로 타임라인 스텝퍼
 - 진행률 카드
+- 요약 미리보기 (스트리밍 요약)
 - 다크 콘솔 로그 (항상 표시)
 - 완료 화면 (State B)
 """
@@ -20,6 +21,8 @@ from src.pipeline_stage import PipelineStage, STAGE_LABELS
 # 처리 단계 정의 (PipelineStage 기반)
 _STEPS = [(stage.value, STAGE_LABELS[stage]) for stage in PipelineStage]
 
+_SUMMARY_PREVIEW_CHARS = 2000  # 요약 미리보기에 표시할 최대 글자 수 (뒤쪽 기준)
+
 
 class ProgressModal:
     """처리 진행 상황을 표시하는 모달 (타임라인 + 진행률 + 로그)"""
@@ -133,6 +136,27 @@ class ProgressModal:
             height=128,
         )
 
+        # ── 요약 미리보기 (스트리밍 요약이 생성되는 대로 표시) ──
+        self._summary_texts: dict[str, str] = {}
+        self._summary_title = ft.Text(
+            "", size=Typography.CAPTION, weight=Typography.SEMI_BOLD, color=Colors.TEXT_SECONDARY,
+        )
+        self._summary_preview = ft.Text("", size=Typography.SMALL, color=Colors.TEXT, selectable=True)
+        self._summary_container = ft.Container(
+            content=ft.Column(
+                controls=[self._summary_title, self._summary_preview],
+                spacing=Spacing.XS,
+                scroll=ft.ScrollMode.AUTO,
+                auto_scroll=True,
+            ),
+            bgcolor="#F8FAFC",  # slate-50
+            border_radius=Radius.MD,
+            border=ft.border.all(1, "#F1F5F9"),  # slate-100
+            padding=ft.padding.all(Spacing.MD),
+            height=140,
+            visible=False,
+        )
+
         # ── 중지 버튼 (HTML: border-2 border-danger text-danger)
         self._stop_btn = ft.OutlinedButton(
             content=ft.Text("중지"),
@@ -152,6 +176,7 @@ class ProgressModal:
             controls=[
                 self._timeline_column,
                 progress_card,
+                self._summary_container,
                 self._log_container,
             ],
             spacing=Spacing.MD,
@@ -516,6 +541,16 @@ class ProgressModal:
                 self._last_progress_update = now
                 self._safe_update()
 
+    def append_summary_chunk(self, name: str, chunk: str | None):
+        """스트리밍 요약 조각 추가 (가장 최근에 조각이 온 강의의 요약을 표시).
+        chunk가 None이면 재시도로 처음부터 다시 받으므로 그 강의의 미리보기를 비운다."""
+        text = "" if chunk is None else self._summary_texts.get(name, "") + chunk
+        self._summary_texts[name] = text
+        self._summary_title.value = f"요약 미리보기 · {name}"
+        self._summary_preview.value = text[-_SUMMARY_PREVIEW_CHARS:]
+        self._summary_container.visible = True
+        self._safe_update()
+
     def append_log(self, message: str):
         ts = datetime.now().strftime("%H:%M:%S")
         formatted = f"[{ts}] {message}"
@@ -2,26 +2,42 @@
 백그라운드에서 LMS 처리 작업을 수행하는 워커 스레드
 """
 
+import asyncio
 import logging
+import multiprocessing
 import os
+import queue
 import sys
 import threading
 import time as _time
 import traceback
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, List, Callable, Optional
+from typing import Dict, List, Callable, Optional, Tuple
 
 from src.gui.config.constants import Messages
 from src.video_pipeline.login import LoginFailedError
 from src.gui.core.file_manager import (
     create_config_files, extract_urls_from_input, ensure_downloads_directory,
     get_summary_prompt, get_chrome_path, get_debug_mode, get_stt_engine,
-    get_stt_model, get_stt_params,
+    get_stt_model, get_stt_params, get_pipeline_mode, get_extraction_workers,
+    get_download_segments, get_direct_audio_extraction, get_in_memory_audio,
+    get_convert_workers, get_stt_server_enabled, get_stt_server_port, get_stt_server_idle_minutes,
+    get_transcript_cache_enabled, get_summary_cache_enabled, get_summary_rate_limits,
+    get_summary_streaming, get_summary_map_reduce, get_summary_context_tokens,
     add_history_entry, get_app_data_dir,
 )
 from src.gui.core.module_loader import check_required_modules
 from src.pipeline_stage import PipelineStage, STAGE_LABELS
 
+_STAGE_QUEUE_SIZE = 2       # 스트리밍 모드 단계 간 대기열 크기 (backpressure)
+# 메모리 오디오는 강의 하나가 수백 MB이므로 STT 앞 대기열에 하나만 둔다
+# (디코딩 중 1 + 대기 1 + STT 중 1 = 최대 3개)
+_IN_MEMORY_QUEUE_SIZE = 1
+_STREAM_END = object()      # 스트리밍 모드에서 앞 단계 종료를 알리는 표시
+_STT_CPU_RESERVE = 2        # WAV 변환 프로세스 수 자동 결정 시 로컬 STT용으로 남겨 둘 코어 수
+_SUMMARY_PREVIEW_INTERVAL = 0.2  # 스트리밍 요약을 진행 화면으로 넘기는 최소 간격 (초)
+
 
 def _setup_file_logger() -> logging.Logger:
     """디버그 파일 로거 설정 (PyInstaller 환경에서 에러 추적용)"""
@@ -56,6 +72,7 @@ class ProcessingWorker:
         on_finished: Optional[Callable[[bool, str], None]] = None,
         on_step_changed: Optional[Callable[[int, str], None]] = None,
         on_progress: Optional[Callable[[int, int], None]] = None,
+        on_summary_chunk: Optional[Callable[[str, str], None]] = None,
         start_stage: PipelineStage = PipelineStage.DOWNLOAD,
         input_files: Optional[List[str]] = None,
     ):
@@ -74,14 +91,23 @@ class ProcessingWorker:
         self.start_stage = start_stage
         self.input_files = input_files or []
         self._cancel_event = threading.Event()
+        self.pipeline_mode = get_pipeline_mode()
+        # 영상을 보관하지 않으면 다운로드 단계에서 오디오(WAV)만 바로 받을 수 있음
+        self.audio_only = not save_video_dir and get_direct_audio_extraction()
+        # faster-whisper는 WAV 파일 대신 메모리의 PCM 배열을 바로 받을 수 있음 (스트리밍 모드 전용)
+        self.in_memory_audio = self.stt_engine == "faster-whisper" and get_in_memory_audio()
         self._thread: Optional[threading.Thread] = None
         self._fail_count = 0
+        self._fail_lock = threading.Lock()
+        self._stage_lock = threading.Lock()
+        self._active_stage = 0
 
         # 콜백
         self._on_log = on_log or (lambda msg: None)
         self._on_finished = on_finished or (lambda success, msg: None)
         self._on_step_changed = on_step_changed or (lambda step, name: None)
         self._on_progress = on_progress or (lambda cur, total: None)
+        self._on_summary_chunk = on_summary_chunk or (lambda name, chunk: None)
 
     def start(self):
         """워커 스레드 시작"""
@@ -212,25 +238,79 @@ class ProcessingWorker:
         pipeline_start = _time.time()
         step_timings = {}
 
+        if self.start_stage <= PipelineStage.DOWNLOAD and self.pipeline_mode == "streaming":
+            lectures, video_paths, text_paths, video_sizes = self._run_streaming_pipeline(step_timings)
+        else:
+            lectures, video_paths, text_paths, video_sizes = self._run_sequential_pipeline(step_timings)
+
+        # 히스토리 저장 (다운로드부터 시작한 경우에만)
+        duration_sec = _time.time() - pipeline_start
+        step_timings["total_sec"] = round(duration_sec, 1)
+
+        timing_parts = []
+        if "download_sec" in step_timings:
+            timing_parts.append(f"다운로드 {step_timings['download_sec']}초")
+        if "convert_sec" in step_timings:
+            timing_parts.append(f"변환 {step_timings['convert_sec']}초")
+        if "stt_sec" in step_timings:
+            timing_parts.append(f"STT {step_timings['stt_sec']}초")
+        if "summary_sec" in step_timings:
+            timing_parts.append(f"요약 {step_timings['summary_sec']}초")
+        timing_parts.append(f"전체 {step_timings['total_sec']}초")
+        self._emit_log(f"⏱ 성능: {' | '.join(timing_parts)}")
+
+        if lectures and video_paths:
+            self._save_processing_history(lectures, video_sizes, duration_sec, step_timings)
+
+        # audio_only 모드의 WAV는 STT 성공 시 이미 삭제되고, 실패한 것은 재시도용으로 남긴다
+        if video_paths and not self.save_video_dir and not self.audio_only:
+            self._delete_video_files(video_paths)
+
+        self._display_results(video_paths, text_paths)
+
+    def _get_download_inputs(self):
+        urls = extract_urls_from_input(self.user_inputs.get('urls', ''))
+        if not urls:
+            raise ValueError("처리할 URL이 없습니다.")
+        return urls, self.modules['UserSetting'](self.user_inputs)
+
+    @staticmethod
+    def _record_video_size(video_sizes: Dict[str, float], video_path: str):
+        try:
+            video_sizes[video_path] = os.path.getsize(video_path) / (1024 * 1024)
+        except OSError:
+            video_sizes[video_path] = 0.0
+
+    @staticmethod
+    def _lecture_records(urls: List[str], video_of: Dict[str, str],
+                         summary_of: Dict[str, str]) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """URL마다 (URL, 영상 경로, 요약 경로) — 실패한 단계 이후는 None"""
+        return [(url, video_of.get(url), summary_of.get(url)) for url in urls]
+
+    def _run_sequential_pipeline(self, step_timings: Dict[str, float]):
+        """단계별 일괄 처리: 모든 파일이 한 단계를 마쳐야 다음 단계로 진행
+
+        단계마다 {입력 경로: 결과 경로}를 받아 URL → 영상 → WAV → 텍스트 → 요약을 이어 히스토리에 쓴다.
+        """
         video_paths: List[str] = []
         wav_paths: List[str] = []
         text_paths: List[str] = []
-        summary_paths: List[str] = []
+        video_of: Dict[str, str] = {}
+        wav_of: Dict[str, str] = {}
+        text_of: Dict[str, str] = {}
+        summary_of: Dict[str, str] = {}
         video_sizes: Dict[str, float] = {}
         urls: List[str] = []
 
         # ── 1. 영상 다운로드 ──
         if self.start_stage <= PipelineStage.DOWNLOAD:
-            urls = extract_urls_from_input(self.user_inputs.get('urls', ''))
-            if not urls:
-                raise ValueError("처리할 URL이 없습니다.")
-
-            user_setting = self.modules['UserSetting'](self.user_inputs)
+            urls, user_setting = self._get_download_inputs()
 
             self._check_cancelled()
             self._on_step_changed(PipelineStage.DOWNLOAD, STAGE_LABELS[PipelineStage.DOWNLOAD])
             step_start = _time.time()
-            video_paths = self._download_videos(urls, user_setting)
+            video_of = self._download_videos(urls, user_setting)
+            video_paths = list(video_of.values())
             step_timings["download_sec"] = round(_time.time() - step_start, 1)
 
             if not video_paths:
@@ -238,10 +318,7 @@ class ProcessingWorker:
 
             # 영상 파일 크기 기록 (삭제 전)
             for vp in video_paths:
-                try:
-                    video_sizes[vp] = os.path.getsize(vp) / (1024 * 1024)
-                except OSError:
-                    video_sizes[vp] = 0.0
+                self._record_video_size(video_sizes, vp)
 
         # ── 2. MP4 → WAV 변환 ──
         if self.start_stage <= PipelineStage.CONVERT_AUDIO:
@@ -251,7 +328,8 @@ class ProcessingWorker:
 
             # 시작 단계가 CONVERT_AUDIO이면 input_files를 사용
             source_videos = self.input_files if self.start_stage == PipelineStage.CONVERT_AUDIO else video_paths
-            wav_paths = self._convert_videos_to_wav(source_videos)
+            wav_of = self._convert_videos_to_wav(source_videos)
+            wav_paths = list(wav_of.values())
             step_timings["convert_sec"] = round(_time.time() - step_start, 1)
 
             if not wav_paths:
@@ -266,7 +344,8 @@ class ProcessingWorker:
 
             # 시작 단계가 STT이면 input_files를 사용
             source_wavs = self.input_files if self.start_stage == PipelineStage.STT else wav_paths
-            text_paths = self._transcribe_wav_to_text(source_wavs)
+            text_of = self._transcribe_wav_to_text(source_wavs)
+            text_paths = list(text_of.values())
             step_timings["stt_sec"] = round(_time.time() - step_start, 1)
 
             if not text_paths:
@@ -280,37 +359,235 @@ class ProcessingWorker:
 
             # 시작 단계가 SUMMARIZE이면 input_files를 사용
             source_texts = self.input_files if self.start_stage == PipelineStage.SUMMARIZE else text_paths
-            summary_paths = self._summarize_texts(source_texts)
+            summary_of = self._summarize_texts(source_texts)
             step_timings["summary_sec"] = round(_time.time() - step_start, 1)
 
-            if not summary_paths:
+            if not summary_of:
                 raise ValueError(f"요약 생성 성공한 파일이 없습니다. ({len(source_texts)}개 중 0개 성공)")
 
-        # 히스토리 저장 (다운로드부터 시작한 경우에만)
-        duration_sec = _time.time() - pipeline_start
-        step_timings["total_sec"] = round(duration_sec, 1)
+        summary_by_url = {}
+        for url, video_path in video_of.items():
+            text_path = text_of.get(wav_of.get(video_path))
+            if text_path in summary_of:
+                summary_by_url[url] = summary_of[text_path]
+        return self._lecture_records(urls, video_of, summary_by_url), video_paths, text_paths, video_sizes
 
-        timing_parts = []
-        if "download_sec" in step_timings:
-            timing_parts.append(f"다운로드 {step_timings['download_sec']}초")
-        if "convert_sec" in step_timings:
-            timing_parts.append(f"변환 {step_timings['convert_sec']}초")
-        if "stt_sec" in step_timings:
-            timing_parts.append(f"STT {step_timings['stt_sec']}초")
-        if "summary_sec" in step_timings:
-            timing_parts.append(f"요약 {step_timings['summary_sec']}초")
-        timing_parts.append(f"전체 {step_timings['total_sec']}초")
-        self._emit_log(f"⏱ 성능: {' | '.join(timing_parts)}")
+    # ── 스트리밍 모드 ─────────────────────────────────────
 
-        if urls and video_paths:
-            self._save_processing_history(urls, video_paths, video_sizes, summary_paths, duration_sec, step_timings)
+    def _run_streaming_pipeline(self, step_timings: Dict[str, float]):
+        """단계 중첩 처리: 강의별로 앞 단계가 끝나는 즉시 다음 단계로 넘긴다.
 
-        if video_paths and not self.save_video_dir:
-            self._delete_video_files(video_paths)
+        단계마다 스레드 하나가 앞 단계의 대기열에서 파일을 꺼내 처리한다.
+        대기열 크기가 제한되어 있으므로 느린 단계가 있으면 앞 단계가 그만큼 기다린다.
+        전체 소요 시간은 네 단계의 합이 아니라 가장 느린 단계에 가까워진다.
+        """
+        urls, user_setting = self._get_download_inputs()
+        self._emit_log("⚡ 스트리밍 모드: 다운로드가 끝난 강의부터 바로 변환/STT/요약을 진행합니다.")
 
-        self._display_results(video_paths, text_paths)
+        to_convert: "queue.Queue" = queue.Queue(maxsize=_STAGE_QUEUE_SIZE)
+        to_stt: "queue.Queue" = queue.Queue(
+            maxsize=_IN_MEMORY_QUEUE_SIZE if self.in_memory_audio else _STAGE_QUEUE_SIZE)
+        to_summarize: "queue.Queue" = queue.Queue(maxsize=_STAGE_QUEUE_SIZE)
+
+        # 단계 사이에는 (URL, 영상 경로, 결과)를 넘겨 완료 순서와 관계없이 강의별 결과를 잇는다
+        video_paths: List[str] = []
+        wav_paths: List[str] = []
+        text_paths: List[str] = []
+        video_of: Dict[str, str] = {}
+        summary_of: Dict[str, str] = {}
+        video_sizes: Dict[str, float] = {}
+        busy = {"download_sec": 0.0, "convert_sec": 0.0, "stt_sec": 0.0, "summary_sec": 0.0}
+        total = len(urls)
 
-    def _download_videos(self, urls: List[str], user_setting) -> List[str]:
+        abort = threading.Event()  # 한 단계가 치명적 오류로 멈추면 나머지 단계도 정리
+        errors: List[BaseException] = []
+
+        def on_downloaded(video_path: str, url: str):
+            self._record_video_size(video_sizes, video_path)
+            video_paths.append(video_path)
+            video_of[url] = video_path
+            self._stream_put(to_convert, (url, video_path), abort)
+
+        def download_stage():
+            self._enter_stage(PipelineStage.DOWNLOAD)
+            step_start = _time.time()
+            self._download_videos(urls, user_setting, on_downloaded=on_downloaded)
+            busy["download_sec"] = _time.time() - step_start
+
+        def convert_stage():
+            audio_pipeline = self._create_audio_pipeline()
+            for i, (url, video_path) in self._stream_items(to_convert, abort):
+                self._enter_stage(PipelineStage.CONVERT_AUDIO)
+                step_start = _time.time()
+                audio = self._convert_one(audio_pipeline, video_path, i, total,
+                                          in_memory=self.in_memory_audio)
+                busy["convert_sec"] += _time.time() - step_start
+                if audio is not None:
+                    wav_paths.append(self._audio_source_path(audio))
+                    self._stream_put(to_stt, (url, audio), abort)
+                    del audio
+
+        def stt_stage():
+            audio_pipeline = None
+            jobs = None  # 클라우드 작업형 STT(ReturnZero): 도착하는 대로 작업을 올려 두고 동시에 기다린다
+            futures = []
+            try:
+                for i, (url, audio) in self._stream_items(to_stt, abort):
+                    self._enter_stage(PipelineStage.STT)
+                    if audio_pipeline is None:
+                        self._check_stt_model_available()
+                        audio_pipeline = self._create_stt_pipeline()
+                        if audio_pipeline.max_concurrent_jobs > 1:
+                            jobs = ThreadPoolExecutor(max_workers=audio_pipeline.max_concurrent_jobs)
+                    if jobs is not None:
+                        futures.append(jobs.submit(stt_job, audio_pipeline, url, audio, i))
+                        continue
+                    step_start = _time.time()
+                    text_path = self._transcribe_one(audio_pipeline, audio, i, total)
+                    del audio
+                    busy["stt_sec"] += _time.time() - step_start
+                    if text_path:
+                        text_paths.append(text_path)
+                        self._stream_put(to_summarize, (url, text_path), abort)
+                self._wait_all(futures)
+            finally:
+                if jobs is not None:
+                    jobs.shutdown(wait=False, cancel_futures=True)
+
+        stt_active = {"count": 0, "since": 0.0}
+        stt_lock = threading.Lock()
+
+        def stt_job(audio_pipeline, url, wav_path, i):
+            # 동시 작업의 STT 시간은 작업이 하나라도 진행 중이던 시간으로 잰다
+            with stt_lock:
+                if stt_active["count"] == 0:
+                    stt_active["since"] = _time.time()
+                stt_active["count"] += 1
+            try:
+                text_path = self._transcribe_beside(audio_pipeline, wav_path, i, total)
+            finally:
+                with stt_lock:
+                    stt_active["count"] -= 1
+                    if stt_active["count"] == 0:
+                        busy["stt_sec"] += _time.time() - stt_active["since"]
+            if text_path:
+                text_paths.append(text_path)
+                self._stream_put(to_summarize, (url, text_path), abort)
+
+        async def summarize_one_timed(summarize_pipeline, url, text_path, i):
+            step_start = _time.time()
+            summary_path = await self._asummarize_one(summarize_pipeline, text_path, i, total)
+            busy["summary_sec"] += _time.time() - step_start
+            if summary_path:
+                summary_of[url] = summary_path
+
+        def summarize_stage():
+            # 요약은 API 응답 대기라 STT가 넘겨주는 대로 이벤트 루프에 올려 겹쳐서 보낸다
+            summarize_pipeline = None
+            loop = None
+            futures = []
+            try:
+                for i, (url, text_path) in self._stream_items(to_summarize, abort):
+                    self._enter_stage(PipelineStage.SUMMARIZE)
+                    if summarize_pipeline is None:
+                        summarize_pipeline = self._create_summarize_pipeline()
+                        loop = self._start_summary_loop()
+                    futures.append(asyncio.run_coroutine_threadsafe(
+                        summarize_one_timed(summarize_pipeline, url, text_path, i), loop))
+                self._wait_all(futures)
+            finally:
+                if loop is not None:
+                    self._stop_summary_loop(loop)
+
+        def run_stage(target, out_queue):
+            try:
+                target()
+            except BaseException as e:
+                errors.append(e)
+                abort.set()
+            finally:
+                if out_queue is not None:
+                    self._stream_put(out_queue, _STREAM_END, abort)
+
+        threads = [
+            threading.Thread(target=run_stage, args=(download_stage, to_convert), daemon=True),
+            threading.Thread(target=run_stage, args=(convert_stage, to_stt), daemon=True),
+            threading.Thread(target=run_stage, args=(stt_stage, to_summarize), daemon=True),
+            threading.Thread(target=run_stage, args=(summarize_stage, None), daemon=True),
+        ]
+        for t in threads:
+            t.start()
+
+        while any(t.is_alive() for t in threads):
+            self._check_cancelled()
+            if abort.is_set():
+                break
+            threads[-1].join(timeout=0.5)
+
+        if errors:
+            raise errors[0]
+
+        for key, value in busy.items():
+            step_timings[key] = round(value, 1)
+
+        if text_paths:
+            self._emit_log("변환된 텍스트 파일들:")
+            for i, text_path in enumerate(text_paths, 1):
+                self._emit_log(f"   ({i}) {text_path}")
+
+        if not video_paths:
+            raise ValueError(f"다운로드된 영상이 없습니다. ({len(urls)}개 URL 중 0개 성공)")
+        if not wav_paths:
+            raise ValueError(f"WAV 변환 성공한 파일이 없습니다. ({len(video_paths)}개 중 0개 성공)")
+        if not text_paths:
+            raise ValueError(f"텍스트 변환 성공한 파일이 없습니다. ({len(wav_paths)}개 중 0개 성공)")
+        if not summary_of:
+            raise ValueError(f"요약 생성 성공한 파일이 없습니다. ({len(text_paths)}개 중 0개 성공)")
+
+        return self._lecture_records(urls, video_of, summary_of), video_paths, text_paths, video_sizes
+
+    def _enter_stage(self, stage: PipelineStage):
+        """가장 앞선 진행 단계가 바뀔 때만 단계 표시를 갱신 (스트리밍 모드)"""
+        with self._stage_lock:
+            if stage <= self._active_stage:
+                return
+            self._active_stage = stage
+        self._on_step_changed(stage, STAGE_LABELS[stage])
+
+    def _stream_put(self, q: "queue.Queue", item, abort: threading.Event):
+        """대기열이 가득 차면 빈 자리가 날 때까지 대기 (취소/중단 시 즉시 반환)"""
+        while not abort.is_set():
+            self._check_cancelled()
+            try:
+                q.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def _stream_items(self, q: "queue.Queue", abort: threading.Event):
+        """앞 단계가 종료 표시를 넣을 때까지 (순번, 항목)을 하나씩 꺼낸다"""
+        index = 0
+        while not abort.is_set():
+            self._check_cancelled()
+            try:
+                item = q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if item is _STREAM_END:
+                return
+            index += 1
+            yield index, item
+            item = None  # 다음 항목을 기다리는 동안 처리 끝난 항목(메모리 오디오 등)을 붙잡지 않음
+
+    def _add_failure(self):
+        with self._fail_lock:
+            self._fail_count += 1
+
+    # ── 단계별 처리 ───────────────────────────────────────
+
+    def _download_videos(self, urls: List[str], user_setting,
+                         on_downloaded: Optional[Callable[[str, str], None]] = None) -> Dict[str, str]:
+        """강의 URL → 다운로드한 파일 경로 (입력 URL 순서, 실패한 URL은 빠짐)"""
         self._emit_log(Messages.VIDEO_DOWNLOADING)
         self._emit_log(f"다운로드할 링크: {len(urls)}개")
 
@@ -325,16 +602,36 @@ class ProcessingWorker:
                 mb_total = total / (1024 * 1024)
                 self._emit_log(f"   다운로드 진행: {pct}% ({mb_down:.1f}/{mb_total:.1f} MB)")
 
+        def on_audio_progress(done_sec, total_sec):
+            pct = int(done_sec / total_sec * 100)
+            if pct != self._last_progress_pct and pct % 10 == 0:
+                self._last_progress_pct = pct
+                self._emit_log(f"   오디오 추출 진행: {pct}% ({int(done_sec) // 60}분/{int(total_sec) // 60}분)")
+
+        if self.audio_only:
+            self._emit_log("영상을 저장하지 않으므로 오디오 트랙만 바로 WAV로 받습니다.")
+
         video_pipeline = self.modules['VideoPipeline'](
             user_setting, progress_callback=on_progress,
             chrome_path=self.chrome_path,
             log_callback=self._emit_log,
             headless=not self.debug_mode,
+            extraction_workers=get_extraction_workers(),
+            download_segments=get_download_segments(),
+            audio_only=self.audio_only,
+            audio_progress_callback=on_audio_progress,
         )
         video_pipeline.downloads_dir = ensure_downloads_directory()
 
+        downloaded: Dict[str, str] = {}
+
+        def on_video(filepath: str, url: str):
+            downloaded[url] = filepath
+            if on_downloaded:
+                on_downloaded(filepath, url)
+
         self._check_cancelled()
-        video_paths = video_pipeline.process_sync(urls)
+        video_paths = video_pipeline.process_sync(urls, on_downloaded=on_video)
 
         failed_count = len(urls) - len(video_paths)
         if failed_count > 0:
@@ -345,7 +642,7 @@ class ProcessingWorker:
         for i, filepath in enumerate(video_paths, 1):
             self._emit_log(f"   ({i}) {filepath}")
 
-        return video_paths
+        return {url: downloaded[url] for url in urls if url in downloaded}
 
     def _delete_video_files(self, video_paths: List[str]):
         import os
@@ -357,36 +654,134 @@ class ProcessingWorker:
             except Exception as e:
                 self._emit_log(f"⚠️ 영상 삭제 실패 ({Path(filepath).name}): {e}")
 
-    def _convert_videos_to_wav(self, video_paths: List[str]) -> List[str]:
-        """MP4/영상 파일들을 WAV로 변환"""
+    def _create_audio_pipeline(self):
+        return self.modules['AudioToTextPipeline'](engine=self.stt_engine, model_name=self.stt_model, stt_params=self.stt_params)
+
+    def _convert_videos_to_wav(self, video_paths: List[str]) -> Dict[str, str]:
+        """MP4/영상 파일들을 WAV로 변환 (가능하면 여러 프로세스에서 동시에).
+        {영상 경로: WAV 경로}를 입력 순서로 반환 (실패한 파일은 빠짐)."""
         self._emit_log("📋 영상을 오디오(WAV)로 변환 중...")
 
-        audio_pipeline = self.modules['AudioToTextPipeline'](engine=self.stt_engine, model_name=self.stt_model, stt_params=self.stt_params)
-        wav_paths = []
+        audio_pipeline = self._create_audio_pipeline()
+        to_convert = [p for p in video_paths if Path(p).suffix.lower() != ".wav"]
+        workers = min(self._resolve_convert_workers(), len(to_convert))
+
+        if workers <= 1:
+            wav_of = {}
+            for i, video_path in enumerate(video_paths, 1):
+                self._check_cancelled()
+                wav_path = self._convert_one(audio_pipeline, video_path, i, len(video_paths))
+                if wav_path:
+                    wav_of[video_path] = wav_path
+            return wav_of
+
+        return self._convert_in_process_pool(audio_pipeline, video_paths, workers)
+
+    def _resolve_convert_workers(self) -> int:
+        """설정값이 0(자동)이면 CPU 코어 수에서 로컬 STT용 코어를 뺀 만큼 사용"""
+        configured = get_convert_workers()
+        if configured > 0:
+            return configured
+        reserve = _STT_CPU_RESERVE if self.stt_engine == "faster-whisper" else 0
+        return max(1, (os.cpu_count() or 1) - reserve)
+
+    def _convert_in_process_pool(self, audio_pipeline, video_paths: List[str], workers: int) -> Dict[str, str]:
+        """파일마다 별도 프로세스에서 PyAV 디코딩을 수행.
+
+        파일별 실패는 기존과 같이 실패 건수만 올리고 나머지는 계속 진행하며,
+        취소되면 풀을 즉시 종료하고 만들다 만 WAV를 지운다.
+        """
+        from src.audio_pipeline.pipeline import convert_to_wav_file
 
-        for i, video_path in enumerate(video_paths, 1):
-            self._check_cancelled()
-            try:
-                audio_pipeline.downloads_dir = str(Path(video_path).parent)
-                self._emit_log(f"({i}/{len(video_paths)}) WAV 변환 중: {Path(video_path).name}")
+        total = len(video_paths)
+        self._emit_log(f"⚡ {workers}개 프로세스로 동시에 변환합니다.")
 
-                wav_path = audio_pipeline.convert_to_wav(video_path)
-                wav_paths.append(wav_path)
-                self._emit_log(f"✅ WAV 변환 완료: {wav_path}")
+        results: Dict[int, str] = {}
+        # 워커 스레드/GUI 스레드가 있는 프로세스에서 fork하지 않도록 spawn 사용
+        pool = multiprocessing.get_context("spawn").Pool(processes=workers)
+        pending = {}
+        try:
+            for i, video_path in enumerate(video_paths, 1):
+                if Path(video_path).suffix.lower() == ".wav":
+                    wav_path = self._convert_one(audio_pipeline, video_path, i, total)
+                    if wav_path:
+                        results[i] = wav_path
+                    continue
+                self._emit_log(f"({i}/{total}) WAV 변환 중: {Path(video_path).name}")
+                pending[i] = (video_path, pool.apply_async(
+                    convert_to_wav_file, (video_path, str(Path(video_path).parent), audio_pipeline.sample_rate)))
+
+            while pending:
+                self._check_cancelled()
+                for i, (video_path, async_result) in list(pending.items()):
+                    if not async_result.ready():
+                        continue
+                    del pending[i]
+                    try:
+                        wav_path = async_result.get()
+                    except Exception as e:
+                        self._add_failure()
+                        self._emit_log(f"❌ WAV 변환 실패 ({Path(video_path).name}): {e}")
+                        continue
+                    self._emit_log(f"✅ WAV 변환 완료: {wav_path}")
+                    results[i] = wav_path
+                if pending:
+                    next(iter(pending.values()))[1].wait(timeout=0.5)
+            pool.close()
+        except BaseException:
+            pool.terminate()
+            for video_path, _ in pending.values():
+                partial_wav = Path(video_path).with_suffix(".wav")
+                if partial_wav.exists():
+                    partial_wav.unlink()
+            raise
+        finally:
+            pool.join()
+
+        return {video_paths[i - 1]: results[i] for i in sorted(results)}
+
+    def _convert_one(self, audio_pipeline, video_path: str, index: int, total: int,
+                     in_memory: bool = False):
+        """영상 1개를 WAV로 변환. 실패하면 실패 건수를 올리고 None 반환.
+
+        in_memory=True이면 WAV 파일을 쓰지 않고 DecodedAudio(메모리 PCM)를 반환한다.
+        """
+        if Path(video_path).suffix.lower() == ".wav":
+            # 다운로드 단계에서 오디오를 바로 받았거나 이미 WAV인 입력은 변환 불필요
+            self._emit_log(f"({index}/{total}) 이미 WAV 파일이므로 변환 생략: {Path(video_path).name}")
+            return video_path
 
-            except CancelledException:
-                raise
-            except Exception as e:
-                self._fail_count += 1
-                self._emit_log(f"❌ WAV 변환 실패 ({Path(video_path).name}): {e}")
+        try:
+            audio_pipeline.downloads_dir = str(Path(video_path).parent)
+            if in_memory:
+                self._emit_log(f"({index}/{total}) 오디오 디코딩 중 (메모리): {Path(video_path).name}")
+                decoded = audio_pipeline.decode_audio(video_path)
+                self._emit_log(f"✅ 오디오 디코딩 완료: {len(decoded.samples) / 16000 / 60:.1f}분 분량")
+                return decoded
 
-        return wav_paths
+            self._emit_log(f"({index}/{total}) WAV 변환 중: {Path(video_path).name}")
 
-    def _transcribe_wav_to_text(self, wav_paths: List[str]) -> List[str]:
-        """WAV 파일들을 텍스트로 변환"""
-        self._emit_log(Messages.AUDIO_CONVERTING)
+            wav_path = audio_pipeline.convert_to_wav(video_path)
+            self._emit_log(f"✅ WAV 변환 완료: {wav_path}")
+            return wav_path
 
-        audio_pipeline = self.modules['AudioToTextPipeline'](engine=self.stt_engine, model_name=self.stt_model, stt_params=self.stt_params, on_log=self._emit_log)
+        except CancelledException:
+            raise
+        except Exception as e:
+            self._add_failure()
+            self._emit_log(f"❌ WAV 변환 실패 ({Path(video_path).name}): {e}")
+            return None
+
+    def _create_stt_pipeline(self):
+        """STT용 AudioToTextPipeline 생성 (엔진별 API 키/엔드포인트 주입 포함)"""
+        engine = self.stt_engine
+        # faster-whisper: 상주 STT 서버를 쓰면 실행마다 모델을 다시 로드하지 않음
+        if engine == "faster-whisper" and get_stt_server_enabled():
+            engine = "faster-whisper-server"
+            self.stt_params["server_port"] = get_stt_server_port()
+            self.stt_params["server_idle_timeout"] = get_stt_server_idle_minutes() * 60
+        audio_pipeline = self.modules['AudioToTextPipeline'](engine=engine, model_name=self.stt_model, stt_params=self.stt_params, on_log=self._emit_log,
+                                                             use_cache=get_transcript_cache_enabled())
         # OpenAI Whisper 클라우드 STT인 경우 API 키를 파라미터에 주입
         if self.stt_engine == "openai-whisper":
             from src.gui.core.file_manager import get_stt_api_key
@@ -399,79 +794,225 @@ class ProcessingWorker:
             compat_model = get_stt_api_key(engine="openai-compatible-model")
             if compat_model:
                 self.stt_model = compat_model
-        self._emit_log(f"STT 엔진: {self.stt_engine} / 모델: {self.stt_model}")
-        text_paths = []
+        self._emit_log(f"STT 엔진: {engine} / 모델: {self.stt_model}")
+        return audio_pipeline
 
-        for i, wav_path in enumerate(wav_paths, 1):
-            self._check_cancelled()
-            try:
-                audio_pipeline.downloads_dir = str(Path(wav_path).parent)
-                self._emit_log(f"({i}/{len(wav_paths)}) 텍스트 변환 중: {Path(wav_path).name}")
+    def _transcribe_wav_to_text(self, wav_paths: List[str]) -> Dict[str, str]:
+        """WAV 파일들을 텍스트로 변환. {WAV 경로: 텍스트 경로}를 입력 순서로 반환 (실패한 파일은 빠짐)."""
+        self._emit_log(Messages.AUDIO_CONVERTING)
 
-                text_path = self._interruptible(
-                    audio_pipeline.transcribe, wav_path, remove_wav=True,
-                    timeout=1800,  # 30분 타임아웃 (파일당)
-                )
-                text_paths.append(text_path)
-                self._emit_log(f"{Messages.CONVERSION_COMPLETE}: {text_path}")
+        audio_pipeline = self._create_stt_pipeline()
+        text_of = {}
 
-            except CancelledException:
-                raise
-            except Exception as e:
-                self._fail_count += 1
-                self._emit_log(f"{Messages.CONVERSION_FAILED} ({Path(wav_path).name}): {e}")
+        if len(wav_paths) > 1 and audio_pipeline.max_concurrent_jobs > 1:
+            text_of = self._transcribe_concurrently(audio_pipeline, wav_paths)
+        else:
+            for i, wav_path in enumerate(wav_paths, 1):
+                self._check_cancelled()
+                text_path = self._transcribe_one(audio_pipeline, wav_path, i, len(wav_paths))
+                if text_path:
+                    text_of[wav_path] = text_path
 
-        if text_paths:
+        if text_of:
             self._emit_log("변환된 텍스트 파일들:")
-            for i, text_path in enumerate(text_paths, 1):
+            for i, text_path in enumerate(text_of.values(), 1):
                 self._emit_log(f"   ({i}) {text_path}")
 
-        return text_paths
+        return text_of
+
+    def _transcribe_concurrently(self, audio_pipeline, wav_paths: List[str]) -> Dict[str, str]:
+        """클라우드 작업형 STT(ReturnZero): 모든 WAV를 한꺼번에 올리고 끝나는 대로 결과를 받는다.
+        반환 순서는 입력 순서와 같다."""
+        total = len(wav_paths)
+        self._emit_log(f"☁️ {total}개 파일을 동시에 변환합니다 (최대 {audio_pipeline.max_concurrent_jobs}개 작업)")
+        results: Dict[str, str] = {}
+        for done, (wav_path, result) in enumerate(
+                audio_pipeline.transcribe_many(wav_paths, remove_wav=True, check_cancelled=self._check_cancelled), 1):
+            if isinstance(result, Exception):
+                self._add_failure()
+                self._emit_log(f"{Messages.CONVERSION_FAILED} ({Path(wav_path).name}): {result}")
+                continue
+            results[wav_path] = result
+            self._emit_log(f"({done}/{total}) {Messages.CONVERSION_COMPLETE}: {result}")
+        return {path: results[path] for path in wav_paths if path in results}
+
+    @staticmethod
+    def _audio_source_path(audio) -> str:
+        """WAV 경로 또는 DecodedAudio에서 파일 경로를 꺼낸다"""
+        return audio if isinstance(audio, str) else audio.source_path
+
+    def _transcribe_one(self, audio_pipeline, audio, index: int, total: int) -> Optional[str]:
+        """WAV 1개(또는 메모리로 디코딩된 DecodedAudio)를 텍스트로 변환.
+        실패하면 실패 건수를 올리고 None 반환."""
+        wav_path = self._audio_source_path(audio)
+        samples = None if isinstance(audio, str) else audio.samples
+        try:
+            audio_pipeline.downloads_dir = str(Path(wav_path).parent)
+            self._emit_log(f"({index}/{total}) 텍스트 변환 중: {Path(wav_path).name}")
+
+            text_path = self._interruptible(
+                audio_pipeline.transcribe, wav_path, remove_wav=True, audio=samples,
+                timeout=1800,  # 30분 타임아웃 (파일당)
+            )
+            self._emit_log(f"{Messages.CONVERSION_COMPLETE}: {text_path}")
+            return text_path
+
+        except CancelledException:
+            raise
+        except Exception as e:
+            self._add_failure()
+            self._emit_log(f"{Messages.CONVERSION_FAILED} ({Path(wav_path).name}): {e}")
+            return None
+
+    def _transcribe_beside(self, audio_pipeline, wav_path: str, index: int, total: int) -> Optional[str]:
+        """클라우드 작업형 STT로 WAV 1개를 변환 (스트리밍 모드에서 여러 스레드가 동시에 호출).
+        실패하면 실패 건수를 올리고 None 반환."""
+        try:
+            self._emit_log(f"({index}/{total}) 텍스트 변환 작업 제출: {Path(wav_path).name}")
+            text_path = audio_pipeline.transcribe_beside(wav_path, remove_wav=True)
+            self._emit_log(f"({index}/{total}) {Messages.CONVERSION_COMPLETE}: {text_path}")
+            return text_path
+        except CancelledException:
+            raise
+        except Exception as e:
+            self._add_failure()
+            self._emit_log(f"{Messages.CONVERSION_FAILED} ({Path(wav_path).name}): {e}")
+            return None
 
     # 하위 호환: 기존 _convert_audio_to_text 을 유지 (직접 호출하는 곳은 없지만 안전)
     def _convert_audio_to_text(self, video_paths: List[str]) -> List[str]:
-        wav_paths = self._convert_videos_to_wav(video_paths)
-        return self._transcribe_wav_to_text(wav_paths)
+        wav_paths = list(self._convert_videos_to_wav(video_paths).values())
+        return list(self._transcribe_wav_to_text(wav_paths).values())
 
-    def _summarize_texts(self, text_paths: List[str]) -> List[str]:
+    def _create_summarize_pipeline(self):
         self._emit_log(Messages.TEXT_SUMMARIZING)
         self._emit_log(f"AI 엔진: {self.engine} / 모델: {self.model_name}")
 
-        is_clipboard = self.engine == "clipboard"
-        if is_clipboard:
+        if self.engine == "clipboard":
             self._emit_log("클립보드 모드: 프롬프트가 클립보드에 복사되고 외부 챗봇이 열립니다.")
 
         api_key = self.user_inputs.get('api_key', '')
-        summarize_pipeline = self.modules['SummarizePipeline'](
+        return self.modules['SummarizePipeline'](
             self.model_name,
             prompt=self.summary_prompt,
             engine=self.engine,
             api_key=api_key,
             base_url=self.base_url,
+            use_cache=get_summary_cache_enabled(),
+            rate_limits=get_summary_rate_limits(self.engine),
+            stream=get_summary_streaming(),
+            map_reduce=get_summary_map_reduce(),
+            context_tokens=get_summary_context_tokens(self.engine),
         )
-        summary_paths = []
 
-        for i, text_path in enumerate(text_paths, 1):
+    def _summarize_texts(self, text_paths: List[str]) -> Dict[str, str]:
+        """{텍스트 경로: 요약 경로}를 입력 순서로 반환 (실패한 파일은 빠짐)"""
+        summarize_pipeline = self._create_summarize_pipeline()
+        if summarize_pipeline.max_concurrency > 1 and len(text_paths) > 1:
+            # LLM 응답 대기가 대부분이므로 여러 요청을 동시에 보낸다 (엔진별 속도 제한은 파이프라인이 적용)
+            self._emit_log(f"⚡ 요약 최대 {summarize_pipeline.max_concurrency}개 동시 진행 (엔진 속도 제한 적용)")
+
+        loop = self._start_summary_loop()
+        try:
+            futures = [
+                asyncio.run_coroutine_threadsafe(
+                    self._asummarize_one(summarize_pipeline, text_path, i, len(text_paths)), loop)
+                for i, text_path in enumerate(text_paths, 1)
+            ]
+            self._wait_all(futures)
+        finally:
+            self._stop_summary_loop(loop)
+        return {text_path: f.result() for text_path, f in zip(text_paths, futures) if f.result()}
+
+    def _start_summary_loop(self) -> asyncio.AbstractEventLoop:
+        """요약 요청을 동시에 보낼 이벤트 루프를 전용 스레드 하나에서 시작.
+
+        요청마다 스레드를 두지 않고 SDK async 클라이언트로 한 루프에서 응답을 기다린다.
+        """
+        loop = asyncio.new_event_loop()
+
+        def run():
+            loop.run_forever()
+            loop.close()
+
+        threading.Thread(target=run, daemon=True, name="summarize-loop").start()
+        return loop
+
+    @staticmethod
+    def _stop_summary_loop(loop: asyncio.AbstractEventLoop):
+        """남은 요약 작업을 취소하고(속도 제한 슬롯 반환까지 기다림) 루프를 멈춘다"""
+        async def cancel_pending():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(cancel_pending(), loop).result(timeout=5)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+
+    def _wait_all(self, futures):
+        """취소 신호를 확인하며 모든 future가 끝날 때까지 대기"""
+        pending = set(futures)
+        while pending:
             self._check_cancelled()
-            try:
-                summarize_pipeline.downloads_dir = str(Path(text_path).parent)
-                self._emit_log(f"({i}/{len(text_paths)}) 요약 생성 중: {Path(text_path).name}")
+            _, pending = wait(pending, timeout=0.5)
 
-                # 클립보드 모드: 챗봇용 텍스트 파일도 생성
-                if is_clipboard:
-                    self._write_chatbot_text(text_path)
+    async def _asummarize_one(self, summarize_pipeline, text_path: str, index: int, total: int) -> Optional[str]:
+        """텍스트 1개를 요약 (요약 이벤트 루프에서 실행). 실패하면 실패 건수를 올리고 None 반환."""
+        try:
+            self._check_cancelled()
+            self._emit_log(f"({index}/{total}) 요약 생성 중: {Path(text_path).name}")
 
-                summary_path = self._interruptible(summarize_pipeline.process, text_path)
-                summary_paths.append(summary_path)
-                self._emit_log(f"{Messages.SUMMARY_COMPLETE}: {summary_path}")
+            # 파일 읽기/토큰 계산은 스레드에서 (이벤트 루프의 다른 요약 스트림을 막지 않도록)
+            # 클립보드 모드: 챗봇용 텍스트 파일도 생성
+            if self.engine == "clipboard":
+                await asyncio.to_thread(self._write_chatbot_text, text_path)
+            else:
+                estimate = await asyncio.to_thread(summarize_pipeline.estimate, text_path)
+                self._emit_log(f"   📊 {estimate.describe()}")
 
-            except CancelledException:
-                raise
-            except Exception as e:
-                self._fail_count += 1
-                self._emit_log(f"{Messages.SUMMARY_FAILED} ({Path(text_path).name}): {e}")
+            on_chunk, flush_preview = self._summary_preview_forwarder(Path(text_path).stem)
+            # aprocess가 첫 await 전에 downloads_dir을 읽으므로 바로 앞에서 설정하면 다른 요청과 섞이지 않음
+            summarize_pipeline.downloads_dir = str(Path(text_path).parent)
+            summary_path = await summarize_pipeline.aprocess(text_path, on_chunk=on_chunk)
+            flush_preview()
+            self._emit_log(f"{Messages.SUMMARY_COMPLETE}: {summary_path}")
+            return summary_path
+
+        except CancelledException:
+            raise
+        except Exception as e:
+            self._add_failure()
+            self._emit_log(f"{Messages.SUMMARY_FAILED} ({Path(text_path).name}): {e}")
+            return None
+
+    def _summary_preview_forwarder(self, name: str):
+        """스트리밍 요약 조각을 모아 일정 간격으로 진행 화면에 넘기는 콜백과 남은 조각을 보내는 함수.
+
+        조각 대신 None이 오면(429 재시도로 처음부터 다시 받음) 모은 조각을 버리고 화면에도 None을 넘긴다.
+        """
+        pending: List[str] = []
+        last_sent = [0.0]
+
+        def flush():
+            if pending:
+                self._on_summary_chunk(name, "".join(pending))
+                pending.clear()
+            last_sent[0] = _time.monotonic()
+
+        def on_chunk(chunk: Optional[str]):
+            if chunk is None:
+                pending.clear()
+                self._on_summary_chunk(name, None)
+                return
+            pending.append(chunk)
+            if _time.monotonic() - last_sent[0] >= _SUMMARY_PREVIEW_INTERVAL:
+                flush()
 
-        return summary_paths
+        return on_chunk, flush
 
     def _write_chatbot_text(self, text_path: str):
         """클립보드 모드에서 챗봇에 붙여넣기용 텍스트 파일 생성"""
@@ -488,17 +1029,15 @@ class ProcessingWorker:
 
 
     def _save_processing_history(
-        self, urls: List[str], video_paths: List[str],
-        video_sizes: Dict[str, float], summary_paths: List[str],
+        self, lectures: List[Tuple[str, Optional[str], Optional[str]]],
+        video_sizes: Dict[str, float],
         duration_sec: float, step_timings: Dict[str, float] = None,
     ):
-        """처리 완료된 강의 히스토리를 저장"""
+        """처리 완료된 강의 히스토리를 저장 (lectures: (URL, 영상 경로, 요약 경로) 목록)"""
         from datetime import datetime
         timestamp = datetime.now().isoformat()
 
-        for i, url in enumerate(urls):
-            video_path = video_paths[i] if i < len(video_paths) else None
-            summary_path = summary_paths[i] if i < len(summary_paths) else None
+        for url, video_path, summary_path in lectures:
 
             entry = {
                 "url": url,
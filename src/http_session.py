@@ -0,0 +1,55 @@
+"""공용 HTTP 세션 (커넥션 풀 + 재시도)
+
+다운로드, ReturnZero 폴링, 오케스트레이터 상태 확인 등 같은 호스트에 반복해서 붙는
+요청이 매번 TCP/TLS 연결을 새로 맺지 않도록 프로세스 전체에서 하나의 세션을 공유한다.
+urllib3 커넥션 풀은 스레드 안전하므로 여러 작업 스레드에서 그대로 사용할 수 있다.
+"""
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_SIZE = 10   # 호스트당 유지할 keep-alive 연결 수
+DEFAULT_MAX_RETRIES = 3  # 연결 실패/일시 오류(502·503·504) 재시도 횟수
+
+# 재시도는 멱등 요청에만 적용 (POST 업로드가 중복 제출되지 않도록)
+_RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+_RETRY_STATUSES = (502, 503, 504)
+
+_session: Optional[requests.Session] = None
+_lock = threading.Lock()
+
+
+def _build_session(pool_size: int, max_retries: int) -> requests.Session:
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=0,  # 응답 도중 끊김은 호출 측(이어받기 등)에서 처리
+        backoff_factor=0.5,
+        status_forcelist=_RETRY_STATUSES,
+        allowed_methods=_RETRY_METHODS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """공용 세션 반환 (최초 호출 시 settings.json의 풀 크기/재시도 설정으로 생성)"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                from src.gui.core.file_manager import get_http_pool_size, get_http_max_retries
+                _session = _build_session(get_http_pool_size(), get_http_max_retries())
+    return _session
+
@@ -0,0 +1,116 @@
+"""디스크 기반 결과 캐시 (내용 해시 키 + 크기 제한 LRU)
+
+같은 강의를 다시 처리할 때(파일 이름 변경, 재다운로드, 실수로 다시 실행 등) STT/요약을
+처음부터 다시 하지 않도록 결과를 앱 데이터 디렉토리에 JSON으로 보관한다.
+키는 입력 내용의 해시와 결과에 영향을 주는 설정으로 만들므로 파일 이름과 무관하다.
+
+항목마다 파일 하나를 쓰고, 읽을 때 수정 시각을 갱신해 LRU 순서로 쓴다.
+전체 크기가 max_bytes를 넘으면 가장 오래 쓰지 않은 항목부터 지운다.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Optional
+
+_HASH_BLOCK = 1024 * 1024
+
+
+def hash_file(path: str) -> str:
+    """파일 내용의 sha256 (1MB 블록 단위로 읽음)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def make_key(*parts) -> str:
+    """해시/설정 값들을 하나의 캐시 키로 합친다 (순서 중요)"""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            # 쓰다 만 파일 등 — 없는 것으로 취급하고 지운다
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # LRU: 최근 사용으로 표시
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: dict) -> None:
+        # 임시 파일에 쓴 뒤 교체 — 다른 스레드/프로세스가 반쯤 쓴 항목을 읽지 않도록
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            self._remove(tmp_path)
+            print(f"[WARN] 캐시 저장 실패: {e}")
+            return
+        self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            for name in os.listdir(self.cache_dir):
+                self._remove(os.path.join(self.cache_dir, name))
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith(".json"):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name: str) -> ResultCache:
+    """이름별 공용 캐시 반환 (앱 데이터 디렉토리의 cache/<name>, 크기 제한은 settings.json)"""
+    with _caches_lock:
+        if name not in _caches:
+            from src.gui.core.file_manager import get_app_data_dir, get_result_cache_max_mb
+            cache_dir = os.path.join(get_app_data_dir(), "cache", name)
+            _caches[name] = ResultCache(cache_dir, get_result_cache_max_mb() * 1024 * 1024)
+        return _caches[name]
@@ -0,0 +1,146 @@
+"""긴 강의 텍스트의 분할 요약 (map-reduce)
+
+텍스트 전체를 프롬프트 하나에 넣으면 Ollama 소형 모델은 컨텍스트 길이를 넘어 앞부분이 잘리고,
+클라우드 모델은 긴 입력을 처리하는 시간을 그대로 기다려야 한다. 그래서 긴 텍스트는
+
+1. 문장 경계에서 토큰 예산 이하의 구간으로 나누고
+2. 구간별 정리 노트를 동시에 만든 뒤 (map — 엔진 속도 제한 안에서 병렬)
+3. 노트를 모아 사용자가 고른 요약 프롬프트(build_prompt 모드)로 최종 요약한다 (reduce).
+
+노트를 합쳐도 예산을 넘으면 노트를 다시 묶어 정리하는 단계를 반복한다.
+구간 크기는 엔진/모델의 컨텍스트 길이에 맞춰 정한다.
+"""
+import math
+import re
+from dataclasses import dataclass
+from typing import Callable, List
+
+from src.summarize_pipeline.token_estimator import count_tokens
+
+# 엔진별 컨텍스트 길이 (토큰)
+ENGINE_CONTEXT_TOKENS = {
+    "gemini": 1_048_576,
+    "openai": 128_000,
+    "claude": 200_000,
+    "grok": 131_072,
+    # Ollama OpenAI 호환 API는 num_ctx를 지정하지 않으면 기본값(4096)으로 잘라낸다
+    "ollama": 4_096,
+    "custom": 8_192,
+}
+
+MODEL_CONTEXT_TOKENS = {
+    ("openai", "gpt-5.4"): 400_000,
+    ("openai", "gpt-5-mini-2025-08-07"): 400_000,
+    ("grok", "grok-4-1-fast-non-reasoning"): 2_000_000,
+    ("grok", "grok-4-1-fast-reasoning"): 2_000_000,
+}
+
+_DEFAULT_CONTEXT_TOKENS = 8_192
+
+# 로컬 모델이 아닌 엔진은 컨텍스트가 충분해도 이보다 길면 나눠서 병렬로 처리한다
+# (긴 입력 한 번보다 짧은 입력 여러 개를 동시에 보내는 쪽이 빨리 끝남)
+_MAX_SINGLE_PASS_TOKENS = 32_000
+_MAX_CHUNK_TOKENS = 12_000
+_LOCAL_ENGINES = ("ollama", "custom")
+
+# 응답(요약/노트)이 들어갈 자리
+_MAX_OUTPUT_RESERVE_TOKENS = 8_192
+# 프롬프트가 길어 예산이 거의 남지 않아도 이보다 작게 자르지는 않는다
+_MIN_BUDGET_TOKENS = 512
+# 노트를 다시 묶는 단계의 최대 횟수 (줄어들지 않는 경우 무한 반복 방지)
+MAX_LEVELS = 3
+
+# 문장 끝: 마침표/물음표/느낌표 뒤 공백, 또는 줄바꿈
+_SENTENCE_END = re.compile(r"(?<=[.!?。？！])\s+|\n+")
+
+
+class ContextLengthError(ValueError):
+    """요약 요청이 모델 컨텍스트 길이를 넘는 경우 (API 호출 전에 거절)"""
+
+
+@dataclass(frozen=True)
+class ChunkBudget:
+    single_pass: int  # 텍스트가 이 토큰 수 이하면 한 번에 요약
+    chunk: int        # map 구간 하나의 최대 토큰 수
+
+
+def context_tokens(engine: str, model_name: str = None, override: int = 0) -> int:
+    """엔진/모델의 컨텍스트 길이 (override > 0이면 그 값, 예: Ollama num_ctx를 늘린 경우)"""
+    if override and override > 0:
+        return int(override)
+    return MODEL_CONTEXT_TOKENS.get((engine, model_name)) or ENGINE_CONTEXT_TOKENS.get(engine, _DEFAULT_CONTEXT_TOKENS)
+
+
+def plan_budget(engine: str, model_name: str, prompt: str, map_prompt: str, override: int = 0) -> ChunkBudget:
+    """최종 요약 프롬프트(prompt)와 구간 정리 프롬프트(map_prompt) 길이를 빼고 남는 토큰 예산"""
+    context = context_tokens(engine, model_name, override)
+    available = context - min(_MAX_OUTPUT_RESERVE_TOKENS, context // 4)
+
+    single_pass = max(_MIN_BUDGET_TOKENS, available - count_tokens(prompt, engine, model_name))
+    chunk = max(_MIN_BUDGET_TOKENS, available - count_tokens(map_prompt, engine, model_name))
+    if engine not in _LOCAL_ENGINES:
+        single_pass = min(single_pass, _MAX_SINGLE_PASS_TOKENS)
+        chunk = min(chunk, _MAX_CHUNK_TOKENS)
+    return ChunkBudget(single_pass=single_pass, chunk=chunk)
+
+
+def split_sentences(text: str) -> List[str]:
+    """문장 단위로 나눈다 (뒤따르는 공백/줄바꿈을 포함하므로 이어 붙이면 원문과 같다)"""
+    sentences = []
+    start = 0
+    for match in _SENTENCE_END.finditer(text):
+        if match.end() > start:
+            sentences.append(text[start:match.end()])
+            start = match.end()
+    if start < len(text):
+        sentences.append(text[start:])
+    return [s for s in sentences if s.strip()]
+
+
+def split_into_chunks(text: str, max_tokens: int, count: Callable[[str], int] = count_tokens) -> List[str]:
+    """문장 경계에서 max_tokens 이하의 구간으로 나눈다 (count: 엔진 토크나이저 기준 토큰 수 함수).
+
+    문장 하나가 예산보다 길면(구두점 없는 STT 결과 등) 단어 경계에서 자른다.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for sentence in split_sentences(text):
+        sentence_tokens = count(sentence)
+        if sentence_tokens <= max_tokens:
+            pieces = [(sentence, sentence_tokens)]
+        else:
+            pieces = _split_words(sentence, sentence_tokens, max_tokens)
+        for piece, tokens in pieces:
+            if current and current_tokens + tokens > max_tokens:
+                chunks.append("".join(current).strip())
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += tokens
+    if current:
+        chunks.append("".join(current).strip())
+    return chunks
+
+
+def _split_words(sentence: str, sentence_tokens: int, max_tokens: int) -> List[tuple]:
+    # 단어마다 토큰을 세면 반올림 오차가 쌓이므로 문장 전체의 글자당 토큰 비율로 글자 수 예산을 정한다
+    tokens_per_char = sentence_tokens / len(sentence)
+    max_chars = max(1, int(max_tokens / tokens_per_char))
+    pieces: List[str] = []
+    words: List[str] = []
+    length = 0
+    for word in sentence.split():
+        if words and length + len(word) + 1 > max_chars:
+            pieces.append(" ".join(words) + " ")
+            words, length = [], 0
+        words.append(word)
+        length += len(word) + 1
+    if words:
+        pieces.append(" ".join(words) + " ")
+    return [(piece, math.ceil(len(piece) * tokens_per_char)) for piece in pieces]
+
+
+def join_notes(notes: List[str]) -> str:
+    """구간 노트를 순서대로 이어 붙인다 (구간 번호 표시)"""
+    return "\n\n".join(f"[구간 {i}/{len(notes)}]\n{note.strip()}" for i, note in enumerate(notes, 1))
@@ -1,14 +1,49 @@
+import asyncio
+import hashlib
+import math
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
+from src.summarize_pipeline.map_reduce import (
+    MAX_LEVELS, ContextLengthError, context_tokens, join_notes, plan_budget, split_into_chunks,
+)
+from src.summarize_pipeline.prompts import REDUCE_NOTICE, build_combine_prompt, build_map_prompt, chunk_header
 from src.summarize_pipeline.providers import create_provider
+from src.summarize_pipeline.rate_limit import get_limiter
+from src.summarize_pipeline.token_estimator import (
+    FINAL_OUTPUT_TOKENS, NOTE_OUTPUT_RATIO, SummaryEstimate, count_tokens, price_per_million, request_seconds,
+)
 
 try:
     from src.gui.core.file_manager import DEFAULT_PROMPT as _DEFAULT_PROMPT
 except ImportError:
     _DEFAULT_PROMPT = "다음 강의 내용을 한국어로 자세히 요약해주세요."
 
+# 요약 대신 외부 챗봇을 여는 엔진은 결과를 캐시하지 않음 (매번 클립보드 복사/브라우저 열기가 필요)
+_UNCACHED_ENGINES = ("clipboard",)
+# 외부 챗봇에 붙여넣는 엔진은 분할 요약/길이 검사를 하지 않음 (구간마다 사용자가 직접 붙여넣어야 하므로)
+_NO_MAP_REDUCE_ENGINES = ("clipboard",)
+# 컨텍스트 길이가 서버 설정에 달린 엔진은 한도를 넘어도 거절하지 않고 경고만 (추정한 한도가 틀릴 수 있음)
+_LOCAL_ENGINES = ("ollama", "custom")
+
+
+@dataclass
+class _SummaryJob:
+    """process/aprocess 한 번의 진행 상태"""
+    text_path: str
+    output_path: str
+    start_time: float
+    content: str = ""
+    cache: Optional[object] = None
+    cache_key: Optional[str] = None
+    summary: Optional[str] = None
+    from_cache: bool = False
+    streamed: bool = False  # on_chunk로 조각을 넘긴 적이 있음 (429 재시도 시 되돌리기 알림용)
+
 
 class SummarizePipeline:
     def __init__(
@@ -18,6 +53,11 @@ class SummarizePipeline:
         engine: str = "gemini",
         api_key: str = None,
         base_url: str = None,
+        use_cache: bool = False,
+        rate_limits: dict = None,
+        stream: bool = False,
+        map_reduce: bool = False,
+        context_tokens: int = 0,
     ):
         self.downloads_dir = None  # 다운로드 경로는 나중에 설정됨
         self.model_name = model_name
@@ -25,35 +65,317 @@ class SummarizePipeline:
         self.engine = engine
         self.api_key = api_key
         self.base_url = base_url
+        # 같은 텍스트 + 같은 프롬프트 + 같은 엔진/모델이면 이전 요약 재사용 (API 재호출/재과금 방지)
+        self.use_cache = use_cache
+        # 엔진별 동시 요청 수/RPM/TPM 제한 (같은 엔진을 쓰는 모든 파이프라인이 공유)
+        self._limiter = get_limiter(engine, model_name, rate_limits)
+        # aprocess에서 요약을 생성되는 대로 _summarized.txt에 이어 쓰기
+        self.stream = stream
+        # 모델 컨텍스트 예산을 넘는 긴 텍스트는 구간별로 나눠 정리한 뒤 최종 요약 (map-reduce)
+        self.map_reduce = map_reduce
+        # 컨텍스트 길이 직접 지정 (0 = 엔진/모델 기본값, 예: Ollama num_ctx를 늘린 경우)
+        self.context_tokens = context_tokens
+        self._estimates = {}  # 텍스트 sha256 → SummaryEstimate
+
+    @property
+    def max_concurrency(self) -> int:
+        """이 엔진에 동시에 보낼 수 있는 요약 요청 수"""
+        return self._limiter.limits.concurrency
+
+    def process(self, text_path: str, use_cache: bool = None) -> str:
+        """텍스트 요약 (use_cache=False면 이번 호출만 캐시를 건너뛰고 새로 요약)"""
+        job = self._begin(text_path, use_cache, self.downloads_dir)
+        if job.summary is None:
+            print(f"[INFO] 요약 예상: {self.estimate_content(job.content).describe()}")
+            provider = self._create_provider()
+            text = self._reduce_input(provider, job.content)
+            tokens = self._check_context(text)
+            job.summary = self._limiter.call(provider.summarize, text, self.prompt, tokens=tokens)
+            self._log_usage(provider)
+        return self._finish(job)
+
+    async def aprocess(self, text_path: str, use_cache: bool = None, on_chunk=None) -> str:
+        """process의 async 버전. 여러 강의를 하나의 이벤트 루프에서 동시에 요약할 때 사용.
+
+        stream=True면 생성되는 조각을 바로 결과 파일에 이어 쓰고 on_chunk(조각)으로도 넘긴다.
+        429 재시도로 처음부터 다시 받을 때는 먼저 on_chunk(None)을 보내 지금까지 넘긴 조각을 버리게 한다.
+        예상 토큰/비용은 출력하지 않는다 (필요하면 호출 측에서 estimate()로 얻어 표시).
+        파일 읽기/쓰기와 캐시 조회는 스레드에서 해서 다른 강의의 요약 스트림을 막지 않는다.
+        """
+        # 첫 await 전에 읽는다 — 같은 루프에서 동시에 도는 다른 요약이 downloads_dir을 바꿀 수 있음
+        output_dir = self.downloads_dir
+        job = await asyncio.to_thread(self._begin, text_path, use_cache, output_dir)
+        if job.summary is None:
+            provider = self._create_provider()
+            text = await self._areduce_input(provider, job.content)
+            tokens = self._check_context(text)
+            if self.stream:
+                job.summary = await self._limiter.acall(
+                    self._stream_to_file, provider, job, text, on_chunk, tokens=tokens)
+            else:
+                job.summary = await self._limiter.acall(
+                    provider.asummarize, text, self.prompt, tokens=tokens)
+            self._log_usage(provider)
+        return await asyncio.to_thread(self._finish, job)
+
+    # ── 긴 텍스트 분할 요약 (map-reduce) ──────────────────────
+
+    def _reduce_input(self, provider, content: str) -> str:
+        """최종 요약에 넣을 텍스트. 예산을 넘으면 구간 노트를 동시에 만들어 줄인다 (짧으면 원문 그대로)."""
+        level = 0
+        while requests := self._map_requests(content, level):
+            def summarize_chunk(request):
+                chunk, prompt = request
+                return self._limiter.call(provider.summarize, chunk, prompt, tokens=self._count_tokens(prompt + chunk))
+
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(requests))) as executor:
+                notes = list(executor.map(summarize_chunk, requests))
+            content = join_notes(notes)
+            level += 1
+        return content if level == 0 else f"{REDUCE_NOTICE}\n\n{content}"
+
+    async def _areduce_input(self, provider, content: str) -> str:
+        """_reduce_input의 async 버전 (구간 요청을 이벤트 루프에서 동시에 보냄)"""
+        level = 0
+        while requests := self._map_requests(content, level):
+            notes = await asyncio.gather(*(
+                self._limiter.acall(provider.asummarize, chunk, prompt, tokens=self._count_tokens(prompt + chunk))
+                for chunk, prompt in requests
+            ))
+            content = join_notes(notes)
+            level += 1
+        return content if level == 0 else f"{REDUCE_NOTICE}\n\n{content}"
+
+    def _can_map_reduce(self, level: int = 0) -> bool:
+        return self.map_reduce and self.engine not in _NO_MAP_REDUCE_ENGINES and level < MAX_LEVELS
+
+    def _budget(self):
+        return plan_budget(self.engine, self.model_name, self.prompt, build_map_prompt(), self.context_tokens)
+
+    def _map_requests(self, content: str, level: int) -> list:
+        """이번 단계에서 보낼 (구간, 프롬프트) 목록. 한 번에 최종 요약할 수 있으면 빈 목록."""
+        if not self._can_map_reduce(level):
+            return []
+        budget = self._budget()
+        tokens = self._count_tokens(content)
+        if tokens <= budget.single_pass:
+            return []
+        chunks = split_into_chunks(content, budget.chunk, self._count_tokens)
+        if len(chunks) < 2:
+            return []
+
+        prompt = build_map_prompt() if level == 0 else build_combine_prompt()
+        print(f"[INFO] 긴 텍스트 분할 요약 ({level + 1}단계): 약 {tokens} 토큰 → {len(chunks)}개 구간 "
+              f"(구간당 최대 {budget.chunk} 토큰)")
+        return [(f"{chunk_header(i, len(chunks))}\n{chunk}", prompt) for i, chunk in enumerate(chunks, 1)]
+
+    # ── 토큰 수 / 예상 비용 ────────────────────────────────
+
+    @staticmethod
+    def _log_usage(provider):
+        """분할 요약처럼 요청이 여러 번이면 강의 하나의 토큰 사용량 합계를 출력 (요청별 사용량은 Provider가 출력)"""
+        history = getattr(provider, "usage_history", None) or []
+        if len(history) < 2:
+            return
+        input_tokens = sum(u.input_tokens for u in history)
+        cached_tokens = sum(u.cached_tokens for u in history)
+        hit_rate = cached_tokens / input_tokens if input_tokens else 0.0
+        print(f"[INFO] 요청 {len(history)}회 토큰 합계: 입력 {input_tokens:,} "
+              f"(프롬프트 캐시 적중 {cached_tokens:,}, {hit_rate:.0%}) · 출력 {sum(u.output_tokens for u in history):,}")
+
+    def _count_tokens(self, text: str) -> int:
+        return count_tokens(text, self.engine, self.model_name)
+
+    def _check_context(self, text: str) -> int:
+        """최종 요약 요청을 보내기 전 길이 검사. 프롬프트를 포함한 요청 토큰 수를 반환한다."""
+        tokens = self._count_tokens(self.prompt) + self._count_tokens(text)
+        if self.engine in _NO_MAP_REDUCE_ENGINES:
+            return tokens
+        limit = context_tokens(self.engine, self.model_name, self.context_tokens)
+        if tokens <= limit:
+            return tokens
+        message = f"요약 요청이 모델 한도를 넘습니다: 약 {tokens:,} 토큰 (한도 {limit:,} 토큰)"
+        if self.engine in _LOCAL_ENGINES:
+            print(f"[WARN] {message} — 서버가 앞부분을 잘라낼 수 있습니다")
+            return tokens
+        hint = "" if self.map_reduce else " — 긴 텍스트 분할 요약(summary_map_reduce)을 켜거나"
+        raise ContextLengthError(f"{message}{hint} 컨텍스트가 더 큰 모델을 선택하세요")
 
-    def process(self, text_path: str) -> str:
-        """텍스트 요약"""
+    def estimate(self, text_path: str) -> SummaryEstimate:
+        """요약 전에 토큰 수/요청 수/예상 비용/예상 시간을 계산한다 (같은 텍스트는 캐시)"""
+        with open(text_path, "r", encoding="utf-8") as f:
+            content = f.read()
+        return self.estimate_content(content)
+
+    def estimate_content(self, content: str) -> SummaryEstimate:
+        key = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        if key not in self._estimates:
+            self._estimates[key] = self._estimate(content)
+        return self._estimates[key]
+
+    def _estimate(self, content: str) -> SummaryEstimate:
+        """_reduce_input과 같은 계획(단계별 구간 수)을 따라 요청 수와 토큰 수를 합산한다"""
+        input_tokens = self._count_tokens(content)
+        prompt_tokens = self._count_tokens(self.prompt)
+        map_prompt_tokens = self._count_tokens(build_map_prompt())
+        budget = self._budget()
+
+        requests = request_tokens = output_tokens = first_chunks = 0
+        seconds = 0.0
+        text_tokens, level = input_tokens, 0
+        while self._can_map_reduce(level) and text_tokens > budget.single_pass:
+            if level == 0:
+                n = len(split_into_chunks(content, budget.chunk, self._count_tokens))
+            else:
+                n = math.ceil(text_tokens / budget.chunk)
+            if n < 2:
+                break
+            chunk_in = text_tokens / n
+            chunk_out = chunk_in * NOTE_OUTPUT_RATIO
+            requests += n
+            request_tokens += text_tokens + n * map_prompt_tokens
+            output_tokens += n * chunk_out
+            # 동시 요청 수만큼씩 묶여서 진행
+            seconds += math.ceil(n / self.max_concurrency) * request_seconds(
+                self.engine, chunk_in + map_prompt_tokens, chunk_out)
+            first_chunks = first_chunks or n
+            text_tokens, level = n * chunk_out, level + 1
+
+        requests += 1
+        request_tokens += text_tokens + prompt_tokens
+        output_tokens += FINAL_OUTPUT_TOKENS
+        seconds += request_seconds(self.engine, text_tokens + prompt_tokens, FINAL_OUTPUT_TOKENS)
+
+        price = price_per_million(self.engine, self.model_name)
+        cost = None if price is None else (request_tokens * price[0] + output_tokens * price[1]) / 1_000_000
+        return SummaryEstimate(
+            input_tokens=input_tokens,
+            request_tokens=int(request_tokens),
+            output_tokens=int(output_tokens),
+            requests=requests,
+            chunks=first_chunks,
+            seconds=seconds,
+            cost_usd=cost,
+            context_tokens=context_tokens(self.engine, self.model_name, self.context_tokens),
+        )
+
+    async def _stream_to_file(self, provider, job: "_SummaryJob", text: str, on_chunk) -> str:
+        """스트리밍 조각을 결과 파일에 바로 이어 쓰고 전체 요약을 반환 (실패 시 쓰다 만 파일 삭제)
+
+        파일 쓰기는 스레드에서 한다. 쓰는 동안 도착한 조각은 모아 두었다가 다음 쓰기에 한 번에 넘기므로
+        쓰기는 항상 하나만 진행되고 순서가 유지된다.
+        """
+        parts = []
+        pending = []
+        writing = None
+        first_chunk_at = None
+
+        def write(f, data: str):
+            f.write(data)
+            f.flush()
+
+        # 429 재시도 시 다시 호출되므로 매번 처음부터 쓴다 (받는 쪽도 이전 시도의 조각을 버림)
+        if on_chunk is not None and job.streamed:
+            on_chunk(None)
+            job.streamed = False
+        f = await asyncio.to_thread(open, job.output_path, "w", encoding="utf-8")
+        try:
+            async for chunk in provider.astream(text, self.prompt):
+                if first_chunk_at is None:
+                    first_chunk_at = time.time()
+                    print(f"[INFO] 첫 요약 출력까지 {first_chunk_at - job.start_time:.1f}초")
+                parts.append(chunk)
+                pending.append(chunk)
+                if writing is None or writing.done():
+                    if writing is not None:
+                        writing.result()
+                    writing = asyncio.ensure_future(asyncio.to_thread(write, f, "".join(pending)))
+                    pending.clear()
+                if on_chunk is not None:
+                    on_chunk(chunk)
+                    job.streamed = True
+            if writing is not None:
+                await writing
+            if pending:
+                await asyncio.to_thread(write, f, "".join(pending))
+        except BaseException:
+            if writing is not None:
+                # 진행 중인 쓰기가 끝나야 파일을 닫고 지울 수 있다
+                await asyncio.gather(writing, return_exceptions=True)
+            await asyncio.to_thread(self._discard_partial, f, job.output_path)
+            raise
+        await asyncio.to_thread(f.close)
+        return "".join(parts)
+
+    @staticmethod
+    def _discard_partial(f, path: str):
+        f.close()
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _create_provider(self):
+        return create_provider(self.engine, api_key=self.api_key, model_name=self.model_name, base_url=self.base_url)
+
+    def _begin(self, text_path: str, use_cache, output_dir: str) -> "_SummaryJob":
+        """텍스트를 읽고 캐시를 확인한다 (캐시 적중 시 job.summary가 채워져 있음)"""
         # 파일명 추출
         filename = Path(text_path).stem
-        output_path = os.path.join(self.downloads_dir, f"{filename}_summarized.txt")
-        os.makedirs(self.downloads_dir, exist_ok=True)
+        output_path = os.path.join(output_dir, f"{filename}_summarized.txt")
+        os.makedirs(output_dir, exist_ok=True)
 
         print(f"[INFO] 요약 시작: {text_path}")
-        start_time = time.time()
+        job = _SummaryJob(text_path=text_path, output_path=output_path, start_time=time.time())
 
         # 텍스트 파일 읽기
         with open(text_path, "r", encoding="utf-8") as f:
-            content = f.read()
+            job.content = f.read()
+
+        job.cache = self._summary_cache(self.use_cache if use_cache is None else use_cache)
+        if job.cache is not None:
+            job.cache_key = self._cache_key(job.content)
+            cached = job.cache.get(job.cache_key)
+            if cached is not None:
+                job.summary = cached["summary"]
+                job.from_cache = True
+                print(f"[INFO] 캐시된 요약 재사용 (원본: {cached.get('source', '?')})")
+        return job
 
-        # Provider를 통해 요약 생성
-        provider = create_provider(self.engine, api_key=self.api_key, model_name=self.model_name, base_url=self.base_url)
-        summary = provider.summarize(content, self.prompt)
+    def _finish(self, job: "_SummaryJob") -> str:
+        if job.cache is not None and not job.from_cache:
+            job.cache.put(job.cache_key, {
+                "summary": job.summary,
+                "source": Path(job.text_path).name,
+                "engine": self.engine,
+                "model_name": self.model_name,
+            })
 
         end_time = time.time()
-        print(f"[INFO] 요약 완료: {summary}")
-        print(f"[INFO] 총 소요 시간: {end_time - start_time}초")
+        print(f"[INFO] 요약 완료: {job.summary}")
+        print(f"[INFO] 총 소요 시간: {end_time - job.start_time}초")
+
+        with open(job.output_path, 'w', encoding='utf-8') as f:
+            f.write(job.summary)
+
+        print(f"[INFO] 요약 저장 완료: {job.output_path}")
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(summary)
+        return job.output_path
 
-        print(f"[INFO] 요약 저장 완료: {output_path}")
+    def _summary_cache(self, enabled: bool):
+        if not enabled or self.engine in _UNCACHED_ENGINES:
+            return None
+        from src.result_cache import get_cache
+        return get_cache("summaries")
 
-        return output_path
+    def _cache_key(self, content: str) -> str:
+        """(텍스트 sha256, 프롬프트 sha256, 엔진, 모델) 캐시 키. 로컬/커스텀 서버는 주소도 구분."""
+        from src.result_cache import make_key
+        return make_key(
+            hashlib.sha256(content.encode("utf-8")).hexdigest(),
+            hashlib.sha256(self.prompt.encode("utf-8")).hexdigest(),
+            self.engine, self.model_name, self.base_url,
+        )
 
 
 if __name__ == "__main__":
@@ -255,3 +255,48 @@ DEFAULT_PROMPT = build_prompt(
     mode=SummaryMode.NORMAL,
     subject_category="자동 감지",
 )
+
+
+# ────────────────────────────────────────
+# 긴 강의 분할 요약 (map-reduce, summarize_pipeline/map_reduce.py)
+# ────────────────────────────────────────
+
+# 구간 번호는 텍스트 앞에 붙인다 (프롬프트를 모든 구간에서 똑같이 유지해야 프롬프트 캐시가 적중함)
+
+def build_map_prompt() -> str:
+    """강의 원문 구간 하나를 정리하는 프롬프트 (최종 요약은 사용자가 고른 모드로 따로 생성)"""
+    return f"""당신은 대학 강의 노트 정리 전문가입니다.
+아래는 한국어 강의를 STT로 변환한 원문 중 한 구간입니다 (텍스트 맨 앞에 몇 번째 구간인지 표시).
+
+{_STT_CORRECTION_GUIDE}
+
+## 정리 목표
+이 노트는 나중에 다른 구간의 노트와 합쳐 강의 전체 요약을 만드는 데 쓰입니다.
+요약하며 버리지 말고, 이 구간에서 다룬 내용을 **빠짐없이** 정리하세요.
+- 개념, 정의, 공식, 예시, 교수님이 강조한 내용(시험/과제 언급 포함)을 순서대로 bullet로 정리
+- 앞 구간에서 이어지거나 다음 구간으로 이어지는 설명은 그대로 남기기
+- 인사말, 잡담, 반복 설명은 생략
+- 교정한 주요 용어는 마지막 줄에 "STT 보정:"으로 기록
+"""
+
+
+def build_combine_prompt() -> str:
+    """구간 노트가 너무 많을 때 인접한 노트를 하나로 합치는 프롬프트"""
+    return """당신은 대학 강의 노트 정리 전문가입니다.
+아래는 긴 강의를 구간별로 정리한 노트 묶음 중 하나입니다 (텍스트 맨 앞에 몇 번째 묶음인지 표시).
+
+## 정리 목표
+여러 구간 노트를 강의 순서대로 하나의 노트로 합치세요.
+- 중복된 내용은 한 번만 남기고, 개념/정의/공식/예시/강조 사항은 빠짐없이 유지
+- "STT 보정:" 항목은 합쳐서 마지막 줄에 기록
+"""
+
+
+def chunk_header(index: int, total: int) -> str:
+    return f"[전체 {total}개 중 {index}번째]"
+
+
+REDUCE_NOTICE = (
+    "(강의가 길어 STT 원문을 구간별로 먼저 정리한 노트입니다. "
+    "구간 순서대로 이어지는 하나의 강의이므로 노트 전체를 바탕으로 위 형식에 맞춰 최종 요약을 작성하세요.)"
+)
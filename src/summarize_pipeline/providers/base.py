@@ -2,17 +2,60 @@
 AI Provider 추상 인터페이스
 """
 
+import asyncio
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+
+def transcript_message(text: str) -> str:
+    """프롬프트 뒤에 붙는 가변 부분 (강의 텍스트)"""
+    return f"다음은 전체 텍스트입니다:\n{text}"
+
+
+@dataclass
+class TokenUsage:
+    """요청 한 번의 토큰 사용량"""
+    input_tokens: int = 0        # 입력 토큰 (프롬프트 캐시에서 읽은 토큰 포함)
+    cached_tokens: int = 0       # 그중 프롬프트 캐시 적중 토큰
+    output_tokens: int = 0
 
 
 class AIProvider(ABC):
     """AI 요약 엔진의 공통 인터페이스"""
 
+    # 마지막 요청의 토큰 사용량 (사용량을 알려주는 API만 채움)
+    last_usage: Optional[TokenUsage] = None
+
     @abstractmethod
     def summarize(self, text: str, prompt: str) -> str:
         """텍스트를 요약하여 반환"""
         pass
 
+    async def asummarize(self, text: str, prompt: str) -> str:
+        """summarize의 async 버전.
+
+        SDK의 async 클라이언트가 있는 Provider는 재정의한다.
+        기본 구현은 동기 summarize를 스레드에서 실행한다.
+        """
+        return await asyncio.to_thread(self.summarize, text, prompt)
+
+    async def astream(self, text: str, prompt: str) -> AsyncIterator[str]:
+        """요약을 생성되는 대로 조각 단위로 내보낸다.
+
+        스트리밍 API가 있는 Provider는 재정의한다. 기본 구현은 완성된 요약을 한 번에 내보낸다.
+        """
+        yield await self.asummarize(text, prompt)
+
+    def _record_usage(self, usage: TokenUsage):
+        """요청마다 사용량(프롬프트 캐시 적중 포함)을 기록하고 출력"""
+        self.last_usage = usage
+        if not hasattr(self, "usage_history"):
+            self.usage_history = []
+        self.usage_history.append(usage)
+        print(f"[INFO] 토큰 사용: 입력 {usage.input_tokens:,} (프롬프트 캐시 적중 {usage.cached_tokens:,}) "
+              f"· 출력 {usage.output_tokens:,}")
+
     @staticmethod
     @abstractmethod
     def default_model() -> str:
@@ -2,7 +2,7 @@
 Anthropic Claude AI Provider
 """
 
-from .base import AIProvider
+from .base import AIProvider, TokenUsage, transcript_message
 
 
 class ClaudeProvider(AIProvider):
@@ -12,16 +12,55 @@ class ClaudeProvider(AIProvider):
         from anthropic import Anthropic
         self.client = Anthropic(api_key=api_key)
         self.model_name = model_name or self.default_model()
+        self._async_client = None
 
     def summarize(self, text: str, prompt: str) -> str:
-        full_prompt = f"{prompt}\n\n다음은 전체 텍스트입니다:\n{text}"
-        message = self.client.messages.create(
-            model=self.model_name,
-            max_tokens=8192,
-            messages=[{"role": "user", "content": full_prompt}],
-        )
+        message = self.client.messages.create(**self._request(text, prompt))
+        self._record_usage(self._usage(message.usage))
+        return message.content[0].text
+
+    async def asummarize(self, text: str, prompt: str) -> str:
+        message = await self._get_async_client().messages.create(**self._request(text, prompt))
+        self._record_usage(self._usage(message.usage))
         return message.content[0].text
 
+    async def astream(self, text: str, prompt: str):
+        async with self._get_async_client().messages.stream(**self._request(text, prompt)) as stream:
+            async for chunk in stream.text_stream:
+                yield chunk
+            message = await stream.get_final_message()
+        self._record_usage(self._usage(message.usage))
+
+    def _request(self, text: str, prompt: str) -> dict:
+        """고정된 요약 프롬프트는 캐시 가능한 system 블록으로, 강의 텍스트는 user 메시지로 보낸다.
+
+        같은 프롬프트로 여러 강의/구간을 요약하면 두 번째 요청부터 프롬프트를 캐시에서 읽는다
+        (모델별 최소 길이보다 짧으면 캐시되지 않을 뿐 요청은 그대로 처리됨).
+        """
+        return {
+            "model": self.model_name,
+            "max_tokens": 8192,
+            "system": [{"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}}],
+            "messages": [{"role": "user", "content": transcript_message(text)}],
+        }
+
+    @staticmethod
+    def _usage(usage) -> TokenUsage:
+        # Anthropic의 input_tokens에는 캐시에서 읽거나 캐시에 쓴 토큰이 빠져 있다
+        cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+        return TokenUsage(
+            input_tokens=usage.input_tokens + cache_read + cache_write,
+            cached_tokens=cache_read,
+            output_tokens=usage.output_tokens,
+        )
+
+    def _get_async_client(self):
+        if self._async_client is None:
+            from anthropic import AsyncAnthropic
+            self._async_client = AsyncAnthropic(api_key=self.client.api_key)
+        return self._async_client
+
     @staticmethod
     def default_model() -> str:
         return "claude-sonnet-4-6"
@@ -2,7 +2,54 @@
 Google Gemini AI Provider
 """
 
-from .base import AIProvider
+import asyncio
+import hashlib
+import threading
+import time
+from typing import Optional
+
+from src.summarize_pipeline.token_estimator import count_tokens
+
+from .base import AIProvider, TokenUsage, transcript_message
+
+# 요약 프롬프트 캐시(cached content) 보관 시간 — 같은 실행에서 여러 강의/구간이 공유하기에 충분한 길이
+_PROMPT_CACHE_TTL_SEC = 600
+# 남은 시간이 이보다 짧은 캐시는 요청 도중 만료될 수 있으므로 새로 만든다
+_PROMPT_CACHE_MARGIN_SEC = 60
+# 명시적 캐시를 만들 수 있는 최소 토큰 수 (짧은 프롬프트는 system_instruction으로 보내 암시적 캐시에 맡김)
+_MIN_CACHE_TOKENS = {"gemini-2.5-pro": 4096}
+_DEFAULT_MIN_CACHE_TOKENS = 1024
+
+# (API 키 해시, 모델, 프롬프트 해시) → (캐시 이름 또는 None(생성 실패), 만료 시각)
+_prompt_caches = {}
+_prompt_caches_lock = threading.Lock()
+# 캐시 키별 생성 잠금 — 같은 프롬프트의 생성만 직렬화하고 다른 키/모델의 요청은 막지 않는다
+_prompt_cache_create_locks = {}
+
+
+def _fresh_prompt_cache(key: tuple):
+    """아직 충분히 남은 캐시 이름 (생성 실패로 기록된 키는 None). 없거나 곧 만료되면 False."""
+    with _prompt_caches_lock:
+        entry = _prompt_caches.get(key)
+    if entry is not None and entry[1] - time.time() > _PROMPT_CACHE_MARGIN_SEC:
+        return entry[0]
+    return False
+
+
+def _is_missing_cache_error(e: Exception) -> bool:
+    """서버에서 cached content가 만료/삭제되어 찾을 수 없다는 오류인지 판별
+
+    google-genai는 없는 캐시를 404(또는 권한 없음 403)로 알려준다. 인증 실패, 400(입력이 너무 긺 등),
+    5xx, 타임아웃은 캐시 없이 다시 보내도 똑같이 실패하므로 여기에 해당하지 않는다.
+    """
+    try:
+        from google.genai import errors
+    except ImportError:
+        return False
+    if not isinstance(e, errors.ClientError) or getattr(e, "code", None) not in (403, 404):
+        return False
+    message = str(e).lower()
+    return "cachedcontent" in message or "cached content" in message or "cachedcontents/" in message
 
 
 class GeminiProvider(AIProvider):
@@ -12,15 +59,123 @@ class GeminiProvider(AIProvider):
         from google import genai
         self._client = genai.Client(api_key=api_key)
         self._model_name = model_name or self.default_model()
+        self._api_key_hash = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()
 
     def summarize(self, text: str, prompt: str) -> str:
-        full_prompt = f"{prompt}\n\n다음은 전체 텍스트입니다:\n{text}"
-        response = self._client.models.generate_content(
-            model=self._model_name,
-            contents=full_prompt,
-        )
+        cache_name = self._prompt_cache_name(prompt)
+        try:
+            response = self._client.models.generate_content(
+                model=self._model_name, contents=transcript_message(text), config=self._config(prompt, cache_name))
+        except Exception as e:
+            if cache_name is None or not _is_missing_cache_error(e):
+                raise
+            self._drop_prompt_cache(prompt)
+            response = self._client.models.generate_content(
+                model=self._model_name, contents=transcript_message(text), config=self._config(prompt, None))
+        self._record_usage(self._usage(response.usage_metadata))
         return response.text
 
+    async def asummarize(self, text: str, prompt: str) -> str:
+        cache_name = await asyncio.to_thread(self._prompt_cache_name, prompt)
+        try:
+            response = await self._client.aio.models.generate_content(
+                model=self._model_name, contents=transcript_message(text), config=self._config(prompt, cache_name))
+        except Exception as e:
+            if cache_name is None or not _is_missing_cache_error(e):
+                raise
+            self._drop_prompt_cache(prompt)
+            response = await self._client.aio.models.generate_content(
+                model=self._model_name, contents=transcript_message(text), config=self._config(prompt, None))
+        self._record_usage(self._usage(response.usage_metadata))
+        return response.text
+
+    async def astream(self, text: str, prompt: str):
+        cache_name = await asyncio.to_thread(self._prompt_cache_name, prompt)
+        try:
+            stream = await self._client.aio.models.generate_content_stream(
+                model=self._model_name, contents=transcript_message(text), config=self._config(prompt, cache_name))
+        except Exception as e:
+            if cache_name is None or not _is_missing_cache_error(e):
+                raise
+            self._drop_prompt_cache(prompt)
+            stream = await self._client.aio.models.generate_content_stream(
+                model=self._model_name, contents=transcript_message(text), config=self._config(prompt, None))
+        usage = None
+        async for chunk in stream:
+            if chunk.text:
+                yield chunk.text
+            usage = chunk.usage_metadata or usage
+        if usage is not None:
+            self._record_usage(self._usage(usage))
+
+    # ── 프롬프트 캐시 (cached content) ─────────────────────
+
+    @staticmethod
+    def _config(prompt: str, cache_name: Optional[str]):
+        """캐시가 있으면 캐시된 프롬프트를, 없으면 system_instruction으로 프롬프트를 붙인다"""
+        from google.genai import types
+        if cache_name:
+            return types.GenerateContentConfig(cached_content=cache_name)
+        return types.GenerateContentConfig(system_instruction=prompt)
+
+    def _prompt_cache_key(self, prompt: str) -> tuple:
+        return (self._api_key_hash, self._model_name, hashlib.sha256(prompt.encode("utf-8")).hexdigest())
+
+    def _prompt_cache_name(self, prompt: str) -> Optional[str]:
+        """요약 프롬프트를 담은 cached content 이름 (없으면 만든다). 만들 수 없으면 None.
+
+        같은 프롬프트로 요약하는 모든 강의/구간이 하나의 캐시를 공유하도록 생성을 캐시 키별로 직렬화한다.
+        네트워크 호출 동안에는 공용 잠금을 잡지 않으므로 다른 키/모델의 요청은 기다리지 않는다.
+        """
+        if count_tokens(prompt, "gemini", self._model_name) < _MIN_CACHE_TOKENS.get(
+                self._model_name, _DEFAULT_MIN_CACHE_TOKENS):
+            return None
+
+        key = self._prompt_cache_key(prompt)
+        name = _fresh_prompt_cache(key)
+        if name is not False:
+            return name
+
+        with _prompt_caches_lock:
+            create_lock = _prompt_cache_create_locks.setdefault(key, threading.Lock())
+        with create_lock:
+            # 기다리는 동안 다른 요청이 만들었으면 그것을 쓴다
+            name = _fresh_prompt_cache(key)
+            if name is not False:
+                return name
+
+            from google.genai import types
+            try:
+                cache = self._client.caches.create(
+                    model=self._model_name,
+                    config=types.CreateCachedContentConfig(
+                        system_instruction=prompt,
+                        ttl=f"{_PROMPT_CACHE_TTL_SEC}s",
+                        display_name="lms-summarizer-prompt",
+                    ),
+                )
+                name = cache.name
+            except Exception as e:
+                # 캐시를 지원하지 않는 모델/등급 — 이번 TTL 동안은 다시 시도하지 않는다
+                print(f"[WARN] Gemini 프롬프트 캐시를 만들 수 없어 일반 요청으로 보냅니다: {e}")
+                name = None
+            with _prompt_caches_lock:
+                _prompt_caches[key] = (name, time.time() + _PROMPT_CACHE_TTL_SEC)
+            return name
+
+    def _drop_prompt_cache(self, prompt: str):
+        """서버에서 이미 만료/삭제된 캐시 — 다음 요청에서 새로 만들도록 지운다"""
+        with _prompt_caches_lock:
+            _prompt_caches.pop(self._prompt_cache_key(prompt), None)
+
+    @staticmethod
+    def _usage(usage) -> TokenUsage:
+        return TokenUsage(
+            input_tokens=getattr(usage, "prompt_token_count", None) or 0,
+            cached_tokens=getattr(usage, "cached_content_token_count", None) or 0,
+            output_tokens=getattr(usage, "candidates_token_count", None) or 0,
+        )
+
     @staticmethod
     def default_model() -> str:
         return "gemini-2.5-flash"
@@ -22,6 +22,7 @@ class OllamaProvider(AIProvider):
             base_url=self._base_url,
         )
         self.model_name = model_name or self.default_model()
+        self._async_client = None
 
     def summarize(self, text: str, prompt: str) -> str:
         full_prompt = f"{prompt}\n\n다음은 전체 텍스트입니다:\n{text}"
@@ -31,6 +32,31 @@ class OllamaProvider(AIProvider):
         )
         return response.choices[0].message.content
 
+    async def asummarize(self, text: str, prompt: str) -> str:
+        full_prompt = f"{prompt}\n\n다음은 전체 텍스트입니다:\n{text}"
+        response = await self._get_async_client().chat.completions.create(
+            model=self.model_name,
+            messages=[{"role": "user", "content": full_prompt}],
+        )
+        return response.choices[0].message.content
+
+    async def astream(self, text: str, prompt: str):
+        full_prompt = f"{prompt}\n\n다음은 전체 텍스트입니다:\n{text}"
+        stream = await self._get_async_client().chat.completions.create(
+            model=self.model_name,
+            messages=[{"role": "user", "content": full_prompt}],
+            stream=True,
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def _get_async_client(self):
+        if self._async_client is None:
+            from openai import AsyncOpenAI
+            self._async_client = AsyncOpenAI(api_key=self.client.api_key, base_url=self.client.base_url)
+        return self._async_client
+
     @staticmethod
     def default_model() -> str:
         return "qwen2.5:7b"
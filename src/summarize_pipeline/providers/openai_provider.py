@@ -2,7 +2,7 @@
 OpenAI AI Provider
 """
 
-from .base import AIProvider
+from .base import AIProvider, TokenUsage, transcript_message
 
 
 class OpenAIProvider(AIProvider):
@@ -12,15 +12,64 @@ class OpenAIProvider(AIProvider):
         from openai import OpenAI
         self.client = OpenAI(api_key=api_key)
         self.model_name = model_name or self.default_model()
+        self._async_client = None
 
     def summarize(self, text: str, prompt: str) -> str:
-        full_prompt = f"{prompt}\n\n다음은 전체 텍스트입니다:\n{text}"
         response = self.client.chat.completions.create(
             model=self.model_name,
-            messages=[{"role": "user", "content": full_prompt}],
+            messages=self._messages(text, prompt),
         )
+        self._record_usage(self._usage(response.usage))
         return response.choices[0].message.content
 
+    async def asummarize(self, text: str, prompt: str) -> str:
+        response = await self._get_async_client().chat.completions.create(
+            model=self.model_name,
+            messages=self._messages(text, prompt),
+        )
+        self._record_usage(self._usage(response.usage))
+        return response.choices[0].message.content
+
+    async def astream(self, text: str, prompt: str):
+        stream = await self._get_async_client().chat.completions.create(
+            model=self.model_name,
+            messages=self._messages(text, prompt),
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+            if chunk.usage:
+                # 사용량은 choices가 빈 마지막 조각에 들어 있다
+                self._record_usage(self._usage(chunk.usage))
+
+    @staticmethod
+    def _messages(text: str, prompt: str) -> list:
+        """고정된 요약 프롬프트를 system 메시지로 앞에 두고 강의 텍스트를 뒤에 붙인다.
+
+        OpenAI는 1024토큰 이상 같은 앞부분(prefix)을 자동으로 캐시한다 — 프롬프트가 맨 앞에 고정돼 있어야 적중한다.
+        """
+        return [
+            {"role": "system", "content": prompt},
+            {"role": "user", "content": transcript_message(text)},
+        ]
+
+    @staticmethod
+    def _usage(usage) -> TokenUsage:
+        details = getattr(usage, "prompt_tokens_details", None)
+        return TokenUsage(
+            input_tokens=usage.prompt_tokens,
+            cached_tokens=getattr(details, "cached_tokens", None) or 0,
+            output_tokens=usage.completion_tokens,
+        )
+
+    def _get_async_client(self):
+        if self._async_client is None:
+            from openai import AsyncOpenAI
+            self._async_client = AsyncOpenAI(api_key=self.client.api_key, base_url=self.client.base_url)
+        return self._async_client
+
     @staticmethod
     def default_model() -> str:
         return "gpt-5.4"
@@ -0,0 +1,243 @@
+"""요약 API 호출 속도 제한 (엔진별 동시 요청 수 + 토큰 버킷 + 429 적응형 대기)
+
+여러 강의를 동시에 요약하면 API 제한(분당 요청 수 RPM, 분당 토큰 수 TPM)에 금방 걸린다.
+엔진마다 RateLimiter 하나를 프로세스 전체에서 공유하고, 모든 summarize 호출은
+limiter.call() (async 요약은 limiter.acall())을 거친다.
+
+- 동시 요청 수: 세마포어 (async 요청은 이벤트 루프별 asyncio.Semaphore에서 차례를 기다린 뒤 가져감)
+- RPM / TPM: 토큰 버킷 (1분에 걸쳐 고르게 충전)
+- 429 응답: 같은 엔진의 모든 요청을 잠시 멈추고(Retry-After 우선) 지수적으로 대기를 늘린다.
+  성공하면 대기 시간을 초기화한다.
+
+기본값은 각 서비스의 무료/최저 등급 기준이며 settings.json의 summary_rate_limits로 바꿀 수 있다.
+"""
+import asyncio
+import random
+import re
+import threading
+import time
+import weakref
+from dataclasses import dataclass, replace
+from typing import Callable, Optional
+
+
+@dataclass(frozen=True)
+class RateLimits:
+    concurrency: int       # 동시에 보낼 수 있는 요청 수
+    rpm: float = 0         # 분당 요청 수 (0 = 제한 없음)
+    tpm: float = 0         # 분당 입력 토큰 수 (0 = 제한 없음)
+
+
+# 엔진 기본 제한 (무료/Tier 1 기준 — 유료 등급이면 settings.json에서 올릴 것)
+ENGINE_LIMITS = {
+    "gemini": RateLimits(concurrency=4, rpm=10, tpm=250_000),
+    "openai": RateLimits(concurrency=4, rpm=500, tpm=30_000),
+    "claude": RateLimits(concurrency=4, rpm=50, tpm=30_000),
+    "grok": RateLimits(concurrency=4, rpm=60, tpm=100_000),
+    "ollama": RateLimits(concurrency=1),   # 로컬 GPU 하나 — 동시 요청은 느려지기만 함
+    "custom": RateLimits(concurrency=2),
+    "clipboard": RateLimits(concurrency=1),
+}
+
+# 같은 엔진이라도 모델별로 제한이 다른 경우 (Gemini 무료 등급)
+MODEL_LIMITS = {
+    ("gemini", "gemini-2.5-pro"): RateLimits(concurrency=2, rpm=5, tpm=250_000),
+    ("gemini", "gemini-2.5-flash-lite"): RateLimits(concurrency=4, rpm=15, tpm=250_000),
+}
+
+_DEFAULT_LIMITS = RateLimits(concurrency=2)
+_MAX_RETRIES = 5
+_BASE_BACKOFF_SEC = 2.0
+_MAX_BACKOFF_SEC = 60.0
+
+
+class TokenBucket:
+    """capacity만큼 쌓이고 초당 rate씩 충전되는 버킷. acquire(n)은 n만큼 찰 때까지 기다린다."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self._tokens = per_minute
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1):
+        while True:
+            wait = self._reserve(amount)
+            if wait <= 0:
+                return
+            time.sleep(min(wait, 1.0))
+
+    async def aacquire(self, amount: float = 1):
+        while True:
+            wait = self._reserve(amount)
+            if wait <= 0:
+                return
+            await asyncio.sleep(min(wait, 1.0))
+
+    def _reserve(self, amount: float) -> float:
+        """amount만큼 꺼내면 0, 부족하면 더 기다려야 할 시간(초) 반환"""
+        # 한 요청이 버킷 전체보다 크면 가득 찼을 때 보낸다 (영원히 막히지 않도록)
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / self.rate
+
+
+class RateLimitedError(RuntimeError):
+    """429 재시도 횟수를 다 쓴 경우"""
+
+
+class RateLimiter:
+    def __init__(self, limits: RateLimits):
+        self.limits = limits
+        self._slots = threading.BoundedSemaphore(max(1, limits.concurrency))
+        # 이벤트 루프 → asyncio.Semaphore (async 요청이 폴링 없이 차례를 기다리는 곳)
+        self._loop_gates = weakref.WeakKeyDictionary()
+        self._requests = TokenBucket(limits.rpm) if limits.rpm > 0 else None
+        self._tokens = TokenBucket(limits.tpm) if limits.tpm > 0 else None
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self._backoff = _BASE_BACKOFF_SEC
+
+    def call(self, fn: Callable, *args, tokens: int = 1, on_log=None, **kwargs):
+        """속도 제한을 지키며 fn 호출. 429면 대기 후 재시도."""
+        for attempt in range(_MAX_RETRIES + 1):
+            with self._slots:
+                while self._pause_remaining() > 0:
+                    time.sleep(min(self._pause_remaining(), 1.0))
+                if self._requests:
+                    self._requests.acquire(1)
+                if self._tokens:
+                    self._tokens.acquire(tokens)
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as e:
+                    self._on_error(e, attempt, on_log)
+                    continue
+            self._reset_backoff()
+            return result
+
+    async def acall(self, fn: Callable, *args, tokens: int = 1, on_log=None, **kwargs):
+        """call()의 async 버전. fn은 코루틴 함수 (스레드를 붙잡지 않고 이벤트 루프에서 대기)."""
+        for attempt in range(_MAX_RETRIES + 1):
+            async with self._loop_gate():
+                await self._aacquire_slot()
+                try:
+                    while self._pause_remaining() > 0:
+                        await asyncio.sleep(min(self._pause_remaining(), 1.0))
+                    if self._requests:
+                        await self._requests.aacquire(1)
+                    if self._tokens:
+                        await self._tokens.aacquire(tokens)
+                    try:
+                        result = await fn(*args, **kwargs)
+                    except Exception as e:
+                        self._on_error(e, attempt, on_log)
+                        continue
+                finally:
+                    self._slots.release()
+            self._reset_backoff()
+            return result
+
+    def _loop_gate(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            gate = self._loop_gates.get(loop)
+            if gate is None:
+                gate = self._loop_gates[loop] = asyncio.Semaphore(max(1, self.limits.concurrency))
+            return gate
+
+    async def _aacquire_slot(self):
+        """공용 세마포어 슬롯을 가져온다. 루프별 gate를 통과했으므로 보통 바로 비어 있다."""
+        if self._slots.acquire(blocking=False):
+            return
+        # 동기 call()이나 다른 이벤트 루프가 슬롯을 쓰는 중 — 스레드에서 기다린다 (최대 concurrency개)
+        acquiring = asyncio.ensure_future(asyncio.to_thread(self._slots.acquire))
+        try:
+            await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            # 취소돼도 스레드는 결국 슬롯을 가져가므로 그때 돌려준다
+            acquiring.add_done_callback(lambda _: self._slots.release())
+            raise
+
+    def _on_error(self, e: Exception, attempt: int, on_log):
+        """429가 아니거나 재시도를 다 썼으면 예외를 올리고, 아니면 대기 시간을 정한다"""
+        if not is_rate_limit_error(e):
+            raise e
+        if attempt == _MAX_RETRIES:
+            raise RateLimitedError(f"API 사용량 제한으로 {_MAX_RETRIES}회 재시도 후 실패: {e}") from e
+        delay = self._pause(retry_after_seconds(e))
+        (on_log or print)(f"[WARN] API 사용량 제한(429) — {delay:.0f}초 후 재시도 ({attempt + 1}/{_MAX_RETRIES})")
+
+    def _pause_remaining(self) -> float:
+        with self._lock:
+            return self._paused_until - time.monotonic()
+
+    def _pause(self, retry_after: Optional[float]) -> float:
+        """같은 엔진의 모든 요청을 멈출 시간을 정한다 (동시에 받은 429는 한 번만 늘림)"""
+        with self._lock:
+            now = time.monotonic()
+            if self._paused_until > now:
+                return self._paused_until - now
+            delay = retry_after if retry_after else self._backoff * (1 + random.random() * 0.25)
+            self._backoff = min(_MAX_BACKOFF_SEC, self._backoff * 2)
+            self._paused_until = now + delay
+            return delay
+
+    def _reset_backoff(self):
+        with self._lock:
+            self._backoff = _BASE_BACKOFF_SEC
+
+
+def is_rate_limit_error(e: Exception) -> bool:
+    """SDK마다 다른 429 예외를 판별 (openai/anthropic: status_code, google-genai: code)
+
+    메시지는 상태 코드 429와 google-genai의 RESOURCE_EXHAUSTED만 본다 ("rate limit" 같은 문구는
+    일반 오류 메시지에도 나와 재시도할 필요 없는 오류를 429로 오인한다).
+    """
+    for attr in ("status_code", "code", "status"):
+        if getattr(e, attr, None) == 429:
+            return True
+    response = getattr(e, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    message = str(e)
+    return bool(re.search(r"\b429\b", message)) or "RESOURCE_EXHAUSTED" in message
+
+
+def retry_after_seconds(e: Exception) -> Optional[float]:
+    response = getattr(e, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        value = headers.get("retry-after")
+        return float(value) if value else None
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def resolve_limits(engine: str, model_name: str = None, overrides: dict = None) -> RateLimits:
+    limits = MODEL_LIMITS.get((engine, model_name)) or ENGINE_LIMITS.get(engine, _DEFAULT_LIMITS)
+    if overrides:
+        limits = replace(limits, **{k: v for k, v in overrides.items() if k in ("concurrency", "rpm", "tpm")})
+    return limits
+
+
+def get_limiter(engine: str, model_name: str = None, overrides: dict = None) -> RateLimiter:
+    """엔진/모델별 공용 RateLimiter (같은 API 키를 쓰는 모든 요약 호출이 제한을 공유)"""
+    limits = resolve_limits(engine, model_name, overrides)
+    key = (engine, model_name)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None or limiter.limits != limits:
+            limiter = _limiters[key] = RateLimiter(limits)
+        return limiter
@@ -0,0 +1,190 @@
+"""요약 요청 토큰 수 추정 (엔진 토크나이저 계열별) + 예상 비용/시간
+
+요약 API를 호출하기 전에 텍스트가 몇 토큰인지 알아야 분할 요약(map-reduce) 여부를 정하고,
+모델 한도를 넘는 요청을 미리 거절하고, 예상 비용/시간을 진행 로그에 보여줄 수 있다.
+
+토크나이저를 실제로 돌리지 않고 글자 종류별 비율로 센다 (한국어 강의 텍스트 기준 대략값).
+- 한글: 음절당 토큰 수가 토크나이저마다 크게 다르다 (어휘가 큰 Gemini/Gemma/EXAONE은 적고 Claude는 많음)
+- 영문/숫자: 4글자당 1토큰 정도
+- 구두점/기호/한자: 글자당 1토큰
+OpenAI 계열은 tiktoken이 설치돼 있으면 o200k_base로 정확히 센다.
+
+긴 텍스트(강의 전문, 구간 노트)의 결과는 내용 해시로 캐시한다 — 같은 텍스트를 분할 계획,
+속도 제한, 예상 비용 계산에서 여러 번 세기 때문.
+"""
+import hashlib
+import math
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+# 엔진 → 토크나이저 계열
+ENGINE_FAMILIES = {
+    "gemini": "gemini",
+    "openai": "openai",
+    "claude": "claude",
+    "grok": "grok",
+    "ollama": "llama",
+    "custom": "llama",
+    "clipboard": "openai",
+}
+
+# 로컬 모델은 모델 이름으로 계열을 고른다 (접두사 기준)
+_MODEL_FAMILY_PREFIXES = (
+    ("qwen", "qwen"),
+    ("gemma", "gemini"),
+    ("exaone", "exaone"),
+    ("llama", "llama"),
+)
+
+# 계열별 한글 음절당 토큰 수
+_HANGUL_TOKENS_PER_SYLLABLE = {
+    "gemini": 0.5,
+    "exaone": 0.5,
+    "openai": 0.7,
+    "qwen": 0.7,
+    "grok": 0.8,
+    "llama": 1.0,
+    "claude": 1.0,
+}
+_DEFAULT_HANGUL_TOKENS = 1.0
+_LATIN_CHARS_PER_TOKEN = 4
+
+_HANGUL = re.compile(r"[가-힣ㄱ-ㆎ]")
+_LATIN_RUN = re.compile(r"[A-Za-z0-9]+")
+_SYMBOL = re.compile(r"[^\sA-Za-z0-9가-힣ㄱ-ㆎ]")
+
+# 이 길이 이상인 텍스트만 캐시 (문장 단위 호출까지 해시하면 오히려 느림)
+_CACHE_MIN_CHARS = 4096
+_CACHE_MAX_ENTRIES = 256
+_cache: "OrderedDict[tuple, int]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+_tiktoken_encoding = None
+_tiktoken_failed = False
+
+
+def tokenizer_family(engine: str = None, model_name: str = None) -> str:
+    if engine in ("ollama", "custom") and model_name:
+        name = model_name.lower()
+        for prefix, family in _MODEL_FAMILY_PREFIXES:
+            if name.startswith(prefix):
+                return family
+    return ENGINE_FAMILIES.get(engine, "llama")
+
+
+def count_tokens(text: str, engine: str = None, model_name: str = None) -> int:
+    """text를 engine/model 토크나이저로 보냈을 때의 토큰 수 추정 (최소 1)"""
+    family = tokenizer_family(engine, model_name)
+    if len(text) < _CACHE_MIN_CHARS:
+        return _count(text, family)
+
+    key = (hashlib.sha256(text.encode("utf-8")).hexdigest(), family)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    tokens = _count(text, family)
+    with _cache_lock:
+        _cache[key] = tokens
+        while len(_cache) > _CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return tokens
+
+
+def _count(text: str, family: str) -> int:
+    if family == "openai":
+        encoding = _get_tiktoken_encoding()
+        if encoding is not None:
+            return max(1, len(encoding.encode(text, disallowed_special=())))
+
+    hangul = len(_HANGUL.findall(text))
+    latin = sum((len(run) + _LATIN_CHARS_PER_TOKEN - 1) // _LATIN_CHARS_PER_TOKEN for run in _LATIN_RUN.findall(text))
+    symbols = len(_SYMBOL.findall(text))
+    rate = _HANGUL_TOKENS_PER_SYLLABLE.get(family, _DEFAULT_HANGUL_TOKENS)
+    return max(1, math.ceil(hangul * rate) + latin + symbols)
+
+
+def _get_tiktoken_encoding():
+    """tiktoken이 있으면 o200k_base 인코딩 반환 (없거나 인코딩 파일을 받지 못하면 None — 이후 휴리스틱 사용)"""
+    global _tiktoken_encoding, _tiktoken_failed
+    if _tiktoken_encoding is None and not _tiktoken_failed:
+        try:
+            import tiktoken
+            _tiktoken_encoding = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            _tiktoken_failed = True
+    return _tiktoken_encoding
+
+
+# ── 예상 비용 / 시간 ───────────────────────────────────────
+
+# 100만 토큰당 USD (입력, 출력) — 공개 가격 기준, 바뀔 수 있으므로 대략값으로만 사용
+PRICING_PER_MILLION = {
+    ("gemini", "gemini-2.5-flash"): (0.30, 2.50),
+    ("gemini", "gemini-2.5-pro"): (1.25, 10.00),
+    ("gemini", "gemini-2.5-flash-lite"): (0.10, 0.40),
+    ("openai", "gpt-4o"): (2.50, 10.00),
+    ("openai", "gpt-4o-mini"): (0.15, 0.60),
+    ("openai", "gpt-5-mini-2025-08-07"): (0.25, 2.00),
+    ("claude", "claude-sonnet-4-6"): (3.00, 15.00),
+    ("claude", "claude-haiku-4-5"): (1.00, 5.00),
+    ("grok", "grok-4-1-fast-non-reasoning"): (0.20, 0.50),
+    ("grok", "grok-4-1-fast-reasoning"): (0.20, 0.50),
+    ("grok", "grok-3"): (3.00, 15.00),
+    ("grok", "grok-3-mini"): (0.30, 0.50),
+}
+_FREE_ENGINES = ("ollama", "custom", "clipboard")
+
+# 엔진별 (입력 처리 토큰/초, 출력 생성 토큰/초) — 예상 시간 계산용 대략값
+ENGINE_THROUGHPUT = {
+    "gemini": (20_000, 150),
+    "openai": (10_000, 80),
+    "claude": (10_000, 60),
+    "grok": (10_000, 100),
+    "ollama": (800, 25),
+    "custom": (800, 25),
+}
+_DEFAULT_THROUGHPUT = (5_000, 50)
+_FIRST_TOKEN_SEC = 1.0
+
+# 응답 길이 추정: 최종 요약, 구간 노트(입력 대비 비율)
+FINAL_OUTPUT_TOKENS = 2_000
+NOTE_OUTPUT_RATIO = 0.25
+
+
+def price_per_million(engine: str, model_name: str = None) -> Optional[tuple]:
+    """(입력, 출력) 100만 토큰당 USD. 무료(로컬/클립보드)면 (0, 0), 모르는 모델이면 None."""
+    if engine in _FREE_ENGINES:
+        return (0.0, 0.0)
+    return PRICING_PER_MILLION.get((engine, model_name))
+
+
+def request_seconds(engine: str, input_tokens: int, output_tokens: int) -> float:
+    """요청 하나의 예상 소요 시간 (첫 토큰 대기 + 입력 처리 + 출력 생성)"""
+    prefill, decode = ENGINE_THROUGHPUT.get(engine, _DEFAULT_THROUGHPUT)
+    return _FIRST_TOKEN_SEC + input_tokens / prefill + output_tokens / decode
+
+
+@dataclass
+class SummaryEstimate:
+    input_tokens: int            # 원문 토큰 수
+    request_tokens: int          # 모든 요청의 입력 토큰 합 (프롬프트 포함)
+    output_tokens: int           # 모든 요청의 예상 출력 토큰 합
+    requests: int                # API 요청 수 (단일 요약이면 1)
+    chunks: int                  # 분할 요약 첫 단계의 구간 수 (0 = 한 번에 요약)
+    seconds: float               # 예상 소요 시간 (동시 요청 반영)
+    cost_usd: Optional[float]    # 예상 비용 (가격을 모르면 None)
+    context_tokens: int          # 모델 컨텍스트 길이
+
+    def describe(self) -> str:
+        plan = f"{self.chunks}개 구간 분할 요약 (요청 {self.requests}회)" if self.chunks else "한 번에 요약"
+        if self.cost_usd is None:
+            cost = "비용 알 수 없음"
+        elif self.cost_usd == 0:
+            cost = "무료"
+        else:
+            cost = f"예상 비용 약 ${self.cost_usd:.4f}"
+        return f"약 {self.input_tokens:,} 토큰 · {plan} · {cost} · 예상 시간 약 {self.seconds:.0f}초"
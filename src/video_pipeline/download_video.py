@@ -1,14 +1,18 @@
+import json
 import os
 import random
 import string
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from http.client import IncompleteRead
 from typing import Callable, Optional
 
 import requests
 
 from src.gui.core.file_manager import get_downloads_dir
+from src.http_session import get_session
 
 
 def _get_ssl_verify():
@@ -38,12 +42,34 @@ _DOWNLOAD_HEADERS = {
 }
 
 
+def probe_video_url(url: str, timeout: float = 10) -> bool:
+    """영상 URL이 아직 유효한지 1바이트 Range 요청으로 확인 (캐시 재검증용)"""
+    headers = {**_DOWNLOAD_HEADERS, "Range": "bytes=0-0"}
+    try:
+        response = get_session().get(url, headers=headers, stream=True,
+                                     timeout=timeout, verify=_get_ssl_verify())
+        response.close()
+    except requests.exceptions.RequestException:
+        return False
+    return response.status_code in (200, 206)
+
+
 def download_video(
     url: str,
     filename: str = None,
     save_dir: str = None,
     progress_callback: Optional[Callable[[int, int], None]] = None,
+    segments: int = 1,
 ) -> str:
+    """영상 다운로드 (이어받기 지원).
+
+    받는 중인 파일은 `<파일명>.part`에 저장되며, 연결이 끊겨도 지우지 않고
+    다음 시도(또는 다음 실행)에서 Range 요청으로 이어받는다.
+
+    Args:
+        segments: 2 이상이면 큰 파일(_SEGMENT_MIN_SIZE 이상)을 그 수만큼의 바이트 구간으로 나눠
+            동시에 받는다. 서버가 Range를 지원하지 않으면 단일 스트림으로 받는다.
+    """
     if filename is None:
         filename = ''.join(random.choices(string.ascii_letters + string.digits, k=8))
 
@@ -54,58 +80,244 @@ def download_video(
         save_dir = get_downloads_dir()
     os.makedirs(save_dir, exist_ok=True)
     filepath = os.path.join(save_dir, filename)
+    part_path = filepath + _PART_SUFFIX
 
     last_error = None
     for attempt in range(1, _MAX_RETRIES + 1):
         try:
-            _download_with_progress(url, filepath, progress_callback, attempt)
+            _download_with_progress(url, part_path, progress_callback, attempt, segments)
+            os.replace(part_path, filepath)
             print(f"[SUCCESS] 다운로드 완료: {filepath}")
             return os.path.abspath(filepath)
 
-        except (IncompleteRead, requests.exceptions.ChunkedEncodingError, DownloadIntegrityError) as e:
+        except DownloadIntegrityError as e:
+            # 받은 크기가 서버가 알려준 크기를 넘으면 부분 파일을 믿을 수 없으므로 처음부터
+            last_error = e
+            _remove_partial_file(part_path)
+            _remove_partial_file(part_path + _SEGMENT_STATE_SUFFIX)
+            if attempt < _MAX_RETRIES:
+                print(f"[WARN] 파일 크기 불일치, 처음부터 재시도 ({attempt}/{_MAX_RETRIES}): {e}")
+            else:
+                print(f"[ERROR] {_MAX_RETRIES}회 재시도 후 다운로드 실패: {e}")
+
+        except _RESUMABLE_ERRORS as e:
             last_error = e
-            _remove_partial_file(filepath)
             if attempt < _MAX_RETRIES:
                 wait = 2 ** attempt  # 2, 4, 8초 지수 백오프
-                print(f"[WARN] 연결 끊김, {wait}초 후 재시도 ({attempt}/{_MAX_RETRIES}): {e}")
+                print(f"[WARN] 연결 끊김, {wait}초 후 이어받기 ({attempt}/{_MAX_RETRIES}): {e}")
                 time.sleep(wait)
             else:
-                print(f"[ERROR] {_MAX_RETRIES}회 재시도 후 다운로드 실패: {e}")
+                # 부분 파일은 남겨 두어 다음 실행에서 이어받는다
+                print(f"[ERROR] {_MAX_RETRIES}회 재시도 후 다운로드 실패 (부분 파일 보존): {e}")
 
         except Exception as e:
             last_error = e
-            _remove_partial_file(filepath)
+            _remove_partial_file(part_path)
+            _remove_partial_file(part_path + _SEGMENT_STATE_SUFFIX)
             print(f"[ERROR] 다운로드 실패: {e}")
             break  # 네트워크 끊김이 아닌 오류는 재시도 안 함
 
     raise last_error
 
 
+def download_audio(
+    url: str,
+    filename: str = None,
+    save_dir: str = None,
+    sample_rate: int = 16000,
+    progress_callback: Optional[Callable[[float, float], None]] = None,
+) -> str:
+    """영상 URL에서 오디오 트랙만 받아 바로 mono WAV로 저장 (MP4를 디스크에 쓰지 않음).
+
+    PyAV(FFmpeg)가 HTTP 스트림을 직접 demux하므로 비디오 패킷은 받는 즉시 버려지고
+    오디오만 sample_rate로 리샘플링되어 기록된다. 결과물은 STT 입력으로 바로 쓸 수 있어
+    WAV 변환 단계가 필요 없다.
+
+    Args:
+        progress_callback: (처리한 초, 전체 초)
+    """
+    import av
+    from src.audio_pipeline.converter import transcode_to_wav
+
+    if filename is None:
+        filename = ''.join(random.choices(string.ascii_letters + string.digits, k=8))
+    if filename.endswith('.mp4'):
+        filename = filename[:-len('.mp4')]
+    if not filename.endswith('.wav'):
+        filename += '.wav'
+
+    if save_dir is None:
+        save_dir = get_downloads_dir()
+    os.makedirs(save_dir, exist_ok=True)
+    filepath = os.path.join(save_dir, filename)
+    part_path = filepath + _PART_SUFFIX
+
+    # Range는 FFmpeg가 직접 관리하므로 제외
+    headers = {k: v for k, v in _DOWNLOAD_HEADERS.items() if k not in ("Range", "User-Agent")}
+    options = {
+        "user_agent": _DOWNLOAD_HEADERS["User-Agent"],
+        "headers": "".join(f"{k}: {v}\r\n" for k, v in headers.items()),
+        "rw_timeout": str(_TIMEOUT[1] * 1_000_000),  # 마이크로초
+        # 스트림 도중 끊기면 FFmpeg가 현재 위치부터 Range로 다시 연결
+        "reconnect": "1",
+        "reconnect_streamed": "1",
+        "reconnect_delay_max": "8",
+    }
+
+    last_error = None
+    for attempt in range(1, _MAX_RETRIES + 1):
+        try:
+            print(f"[INFO] 오디오 추출 중... (시도 {attempt}/{_MAX_RETRIES}): {url}")
+            with av.open(url, options=options, timeout=_TIMEOUT) as input_container:
+                transcode_to_wav(input_container, part_path, sample_rate, progress_callback)
+            os.replace(part_path, filepath)
+            print(f"[SUCCESS] 오디오 추출 완료: {filepath}")
+            return os.path.abspath(filepath)
+
+        except av.error.HTTPClientError as e:
+            # 4xx (만료된 링크 등)는 다시 시도해도 같은 결과
+            last_error = e
+            _remove_partial_file(part_path)
+            print(f"[ERROR] 오디오 추출 실패: {e}")
+            break
+
+        except av.FFmpegError as e:
+            # 디코딩 위치를 이어갈 수 없으므로 처음부터 다시 받는다
+            last_error = e
+            _remove_partial_file(part_path)
+            if attempt < _MAX_RETRIES:
+                wait = 2 ** attempt  # 2, 4, 8초 지수 백오프
+                print(f"[WARN] 오디오 추출 실패, {wait}초 후 재시도 ({attempt}/{_MAX_RETRIES}): {e}")
+                time.sleep(wait)
+            else:
+                print(f"[ERROR] {_MAX_RETRIES}회 재시도 후 오디오 추출 실패: {e}")
+
+        except Exception as e:
+            last_error = e
+            _remove_partial_file(part_path)
+            print(f"[ERROR] 오디오 추출 실패: {e}")
+            break
+
+    raise last_error
+
+
 class DownloadIntegrityError(Exception):
     """다운로드된 파일의 크기가 서버 응답과 일치하지 않을 때 발생"""
     pass
 
 
+class _IncompleteDownloadError(Exception):
+    """스트림이 예상 크기보다 일찍 끝났을 때 발생 (이어받기 대상)"""
+    pass
+
+
+_PART_SUFFIX = ".part"
+_SEGMENT_STATE_SUFFIX = ".segments.json"
+_SEGMENT_MIN_SIZE = 64 * 1024 * 1024   # 이보다 작은 파일은 구간 분할 없이 단일 스트림
+_STATE_SAVE_INTERVAL = 8 * 1024 * 1024  # 구간별 진행 상태 저장 간격 (bytes)
+
+# 부분 파일을 보존하고 이어받을 오류들
+_RESUMABLE_ERRORS = (
+    IncompleteRead,
+    _IncompleteDownloadError,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+
+
+def _parse_content_range(value: str) -> tuple[Optional[int], Optional[int]]:
+    """'bytes 100-199/1000' → (100, 1000), 'bytes */1000' → (None, 1000)"""
+    if not value or '/' not in value:
+        return None, None
+    range_part, _, total_part = value.partition('/')
+    total = int(total_part) if total_part.strip().isdigit() else None
+    range_part = range_part.replace('bytes', '').strip()
+    if '-' in range_part:
+        start = range_part.split('-')[0].strip()
+        return (int(start) if start.isdigit() else None), total
+    return None, total
+
+
+def _fetch_total_size(url: str) -> Optional[int]:
+    """1바이트 Range 요청으로 전체 크기 확인. 서버가 Range를 지원하지 않으면 None."""
+    headers = {**_DOWNLOAD_HEADERS, "Range": "bytes=0-0"}
+    response = get_session().get(url, headers=headers, stream=True,
+                                 timeout=_TIMEOUT, verify=_get_ssl_verify())
+    try:
+        response.raise_for_status()
+        if response.status_code != 206:
+            return None
+        _, total = _parse_content_range(response.headers.get('content-range', ''))
+        return total
+    finally:
+        response.close()
+
+
 def _download_with_progress(
     url: str,
-    filepath: str,
+    part_path: str,
     progress_callback: Optional[Callable[[int, int], None]],
     attempt: int,
+    segments: int = 1,
 ):
     print(f"[INFO] 동영상 다운로드 중... (시도 {attempt}/{_MAX_RETRIES}): {url}")
-    response = requests.get(url, headers=_DOWNLOAD_HEADERS, stream=True,
-                            timeout=_TIMEOUT, verify=_get_ssl_verify())
-    response.raise_for_status()
+
+    state_path = part_path + _SEGMENT_STATE_SUFFIX
+    if os.path.exists(state_path):
+        # 이전에 구간 분할로 받다가 끊긴 파일은 같은 방식으로 이어받는다
+        _download_segmented(url, part_path, None, segments, progress_callback)
+        return
+
+    if segments > 1 and not os.path.exists(part_path):
+        total_size = _fetch_total_size(url)
+        if total_size and total_size >= _SEGMENT_MIN_SIZE:
+            _download_segmented(url, part_path, total_size, segments, progress_callback)
+            return
+
+    _download_single(url, part_path, progress_callback)
+
+
+def _download_single(
+    url: str,
+    part_path: str,
+    progress_callback: Optional[Callable[[int, int], None]],
+):
+    """단일 스트림 다운로드. 기존 부분 파일이 있으면 그 뒤부터 Range로 이어받는다."""
+    existing = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    headers = {**_DOWNLOAD_HEADERS, "Range": f"bytes={existing}-"}
+    response = get_session().get(url, headers=headers, stream=True,
+                                 timeout=_TIMEOUT, verify=_get_ssl_verify())
+
+    if response.status_code == 416 and existing > 0:
+        # 요청 범위가 파일 끝을 넘음 → 이미 다 받았는지 확인
+        _, total_size = _parse_content_range(response.headers.get('content-range', ''))
+        response.close()
+        if total_size == existing:
+            return
+        raise DownloadIntegrityError(
+            f"부분 파일 크기({existing} bytes)가 서버 파일 크기({total_size} bytes)와 맞지 않음"
+        )
+    if not response.ok:
+        response.close()
+        response.raise_for_status()
 
     # Range 헤더 사용 시 content-range에서 전체 크기 추출
-    content_range = response.headers.get('content-range', '')
-    if '/' in content_range:
-        total_size = int(content_range.split('/')[-1])
+    start, total_size = _parse_content_range(response.headers.get('content-range', ''))
+    if response.status_code == 206 and start == existing:
+        mode = "ab"
+        if existing:
+            print(f"[INFO] {existing / (1024 * 1024):.1f} MB 지점부터 이어받기")
     else:
-        total_size = int(response.headers.get('content-length', 0))
-    downloaded = 0
+        # 서버가 Range를 무시했으면 처음부터 다시 받는다
+        mode = "wb"
+        existing = 0
+        if total_size is None:
+            total_size = int(response.headers.get('content-length', 0))
+    total_size = total_size or 0
+    downloaded = existing
 
-    with open(filepath, "wb") as f:
+    with response, open(part_path, mode) as f:
         for chunk in response.iter_content(chunk_size=_CHUNK_SIZE):
             if chunk:
                 f.write(chunk)
@@ -113,13 +325,139 @@ def _download_with_progress(
                 if progress_callback and total_size > 0:
                     progress_callback(downloaded, total_size)
 
-    # 무결성 검증: 서버가 알려준 크기와 실제 다운로드 크기 비교
-    if total_size > 0 and downloaded != total_size:
+    _verify_size(part_path, downloaded, total_size)
+
+
+def _verify_size(part_path: str, downloaded: int, total_size: int):
+    """무결성 검증: 서버가 알려준 크기(content-range)와 실제 파일 크기 비교"""
+    if total_size <= 0:
+        return
+    actual = os.path.getsize(part_path)
+    if downloaded < total_size or actual < total_size:
+        raise _IncompleteDownloadError(
+            f"연결이 끊겨 일부만 받음: {downloaded}/{total_size} bytes"
+        )
+    if downloaded != total_size or actual != total_size:
         raise DownloadIntegrityError(
-            f"파일 크기 불일치: 예상 {total_size} bytes, 실제 {downloaded} bytes"
+            f"파일 크기 불일치: 예상 {total_size} bytes, 실제 {actual} bytes"
         )
 
 
+def _load_segment_state(state_path: str) -> Optional[dict]:
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_segment_state(state_path: str, state: dict):
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_path)
+
+
+def _download_segmented(
+    url: str,
+    part_path: str,
+    total_size: Optional[int],
+    segments: int,
+    progress_callback: Optional[Callable[[int, int], None]],
+):
+    """파일을 바이트 구간으로 나눠 동시에 받는다.
+
+    미리 전체 크기로 할당한 파일에 구간별로 seek하여 쓰고, 구간별 진행량은
+    `<part>.segments.json`에 주기적으로 기록하여 끊기면 구간별로 이어받는다.
+    """
+    state_path = part_path + _SEGMENT_STATE_SUFFIX
+    state = _load_segment_state(state_path) if os.path.exists(state_path) else None
+
+    if state is None or not os.path.exists(part_path):
+        if total_size is None:
+            total_size = _fetch_total_size(url)
+        if not total_size:
+            # 구간 상태가 깨졌고 크기도 알 수 없으면 단일 스트림으로 처음부터
+            _remove_partial_file(state_path)
+            _remove_partial_file(part_path)
+            _download_single(url, part_path, progress_callback)
+            return
+        segment_size = -(-total_size // segments)  # 올림 나눗셈
+        state = {
+            "total": total_size,
+            "segments": [
+                {"start": start, "end": min(start + segment_size, total_size) - 1, "done": 0}
+                for start in range(0, total_size, segment_size)
+            ],
+        }
+        # 상태 파일을 먼저 남긴다: 할당 직후 끊기면 0으로 채워진 전체 크기 .part만 남고,
+        # 다음 실행이 이를 단일 스트림 부분 파일로 보고 416 응답에 "다 받음"으로 처리하게 된다
+        _save_segment_state(state_path, state)
+        with open(part_path, "wb") as f:
+            f.truncate(total_size)  # 전체 크기로 미리 할당
+        print(f"[INFO] {len(state['segments'])}개 구간으로 분할 다운로드 ({total_size / (1024 * 1024):.1f} MB)")
+    else:
+        done = sum(seg["done"] for seg in state["segments"])
+        print(f"[INFO] 분할 다운로드 이어받기: {done / (1024 * 1024):.1f}/{state['total'] / (1024 * 1024):.1f} MB")
+
+    total_size = state["total"]
+    lock = threading.Lock()
+    unsaved = [0]
+
+    def report(nbytes: int, seg: dict):
+        with lock:
+            seg["done"] += nbytes
+            unsaved[0] += nbytes
+            if unsaved[0] >= _STATE_SAVE_INTERVAL:
+                unsaved[0] = 0
+                _save_segment_state(state_path, state)
+            downloaded = sum(s["done"] for s in state["segments"])
+        if progress_callback:
+            progress_callback(downloaded, total_size)
+
+    def fetch(seg: dict):
+        offset = seg["start"] + seg["done"]
+        if offset > seg["end"]:
+            return
+        headers = {**_DOWNLOAD_HEADERS, "Range": f"bytes={offset}-{seg['end']}"}
+        response = get_session().get(url, headers=headers, stream=True,
+                                     timeout=_TIMEOUT, verify=_get_ssl_verify())
+        if response.status_code != 206:
+            response.close()
+            response.raise_for_status()
+            raise DownloadIntegrityError("서버가 구간(Range) 요청을 지원하지 않음")
+        with response, open(part_path, "r+b") as f:
+            f.seek(offset)
+            for chunk in response.iter_content(chunk_size=_CHUNK_SIZE):
+                if not chunk:
+                    continue
+                remaining = seg["end"] + 1 - (seg["start"] + seg["done"])
+                chunk = chunk[:remaining]
+                f.write(chunk)
+                report(len(chunk), seg)
+                if len(chunk) == remaining:
+                    break
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(state["segments"])) as executor:
+            futures = [executor.submit(fetch, seg) for seg in state["segments"]]
+            errors = [f.exception() for f in futures if f.exception() is not None]
+    finally:
+        with lock:
+            _save_segment_state(state_path, state)
+
+    if errors:
+        raise errors[0]
+
+    downloaded = sum(seg["done"] for seg in state["segments"])
+    try:
+        _verify_size(part_path, downloaded, total_size)
+    except DownloadIntegrityError:
+        _remove_partial_file(state_path)
+        raise
+    os.remove(state_path)
+
+
 def _remove_partial_file(filepath: str):
     if os.path.exists(filepath):
         try:
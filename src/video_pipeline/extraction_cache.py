@@ -0,0 +1,87 @@
+"""
+영상 URL 추출 결과 캐시
+
+강의 항목 URL(canvas.ssu.ac.kr/courses/...)을 키로 CDP로 찾아낸 실제 영상 URL과 제목을 저장한다.
+재실행 시 캐시가 유효하면 플레이어 실행/재생/CDP 감시를 건너뛰고 바로 다운로드 단계로 넘어간다.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Optional, Tuple
+
+from src.gui.core.file_manager import get_app_data_dir
+
+_CACHE_FILENAME = "extraction_cache.json"
+_DEFAULT_TTL_HOURS = 12
+
+
+class ExtractionCache:
+    """강의 항목 URL → (영상 URL, 제목, 캡처 시각) 영구 캐시 (TTL 기반 만료)"""
+
+    def __init__(self, path: str = None, ttl_hours: float = _DEFAULT_TTL_HOURS):
+        self.path = path or os.path.join(get_app_data_dir(), _CACHE_FILENAME)
+        self.ttl_hours = ttl_hours
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(entries, dict):
+            return {}
+        return {k: v for k, v in entries.items() if not self._is_expired(v)}
+
+    def _save(self):
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[WARNING] 추출 캐시 저장 실패 ({self.path}): {e}")
+
+    def _is_expired(self, entry: dict) -> bool:
+        try:
+            captured_at = datetime.fromisoformat(entry["captured_at"])
+        except (KeyError, TypeError, ValueError):
+            return True
+        return (datetime.now() - captured_at).total_seconds() > self.ttl_hours * 3600
+
+    def get(self, item_url: str) -> Optional[Tuple[str, Optional[str]]]:
+        """유효한 캐시가 있으면 (video_url, title), 없거나 만료되었으면 None"""
+        with self._lock:
+            entry = self._entries.get(item_url)
+            if entry is None:
+                return None
+            if self._is_expired(entry):
+                del self._entries[item_url]
+                self._save()
+                return None
+            return entry["video_url"], entry.get("title")
+
+    def put(self, item_url: str, video_url: str, title: Optional[str]):
+        with self._lock:
+            self._entries = {k: v for k, v in self._entries.items() if not self._is_expired(v)}
+            self._entries[item_url] = {
+                "video_url": video_url,
+                "title": title,
+                "captured_at": datetime.now().isoformat(),
+            }
+            self._save()
+
+    def invalidate(self, item_url: str):
+        with self._lock:
+            if self._entries.pop(item_url, None) is not None:
+                self._save()
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._save()
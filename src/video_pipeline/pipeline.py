@@ -6,7 +6,8 @@ from typing import Callable, Optional, Tuple
 
 from src.video_pipeline.login import perform_login_if_needed, LoginFailedError
 from src.video_pipeline.video_parser import extract_video_url
-from src.video_pipeline.download_video import download_video
+from src.video_pipeline.download_video import download_video, download_audio, probe_video_url
+from src.video_pipeline.extraction_cache import ExtractionCache
 from src.user_setting import UserSetting
 
 
@@ -29,7 +30,13 @@ class VideoPipeline:
                  progress_callback: Optional[Callable[[int, int], None]] = None,
                  chrome_path: str = None,
                  log_callback: Optional[Callable[[str], None]] = None,
-                 headless: bool = False):
+                 headless: bool = False,
+                 extraction_workers: int = 1,
+                 use_extraction_cache: bool = True,
+                 download_segments: int = 1,
+                 audio_only: bool = False,
+                 audio_sample_rate: int = 16000,
+                 audio_progress_callback: Optional[Callable[[float, float], None]] = None):
         self.user_setting = user_setting
         self.user_id = user_setting.user_id
         self.password = user_setting.password
@@ -39,6 +46,13 @@ class VideoPipeline:
         self.chrome_path = chrome_path or _DEFAULT_CHROME_PATH
         self._log = log_callback or (lambda msg: print(msg))
         self.headless = headless
+        self.extraction_workers = max(1, extraction_workers)  # 동시에 URL을 추출할 탭 수
+        self._extraction_cache = ExtractionCache() if use_extraction_cache else None
+        self.download_segments = max(1, download_segments)  # 영상 하나를 나눠 받을 구간 수
+        # True이면 MP4 대신 오디오 트랙만 바로 WAV로 받는다 (영상을 보관하지 않을 때)
+        self.audio_only = audio_only
+        self.audio_sample_rate = audio_sample_rate
+        self.audio_progress_callback = audio_progress_callback
 
     async def _setup_browser(self, playwright: Playwright) -> Tuple[Page, any]:
         """브라우저 설정 및 페이지 생성"""
@@ -59,8 +73,8 @@ class VideoPipeline:
             permissions=["camera", "microphone", "geolocation"],
         )
 
-        page = await context.new_page()
-        await page.add_init_script(
+        # 컨텍스트 단위로 등록해야 추출용으로 여는 추가 탭에도 적용됨
+        await context.add_init_script(
             """
             Object.defineProperty(navigator, 'webdriver', {
                 get: () => undefined,
@@ -68,6 +82,7 @@ class VideoPipeline:
             window.chrome = { runtime: {} };
             """
         )
+        page = await context.new_page()
 
         return page, browser
 
@@ -85,37 +100,112 @@ class VideoPipeline:
         else:
             self._log("이미 로그인 상태")
 
-    async def _process_single_url(self, page: Page, url: str) -> Optional[str]:
-        """단일 URL에 대한 비디오 처리"""
+    async def _extract_single_url(self, page: Page, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """단일 강의 페이지에서 (video_url, title) 추출"""
         self._log(f"처리 중: {url}")
         await page.goto(url, wait_until="networkidle")
         self._log(f"페이지 이동 완료: {page.url}")
 
         video_url, title = await extract_video_url(page, method="cdp", timeout=self.extraction_timeout, log=self._log)
-
         if video_url:
             self._log(f"동영상 링크 추출됨: {video_url}")
+        else:
+            self._log("[WARN] 동영상 링크를 찾지 못했습니다.")
+        return video_url, title
+
+    async def _lookup_cached_url(self, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """캐시된 영상 URL이 있고 서버에서 아직 유효하면 (video_url, title) 반환"""
+        if self._extraction_cache is None:
+            return None, None
+        cached = self._extraction_cache.get(url)
+        if cached is None:
+            return None, None
+
+        video_url, title = cached
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, probe_video_url, video_url):
+            self._log(f"캐시된 동영상 링크 사용 (추출 생략): {video_url}")
+            return video_url, title
+
+        self._log("캐시된 동영상 링크가 만료되어 다시 추출합니다.")
+        self._extraction_cache.invalidate(url)
+        return None, None
+
+    def _download_resolved(self, video_url: str, title: Optional[str]) -> str:
+        """추출된 영상 URL을 강의 이름 하위 디렉토리에 다운로드 (블로킹).
 
-            # 강의 이름으로 하위 디렉토리 생성
-            save_dir = self.downloads_dir
-            if title and save_dir:
-                lecture_dir = Path(save_dir) / sanitize_dirname(title)
-                lecture_dir.mkdir(parents=True, exist_ok=True)
-                save_dir = str(lecture_dir)
+        audio_only 모드에서는 영상 대신 16kHz mono WAV를 저장하고 그 경로를 반환한다.
+        """
+        save_dir = self.downloads_dir
+        if title and save_dir:
+            lecture_dir = Path(save_dir) / sanitize_dirname(title)
+            lecture_dir.mkdir(parents=True, exist_ok=True)
+            save_dir = str(lecture_dir)
 
-            filepath = download_video(video_url, save_dir=save_dir, filename=title,
-                                     progress_callback=self.progress_callback)
-            self._log(f"동영상 다운로드 완료: {filepath}")
+        if self.audio_only:
+            filepath = download_audio(video_url, save_dir=save_dir, filename=title,
+                                      sample_rate=self.audio_sample_rate,
+                                      progress_callback=self.audio_progress_callback)
+            self._log(f"오디오 추출 완료: {filepath}")
             return filepath
-        else:
-            self._log("[WARN] 동영상 링크를 찾지 못했습니다.")
-            return None
 
-    async def process(self, urls: list[str]) -> list[str]:
-        """비디오 다운로드 파이프라인 실행"""
-        downloaded_videos_path = []
-        failed_urls = []
+        filepath = download_video(video_url, save_dir=save_dir, filename=title,
+                                  progress_callback=self.progress_callback,
+                                  segments=self.download_segments)
+        self._log(f"동영상 다운로드 완료: {filepath}")
+        return filepath
+
+    async def _extraction_worker(self, page: Page, pending: asyncio.Queue,
+                                 resolved: asyncio.Queue, failed_urls: list, total: int):
+        """탭 하나를 맡아 대기열의 URL을 하나씩 추출하고 결과를 resolved에 넣는다"""
+        while True:
+            try:
+                index, url = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                video_url, title = await self._extract_single_url(page, url)
+                if video_url and self._extraction_cache is not None:
+                    self._extraction_cache.put(url, video_url, title)
+            except Exception as e:
+                self._log(f"[ERROR] ({index}/{total}) 추출 실패, 다음 영상으로 진행: {url}")
+                self._log(f"[ERROR] 원인: {type(e).__name__}: {e}")
+                failed_urls.append((url, str(e)))
+                continue
+            if video_url:
+                await resolved.put((index, url, video_url, title))
+
+    async def _download_worker(self, resolved: asyncio.Queue, results: list, failed_urls: list,
+                               total: int, on_downloaded: Optional[Callable[[str, str], None]]):
+        """추출이 끝난 (video_url, title)을 받는 순서대로 다운로드하는 소비자 단계.
+
+        다운로드와 on_downloaded 콜백은 executor 스레드에서 실행하므로
+        그동안 이벤트 루프의 추출 탭들은 계속 다음 강의를 처리한다.
+        """
+        loop = asyncio.get_running_loop()
 
+        while True:
+            item = await resolved.get()
+            if item is None:
+                return
+            index, url, video_url, title = item
+            try:
+                filepath = await loop.run_in_executor(None, self._download_resolved, video_url, title)
+            except Exception as e:
+                if self._extraction_cache is not None:
+                    self._extraction_cache.invalidate(url)
+                self._log(f"[ERROR] ({index}/{total}) 다운로드 실패, 다음 영상으로 진행: {url}")
+                self._log(f"[ERROR] 원인: {type(e).__name__}: {e}")
+                failed_urls.append((url, str(e)))
+                continue
+
+            results.append((index, filepath))
+            if on_downloaded:
+                await loop.run_in_executor(None, on_downloaded, filepath, url)
+
+    async def _extract_with_browser(self, pending: asyncio.Queue, resolved: asyncio.Queue,
+                                    failed_urls: list, total: int, download_task: asyncio.Task):
+        """브라우저를 띄워 한 번 로그인한 뒤 여러 탭으로 pending의 URL을 추출"""
         async with async_playwright() as p:
             self._log(f"Playwright 시작, Chrome: {self.chrome_path}")
             page, browser = await self._setup_browser(p)
@@ -125,30 +215,85 @@ class VideoPipeline:
                 # 로그인 선행: 대시보드에서 먼저 인증 후 영상 URL 접근
                 await self._ensure_logged_in(page)
 
-                for i, url in enumerate(urls, 1):
-                    try:
-                        filepath = await self._process_single_url(page, url)
-                        if filepath:
-                            downloaded_videos_path.append(filepath)
-                    except Exception as e:
-                        self._log(f"[ERROR] ({i}/{len(urls)}) 다운로드 실패, 다음 영상으로 진행: {url}")
-                        self._log(f"[ERROR] 원인: {type(e).__name__}: {e}")
-                        failed_urls.append((url, str(e)))
+                worker_count = max(1, min(self.extraction_workers, pending.qsize()))
+                pages = [page]
+                for _ in range(worker_count - 1):
+                    pages.append(await page.context.new_page())
+                if worker_count > 1:
+                    self._log(f"영상 URL 추출 탭 {worker_count}개로 병렬 처리")
+
+                extract_tasks = [
+                    asyncio.create_task(self._extraction_worker(pg, pending, resolved, failed_urls, total))
+                    for pg in pages
+                ]
+
+                async def close_when_extracted():
+                    await asyncio.gather(*extract_tasks)
+                    await resolved.put(None)
+
+                try:
+                    await asyncio.gather(close_when_extracted(), download_task)
+                finally:
+                    for task in extract_tasks:
+                        task.cancel()
             finally:
                 await browser.close()
 
+    async def process(self, urls: list[str],
+                      on_downloaded: Optional[Callable[[str, str], None]] = None) -> list[str]:
+        """비디오 다운로드 파이프라인 실행
+
+        추출 캐시에 유효한 영상 URL이 있는 강의는 브라우저 없이 바로 다운로드한다.
+        나머지는 로그인을 한 번만 수행하고, 같은 브라우저 컨텍스트에 extraction_workers개의 탭을 열어
+        영상 URL을 동시에 추출한다. 추출된 URL은 별도의 다운로드 단계가 순서대로 받아 처리한다.
+
+        Args:
+            on_downloaded: 영상 1개의 다운로드가 끝날 때마다 (파일 경로, 강의 URL)로 호출.
+                다음 단계(WAV 변환 등)를 전체 다운로드 완료 전에 시작할 때 사용.
+                콜백에서 발생한 예외는 파이프라인 전체를 중단시킨다.
+
+        Returns:
+            다운로드된 파일 경로 목록 (입력 URL 순서)
+        """
+        results: list[tuple[int, str]] = []
+        failed_urls = []
+        pending: asyncio.Queue = asyncio.Queue()
+        resolved: asyncio.Queue = asyncio.Queue()
+
+        # 캐시로 해결된 강의는 브라우저를 거치지 않고 바로 다운로드 단계로 보낸다
+        cached = await asyncio.gather(*(self._lookup_cached_url(url) for url in urls))
+        for i, (url, (video_url, title)) in enumerate(zip(urls, cached), 1):
+            if video_url:
+                resolved.put_nowait((i, url, video_url, title))
+            else:
+                pending.put_nowait((i, url))
+
+        download_task = asyncio.create_task(
+            self._download_worker(resolved, results, failed_urls, len(urls), on_downloaded)
+        )
+        try:
+            if pending.empty():
+                self._log("모든 강의의 동영상 링크가 캐시되어 있어 브라우저 실행을 생략합니다.")
+                await resolved.put(None)
+                await download_task
+            else:
+                await self._extract_with_browser(pending, resolved, failed_urls, len(urls), download_task)
+        finally:
+            download_task.cancel()
+
         if failed_urls:
             self._log(f"[WARN] {len(failed_urls)}개 영상 다운로드 실패:")
             for url, err in failed_urls:
                 self._log(f"  - {url}: {err}")
 
-        return downloaded_videos_path
+        return [filepath for _, filepath in sorted(results)]
 
-    def process_sync(self, urls: list[str]) -> list[str]:
+    def process_sync(self, urls: list[str],
+                     on_downloaded: Optional[Callable[[str, str], None]] = None) -> list[str]:
         """동기 방식으로 파이프라인 실행"""
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         try:
-            return loop.run_until_complete(self.process(urls))
+            return loop.run_until_complete(self.process(urls, on_downloaded=on_downloaded))
         finally:
             loop.close()
@@ -0,0 +1,103 @@
+"""WAV 변환 벤치마크: 기존 프레임 단위 변환 vs 블록 단위 변환
+
+사용법:
+    python test/convert_benchmark.py <강의 영상 또는 오디오 경로> [반복 횟수]
+    python test/convert_benchmark.py --synthetic 90      # 90분짜리 합성 AAC 파일 생성 후 측정
+"""
+import os
+import sys
+import tempfile
+import time
+import wave
+
+import av
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio_pipeline.converter import convert_audio_to_wav
+
+
+def legacy_convert(input_path: str, wav_path: str, sample_rate: int = 16000):
+    """블록 변환 도입 전 구현: 프레임마다 resample → encode → mux"""
+    with av.open(input_path) as input_container, av.open(wav_path, mode='w') as output_container:
+        output_stream = output_container.add_stream('pcm_s16le', rate=sample_rate)
+        output_stream.layout = 'mono'
+        resampler = av.AudioResampler(format='s16', layout='mono', rate=sample_rate)
+
+        for frame in input_container.decode(audio=0):
+            for resampled in resampler.resample(frame):
+                for packet in output_stream.encode(resampled):
+                    output_container.mux(packet)
+        for resampled in resampler.resample(None):
+            for packet in output_stream.encode(resampled):
+                output_container.mux(packet)
+        for packet in output_stream.encode(None):
+            output_container.mux(packet)
+
+
+def make_synthetic_lecture(path: str, minutes: int):
+    """48kHz stereo AAC 강의 오디오 생성 (LMS 강의 영상의 오디오 트랙과 같은 형식)"""
+    rng = np.random.default_rng(0)
+    frame_size = 1024
+    noise = (rng.standard_normal((2, frame_size * 64)) * 0.05).astype(np.float32)
+
+    with av.open(path, 'w') as container:
+        stream = container.add_stream('aac', rate=48000)
+        stream.layout = 'stereo'
+        for i in range(minutes * 60 * 48000 // frame_size):
+            offset = (i % 64) * frame_size
+            frame = av.AudioFrame.from_ndarray(
+                np.ascontiguousarray(noise[:, offset:offset + frame_size]), format='fltp', layout='stereo')
+            frame.sample_rate = 48000
+            frame.pts = i * frame_size
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+
+
+def read_pcm(wav_path: str) -> np.ndarray:
+    with wave.open(wav_path, 'rb') as f:
+        return np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+
+
+def measure(fn, input_path: str, wav_path: str, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(input_path, wav_path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    work_dir = tempfile.mkdtemp()
+
+    if len(sys.argv) >= 3 and sys.argv[1] == "--synthetic":
+        minutes = int(sys.argv[2])
+        input_path = os.path.join(work_dir, f"synthetic_{minutes}min.m4a")
+        print(f"[INFO] {minutes}분 합성 강의 오디오 생성 중...")
+        make_synthetic_lecture(input_path, minutes)
+        repeat = 3
+    elif len(sys.argv) >= 2:
+        input_path = sys.argv[1]
+        repeat = int(sys.argv[2]) if len(sys.argv) >= 3 else 3
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+    with av.open(input_path) as c:
+        duration_sec = c.duration / av.time_base if c.duration else 0.0
+
+    legacy_wav = os.path.join(work_dir, "legacy.wav")
+    batched_wav = os.path.join(work_dir, "batched.wav")
+
+    legacy_sec = measure(legacy_convert, input_path, legacy_wav, repeat)
+    batched_sec = measure(convert_audio_to_wav, input_path, batched_wav, repeat)
+
+    print(f"입력: {input_path} ({duration_sec / 60:.1f}분)")
+    print(f"기존 (프레임 단위): {legacy_sec:.2f}초 ({duration_sec / legacy_sec:.0f}x 실시간)")
+    print(f"블록 단위:          {batched_sec:.2f}초 ({duration_sec / batched_sec:.0f}x 실시간)")
+    print(f"속도 향상: {legacy_sec / batched_sec:.2f}x")
+    print(f"출력 샘플 동일: {np.array_equal(read_pcm(legacy_wav), read_pcm(batched_wav))}")
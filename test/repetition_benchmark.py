@@ -0,0 +1,81 @@
+"""반복 구문 축약 벤치마크: 기존 정규식(re.sub) vs RepetitionCollapser
+
+whisper hallucination처럼 같은 구문이 임계값 바로 아래만큼 반복되다 조금씩 어긋나는 텍스트에서는
+정규식이 위치마다 긴 비교를 반복하므로 길이에 따라 처리 시간이 제곱으로 늘어난다.
+
+사용법:
+    python test/repetition_benchmark.py                  # 1만/2만/4만 글자 합성 텍스트
+    python test/repetition_benchmark.py 10000 80000      # 글자 수 직접 지정
+    python test/repetition_benchmark.py --file 강의.txt   # 실제 STT 결과 파일
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio_pipeline.repetition import RepetitionCollapser
+
+REPEAT_THRESHOLD = 4
+# 이보다 긴 텍스트는 정규식 측정을 건너뜀 (수 분 이상 걸림)
+REGEX_MAX_CHARS = 60_000
+
+
+def legacy_clean(text: str, repeat_threshold: int = REPEAT_THRESHOLD) -> str:
+    """RepetitionCollapser 도입 전 구현"""
+    return re.sub(r'(.+?)\1{' + str(repeat_threshold) + r',}', r'\1', text)
+
+
+def make_hallucination_text(n_chars: int, seed: int = 0) -> str:
+    """강의 문장 + 무한 반복 루프 + 임계값 바로 아래에서 어긋나는 반복이 섞인 한 줄 텍스트"""
+    rng = random.Random(seed)
+    phrases = ["그래서 이 부분이 중요합니다.", "네 그렇습니다.", "자 다음으로 넘어가겠습니다.", "이것을 기억하세요.", "감사합니다."]
+    parts = []
+    size = 0
+    i = 0
+    while size < n_chars:
+        phrase = rng.choice(phrases) + " "
+        if i % 50 == 49:
+            part = phrase * 40                                   # hallucination 루프 (축약 대상)
+        else:
+            part = phrase * REPEAT_THRESHOLD + phrase[:-3] + rng.choice("가나다라마") + " "   # 축약되지 않는 근접 반복
+        parts.append(part)
+        size += len(part)
+        i += 1
+    return "".join(parts)[:n_chars]
+
+
+def streaming_clean(text: str, segment_chars: int = 40) -> str:
+    """faster-whisper 세그먼트 크기로 나눠 넣는 스트리밍 방식"""
+    collapser = RepetitionCollapser(REPEAT_THRESHOLD)
+    out = [collapser.feed(text[i:i + segment_chars]) for i in range(0, len(text), segment_chars)]
+    out.append(collapser.flush())
+    return "".join(out)
+
+
+def measure(fn, text: str):
+    start = time.perf_counter()
+    result = fn(text)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == "--file":
+        with open(sys.argv[2], "r", encoding="utf-8") as f:
+            inputs = [(os.path.basename(sys.argv[2]), f.read())]
+    else:
+        sizes = [int(a) for a in sys.argv[1:]] or [10_000, 20_000, 40_000]
+        inputs = [(f"합성 {n:,}자", make_hallucination_text(n)) for n in sizes]
+
+    for name, text in inputs:
+        stream_sec, streamed = measure(streaming_clean, text)
+        print(f"입력: {name} ({len(text):,}자)")
+        print(f"  스트리밍 축약: {stream_sec:.3f}초 → {len(streamed):,}자")
+        if len(text) > REGEX_MAX_CHARS:
+            print(f"  정규식: 건너뜀 ({REGEX_MAX_CHARS:,}자 초과)")
+            continue
+        regex_sec, expected = measure(legacy_clean, text)
+        print(f"  정규식:        {regex_sec:.3f}초 → {len(expected):,}자")
+        print(f"  속도 향상: {regex_sec / stream_sec:.0f}x / 결과 동일: {streamed == expected}")
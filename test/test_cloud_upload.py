@@ -0,0 +1,78 @@
+"""클라우드 STT 분할 업로드 결과 합치기 (_transcribe_uploads)
+
+실제 인코딩/업로드 없이 encode_for_upload와 send를 바꿔 끼워 청크 경계 처리만 확인한다.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from src.audio_pipeline import converter, transcriber
+from src.audio_pipeline.chunking import AudioChunk
+
+SR = 16000
+
+
+@pytest.fixture
+def fake_pieces(monkeypatch, tmp_path):
+    """encode_for_upload가 돌려줄 (경로, 청크)를 지정하는 함수"""
+    audio_path = tmp_path / "lecture.wav"
+    audio_path.write_bytes(b"\0" * 1024)
+    pieces = []
+
+    def set_pieces(chunks):
+        pieces[:] = []
+        for i, chunk in enumerate(chunks):
+            path = tmp_path / f"lecture.part{i:03d}.ogg"
+            path.write_bytes(b"\0" * 16)
+            pieces.append((str(path), chunk))
+
+    monkeypatch.setattr(converter, "available_upload_format", lambda fmt: fmt)
+    monkeypatch.setattr(converter, "encode_for_upload", lambda *args, **kwargs: list(pieces))
+    return str(audio_path), set_pieces
+
+
+def _run(audio_path, responses):
+    def send(path):
+        return responses[path.rsplit("part", 1)[1][:3]]
+    return transcriber._transcribe_uploads(audio_path, "opus", send, lambda msg: None, "test")
+
+
+def test_text_only_overlapped_piece_is_stitched_not_dropped(fake_pieces):
+    audio_path, set_pieces = fake_pieces
+    # 0~600초, 597~900초 (무음을 못 찾아 3초 겹치게 자름)
+    set_pieces([AudioChunk(0, 600 * SR, False), AudioChunk(597 * SR, 900 * SR, True)])
+    segments = _run(audio_path, {
+        "000": "오늘은 정렬 알고리즘을 배웁니다 먼저 버블",
+        "001": "먼저 버블 정렬부터 보겠습니다",
+    })
+
+    assert [seg.text for seg in segments] == ["오늘은 정렬 알고리즘을 배웁니다 먼저 버블", "정렬부터 보겠습니다"]
+    assert segments[1].start >= segments[0].end
+
+
+def test_timed_overlapped_piece_drops_only_overlap(fake_pieces):
+    audio_path, set_pieces = fake_pieces
+    set_pieces([AudioChunk(0, 600 * SR, False), AudioChunk(597 * SR, 900 * SR, True)])
+    segments = _run(audio_path, {
+        "000": SimpleNamespace(text="", segments=[
+            {"start": 0.0, "end": 590.0, "text": "앞부분"},
+            {"start": 590.0, "end": 599.0, "text": "경계"},
+        ]),
+        "001": SimpleNamespace(text="", segments=[
+            {"start": 0.0, "end": 2.0, "text": "경계"},     # 597~599초: 앞 파일과 겹침
+            {"start": 2.5, "end": 300.0, "text": "뒷부분"},
+        ]),
+    })
+
+    assert [seg.text for seg in segments] == ["앞부분", "경계", "뒷부분"]
+    assert segments[2].start == 599.5
+
+
+def test_empty_audio_uploads_nothing(fake_pieces):
+    audio_path, set_pieces = fake_pieces
+    set_pieces([])
+
+    def send(path):
+        raise AssertionError("빈 오디오는 업로드하지 않아야 함")
+
+    assert transcriber._transcribe_uploads(audio_path, "opus", send, lambda msg: None, "test") == []
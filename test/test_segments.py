@@ -0,0 +1,60 @@
+"""세그먼트 결과의 순서/중복 검사 (merge_chunk_segments, segments.jsonl 읽기/쓰기)
+
+청크 경계의 겹친 구간이 두 번 들어가거나 시각이 거꾸로 가면 .txt에 같은 문장이 반복되고
+segments.jsonl 타임스탬프를 쓰는 쪽(구간 요약 등)이 틀어진다.
+"""
+from src.audio_pipeline.chunking import AudioChunk, merge_chunk_segments
+from src.audio_pipeline.segments import Segment, read_segments, segments_text, write_segments
+
+SR = 16000
+
+
+def _assert_ordered_without_duplicates(segments):
+    for prev, seg in zip(segments, segments[1:]):
+        assert seg.start >= prev.end, f"겹친 세그먼트: {prev} / {seg}"
+    keys = [(seg.start, seg.text) for seg in segments]
+    assert len(keys) == len(set(keys)), "중복 세그먼트"
+
+
+def test_overlapped_boundary_keeps_earlier_chunk_only():
+    chunks = [AudioChunk(0, 60 * SR, False), AudioChunk(57 * SR, 120 * SR, True)]
+    merged = merge_chunk_segments([
+        [Segment(0.0, 30.0, "앞부분"), Segment(30.0, 59.0, "경계 문장")],
+        [Segment(57.5, 59.0, "경계 문장"), Segment(59.0, 100.0, "뒷부분")],
+    ], chunks)
+
+    _assert_ordered_without_duplicates(merged)
+    assert [seg.text for seg in merged] == ["앞부분", "경계 문장", "뒷부분"]
+
+
+def test_silence_boundary_clips_overlapping_timestamp():
+    chunks = [AudioChunk(0, 60 * SR, False), AudioChunk(60 * SR, 120 * SR, False)]
+    merged = merge_chunk_segments([
+        [Segment(0.0, 60.4, "앞부분")],  # 경계를 조금 넘는 타임스탬프
+        [Segment(60.0, 90.0, "뒷부분")],
+    ], chunks)
+
+    _assert_ordered_without_duplicates(merged)
+    assert [seg.text for seg in merged] == ["앞부분", "뒷부분"]
+    assert merged[1].start == 60.4
+
+
+def test_text_only_overlapped_chunk_drops_repeated_words():
+    chunks = [AudioChunk(0, 60 * SR, False), AudioChunk(57 * SR, 120 * SR, True)]
+    merged = merge_chunk_segments([
+        [Segment(0.0, 60.0, "오늘은 정렬을 배웁니다 먼저 버블")],
+        [Segment(57.0, 120.0, "먼저 버블 정렬부터")],
+    ], chunks, timed=[False, False])
+
+    _assert_ordered_without_duplicates(merged)
+    assert segments_text(merged) == "오늘은 정렬을 배웁니다 먼저 버블 정렬부터"
+
+
+def test_segments_file_round_trip(tmp_path):
+    segments = [Segment(0.0, 2.5, "안녕하세요", -0.2), Segment(2.5, 4.0, "강의 시작")]
+    path = str(tmp_path / "lecture.segments.jsonl")
+    write_segments(path, segments)
+
+    loaded = read_segments(path)
+    assert loaded == segments
+    assert "avg_logprob" not in open(path, encoding="utf-8").read().splitlines()[1]